@@ -0,0 +1,194 @@
+"""1回の生成から複数の用紙サイズ (16:9 / 4:3 / A4) のデッキを書き出す
+
+各バリアントのスクリプトはスライドサイズを 13.33 x 7.5 インチ (16:9) に固定している。
+用紙サイズごとにビルダーを実行し直す代わりに、生成済みのプレゼンテーションから
+座標・大きさ・文字サイズの属性を1回だけ集めておき、サイズごとに元の値から計算した
+値をまとめて書き込んで保存する。
+
+変換の規則 (sx / sy は幅・高さの倍率):
+- 図形の位置と大きさ (a:off / a:ext、グループの a:chOff / a:chExt)、表の列幅と行の高さ、
+  テキストの内側の余白は sx / sy 倍する
+- 画像は縦横比を保ち、min(sx, sy) 倍して元の枠の中央に置く
+- 折り返すテキストの文字サイズ・段落の間隔・線の太さは sqrt(sx * sy) 倍する。枠の面積と
+  文字の面積が同じ比率で変わるので、折り返し直した本文が枠に占める割合は変わらない
+- 折り返さない (wrap="none") テキストは幅が足りなくなるので min(sx, sy) 倍する
+
+マスターとレイアウトは変換しない。位置をレイアウトから継承しているスライドのプレースホルダー
+(slide.py の slide.shapes.title など) には、継承している位置をスライド側に書き込んでから
+ほかの図形と同じように変換する。
+
+使い方:
+    python aspect.py --module ppt --sizes 16x9 4x3 A4 -o "project_proposal_{size}.pptx"
+    python aspect.py --module main --sizes 4x3 11x8.5 -o "sample_{size}.pptx"
+
+    from aspect import save_variants
+    save_variants(ppt.build_presentation(), {'16x9': 'a.pptx', '4x3': 'b.pptx'})
+"""
+import math
+import time
+
+from pptx.util import Emu, Inches, Mm
+
+PAGE_SIZES = {
+    '16x9': (Inches(13.33), Inches(7.5)),
+    '4x3': (Inches(10), Inches(7.5)),
+    'A4': (Mm(297), Mm(210)),
+}
+
+_NS = {
+    'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
+    'p': 'http://schemas.openxmlformats.org/presentationml/2006/main',
+}
+# 属性ごとの倍率の種類: x / y は幅・高さの倍率、text は本文の倍率
+# 画像の位置と大きさ (p:pic/p:spPr/a:xfrm) は縦横比を保つので、ここでは除いて別に扱う
+_NOT_PICTURE = '[not(parent::a:xfrm/parent::p:spPr/parent::p:pic)]'
+_GEOMETRY = (
+    ('.//a:off%s | .//a:chOff' % _NOT_PICTURE, (('x', 'x'), ('y', 'y'))),
+    ('.//a:ext[@cx]%s | .//a:chExt' % _NOT_PICTURE, (('cx', 'x'), ('cy', 'y'))),
+    ('.//a:gridCol', (('w', 'x'),)),
+    ('.//a:tr', (('h', 'y'),)),
+    ('.//a:bodyPr', (('lIns', 'x'), ('rIns', 'x'), ('tIns', 'y'), ('bIns', 'y'))),
+    ('.//a:ln[@w]', (('w', 'text'),)),
+)
+_TEXT = (
+    ('.//a:rPr | .//a:endParaRPr | .//a:defRPr', 'sz'),
+    ('.//a:spcPts', 'val'),
+)
+
+
+def parse_size(text):
+    """'16x9' / '4x3' / 'A4' か '幅x高さ' (インチ) を (名前, 幅, 高さ) にする"""
+    name = text.replace(':', 'x')
+    for key, (width, height) in PAGE_SIZES.items():
+        if name.lower() == key.lower():
+            return key, width, height
+    try:
+        width, height = (float(value) for value in name.lower().split('x'))
+    except ValueError:
+        raise ValueError("用紙サイズが不正です: %s (16x9 / 4x3 / A4 か 幅x高さ のインチ)" % text)
+    if width <= 0 or height <= 0:
+        raise ValueError("用紙サイズが不正です: %s" % text)
+    return name, Inches(width), Inches(height)
+
+
+def _pin_placeholders(slide):
+    """位置をレイアウト・マスターから継承しているプレースホルダーに、同じ位置を明示する"""
+    for shape in slide.placeholders:
+        spPr = shape._element.find('p:spPr', _NS)
+        if spPr is None or spPr.find('a:xfrm', _NS) is not None:
+            continue
+        box = shape.left, shape.top, shape.width, shape.height
+        if None not in box:
+            shape.left, shape.top, shape.width, shape.height = box
+
+
+class AspectVariants:
+    """プレゼンテーションの座標・文字サイズの属性をまとめて書き換える
+
+    生成時のサイズと属性の値を覚えておき、apply() ではいつも元の値から計算するので、
+    何度サイズを変えても誤差は積み重ならない。
+    """
+
+    def __init__(self, prs):
+        self.prs = prs
+        self.width = prs.slide_width
+        self.height = prs.slide_height
+        self._values = []    # (要素, 属性名, 元の値, 倍率の種類)
+        self._pictures = []  # (a:off, a:ext, x, y, cx, cy)
+        for slide in prs.slides:
+            _pin_placeholders(slide)
+            self._collect(slide._element)
+
+    def _collect(self, root):
+        values = self._values
+        for path, attrs in _GEOMETRY:
+            for element in root.xpath(path):
+                for attr, kind in attrs:
+                    value = element.get(attr)
+                    if value is not None:
+                        values.append((element, attr, int(value), kind))
+        for xfrm in root.xpath('.//p:pic/p:spPr/a:xfrm'):
+            off, ext = xfrm.find('a:off', _NS), xfrm.find('a:ext', _NS)
+            if off is not None and ext is not None:
+                self._pictures.append((off, ext, int(off.get('x')), int(off.get('y')),
+                                       int(ext.get('cx')), int(ext.get('cy'))))
+        for body in root.xpath('.//p:txBody | .//a:txBody'):
+            body_pr = body.find('a:bodyPr', _NS)
+            kind = 'fixed' if body_pr is not None and body_pr.get('wrap') == 'none' else 'text'
+            for path, attr in _TEXT:
+                for element in body.xpath(path):
+                    value = element.get(attr)
+                    if value is not None:
+                        values.append((element, attr, int(value), kind))
+
+    def apply(self, width, height):
+        """スライドサイズを width x height (EMU) にし、全スライドの属性を書き換える"""
+        sx = width / self.width
+        sy = height / self.height
+        factors = {'x': sx, 'y': sy, 'text': math.sqrt(sx * sy), 'fixed': min(sx, sy)}
+        for element, attr, value, kind in self._values:
+            scaled = int(round(value * factors[kind]))
+            if attr == 'sz':
+                scaled = max(scaled, 100)  # 文字サイズは 1pt 未満にしない
+            element.set(attr, str(scaled))
+        scale = min(sx, sy)
+        for off, ext, x, y, cx, cy in self._pictures:
+            new_cx, new_cy = int(cx * scale), int(cy * scale)
+            off.set('x', str(int(x * sx + (cx * sx - new_cx) / 2)))
+            off.set('y', str(int(y * sy + (cy * sy - new_cy) / 2)))
+            ext.set('cx', str(new_cx))
+            ext.set('cy', str(new_cy))
+        self.prs.slide_width = Emu(int(width))
+        self.prs.slide_height = Emu(int(height))
+
+    def restore(self):
+        """生成時のサイズに戻す"""
+        self.apply(self.width, self.height)
+
+
+def save_variants(prs, outputs, **options):
+    """outputs ({用紙サイズ: 出力パス}) のサイズごとに prs を保存し、{用紙サイズ: ダイジェスト} を返す
+
+    options は saver.save_presentation() に渡す。保存後は生成時のサイズに戻す。
+    """
+    from saver import save_presentation
+    variants = AspectVariants(prs)
+    digests = {}
+    try:
+        for size, path in outputs.items():
+            _, width, height = parse_size(size)
+            variants.apply(width, height)
+            digests[size] = save_presentation(prs, path, **options)
+    finally:
+        variants.restore()
+    return digests
+
+
+def main():
+    import argparse
+    import importlib
+    parser = argparse.ArgumentParser(description='1回の生成から複数の用紙サイズのデッキを書き出す')
+    parser.add_argument('--module', default='ppt', help='build_presentation() を持つモジュール')
+    parser.add_argument('--sizes', nargs='+', default=['16x9', '4x3', 'A4'],
+                        help='16x9 / 4x3 / A4 か 幅x高さ (インチ)')
+    parser.add_argument('-o', '--output', default='project_proposal_{size}.pptx',
+                        help='出力パス ({size} は用紙サイズに置き換える)')
+    args = parser.parse_args()
+
+    sizes = [parse_size(size)[0] for size in args.sizes]
+    if len(sizes) > 1 and '{size}' not in args.output:
+        parser.error('複数のサイズを書き出すときは --output に {size} を含めてください')
+    module = importlib.import_module(args.module)
+    start = time.perf_counter()
+    prs = module.build_presentation()
+    built = time.perf_counter() - start
+    outputs = {size: args.output.format(size=size) for size in sizes}
+    save_variants(prs, outputs)
+    total = time.perf_counter() - start
+    for size, path in outputs.items():
+        print("作成しました: %s (%s)" % (path, size))
+    print("生成 %.2f 秒 + 変換・保存 %.2f 秒 (%d サイズ)" % (built, total - built, len(sizes)))
+
+
+if __name__ == '__main__':
+    main()
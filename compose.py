@@ -0,0 +1,128 @@
+"""デッキの一部のスライドだけを生成する
+
+create_presentation() は SLIDE_BUILDERS の10枚を毎回すべて生成するが、社内レビューでは
+予算計画と結論だけ、プレビューでは1枚だけが欲しいことが多い。ここではスライドを
+(モジュール名, ビルダー名) の参照 SlideRef として並べ、選んだ参照のビルダーだけを
+呼び出す。ビルダーは build() まで解決も実行もしない。
+
+フッターのページ番号は選んだスライドの中での位置と枚数で付け直す (予算計画と結論を
+選ぶと 1/2, 2/2)。選択は名前 (create_ を除いたビルダー名 'budget' か 'create_budget')・
+1 から数えた番号 ('8')・番号の範囲 ('8-10', '8-' は最後まで) をカンマで区切って並べ、
+書いた順にスライドになる。
+
+使い方:
+    python compose.py --list
+    python compose.py budget,conclusion -o review.pptx
+    python compose.py 2-4 --module ppt -o preview.pptx
+
+    from compose import select, slide_refs, build
+    prs = build(select(slide_refs('ppt'), 'budget,conclusion'))
+"""
+import importlib
+import time
+from collections import namedtuple
+
+
+class SlideRef(namedtuple('SlideRef', 'module builder')):
+    """(prs, current_slide, total_slides) を受け取るビルダーへの遅延参照"""
+    __slots__ = ()
+
+    @property
+    def name(self):
+        return self.builder[len('create_'):] if self.builder.startswith('create_') else self.builder
+
+    def resolve(self):
+        return getattr(importlib.import_module(self.module), self.builder)
+
+
+def slide_refs(module_name='ppt'):
+    """モジュールの SLIDE_BUILDERS の順に並べた SlideRef のリスト"""
+    module = importlib.import_module(module_name)
+    builders = getattr(module, 'SLIDE_BUILDERS', None)
+    if builders is None:
+        raise ValueError("%s には SLIDE_BUILDERS がありません" % module_name)
+    return [SlideRef(module_name, builder.__name__) for builder in builders]
+
+
+def _index(text, count):
+    try:
+        index = int(text)
+    except ValueError:
+        raise ValueError("スライド番号が不正です: %s" % text)
+    if not 1 <= index <= count:
+        raise ValueError("スライド番号は 1 から %d までです: %s" % (count, text))
+    return index
+
+
+def select(refs, selection):
+    """refs から selection ('budget,conclusion' / '8-10' / 番号や名前のリスト) のスライドを選ぶ"""
+    if isinstance(selection, str):
+        selection = [item.strip() for item in selection.split(',') if item.strip()]
+    by_name = {}
+    for ref in refs:
+        by_name.setdefault(ref.name, ref)
+        by_name.setdefault(ref.builder, ref)
+    selected = []
+    for item in selection:
+        if isinstance(item, int):
+            selected.append(refs[_index(item, len(refs)) - 1])
+        elif item in by_name:
+            selected.append(by_name[item])
+        elif '-' in item:
+            start, _, end = item.partition('-')
+            first = _index(start, len(refs))
+            last = _index(end, len(refs)) if end else len(refs)
+            if first > last:
+                raise ValueError("スライドの範囲が不正です: %s" % item)
+            selected.extend(refs[first - 1:last])
+        elif item.isdigit():
+            selected.append(refs[_index(item, len(refs)) - 1])
+        else:
+            raise ValueError("スライドが見つかりません: %s (%s)" % (item, ', '.join(ref.name for ref in refs)))
+    if not selected:
+        raise ValueError("スライドが選ばれていません")
+    return selected
+
+
+def build(refs, prs=None):
+    """refs のビルダーだけを順に実行し、ページ番号を refs の中の位置で付けたプレゼンテーションを返す"""
+    from parallel_build import build_sequential
+    if not refs:
+        raise ValueError("スライドが選ばれていません")
+    return build_sequential([tuple(ref) for ref in refs], prs=prs, module_name=refs[0].module)
+
+
+def save(refs, path, **options):
+    """refs のスライドだけのデッキを path に保存する (options は saver.save_presentation() に渡す)"""
+    from saver import save_presentation
+    return save_presentation(build(refs), path, **options)
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='デッキの一部のスライドだけを生成する')
+    parser.add_argument('slides', nargs='?', default=None,
+                        help="スライドの名前・番号・範囲のカンマ区切り (例: budget,conclusion / 8-10)")
+    parser.add_argument('--module', default='ppt', help='SLIDE_BUILDERS を持つモジュール')
+    parser.add_argument('-o', '--output', default='project_proposal_partial.pptx')
+    parser.add_argument('--list', action='store_true', help='選べるスライドの番号と名前を表示する')
+    args = parser.parse_args()
+
+    refs = slide_refs(args.module)
+    if args.list or args.slides is None:
+        for index, ref in enumerate(refs, 1):
+            print("%2d  %s" % (index, ref.name))
+        return
+    try:
+        selected = select(refs, args.slides)
+    except ValueError as e:
+        parser.error(str(e))
+    start = time.perf_counter()
+    save(selected, args.output)
+    print("作成しました: %s (%d / %d スライド: %s, %.2f 秒)" % (
+        args.output, len(selected), len(refs), ', '.join(ref.name for ref in selected),
+        time.perf_counter() - start))
+
+
+if __name__ == '__main__':
+    main()
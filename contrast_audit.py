@@ -0,0 +1,167 @@
+"""文字色と背景色のコントラスト (WCAG 2.x) を検査する
+
+スライドの各テキストランについて文字色と実効的な背景色 (テキスト図形自身の塗り、
+無ければその下に重なる図形の塗りを z 順にさかのぼって求め、半透明なら下の色と合成する)
+を集め、全ペアのコントラスト比を NumPy でまとめて計算する。
+基準は WCAG AA で、通常の文字は 4.5:1、大きな文字 (18pt 以上、または太字 14pt 以上) は 3:1。
+
+保存前のゲートとしても使えるよう、生成途中の Presentation を直接検査できる:
+    issues = audit_presentation(prs)
+    saver.save_presentation(prs, path, contrast_gate=True)  # 不合格なら保存せず ValueError
+
+使い方:
+    python contrast_audit.py great1.pptx sample1.pptx project_proposal.pptx
+"""
+import sys
+import zipfile
+
+import numpy as np
+
+from shape_records import pptx_placeholders, slide_members, slide_placeholders, slide_records
+
+# WCAG AA の基準値
+NORMAL_RATIO = 4.5
+LARGE_RATIO = 3.0
+LARGE_SIZE = 18.0
+LARGE_BOLD_SIZE = 14.0
+
+# 背景になる図形が見つからない場合 (スライド背景) の色
+SLIDE_BACKGROUND = (255, 255, 255)
+
+
+def relative_luminance(colors):
+    """(N, 3) の sRGB 値 (0-255) から相対輝度の配列を返す"""
+    c = np.asarray(colors, dtype=np.float64) / 255.0
+    linear = np.where(c <= 0.03928, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+    return linear @ np.array([0.2126, 0.7152, 0.0722])
+
+
+def contrast_ratios(foreground, background):
+    """文字色と背景色の配列 (N, 3) からコントラスト比の配列を返す"""
+    l1 = relative_luminance(foreground)
+    l2 = relative_luminance(background)
+    return (np.maximum(l1, l2) + 0.05) / (np.minimum(l1, l2) + 0.05)
+
+
+def _shape_color(record):
+    """図形の塗り (グラデーションは各色の平均) と不透明度。塗りが無ければ None"""
+    if record.get('gradient'):
+        stops = [color for _, color in record['gradient']['stops']]
+        return tuple(sum(channel) / len(stops) for channel in zip(*stops)), record['alpha']
+    if record.get('fill'):
+        return tuple(record['fill']), record['alpha']
+    return None
+
+
+def _background_at(records, index, x, y):
+    """records[index] より下にあり点 (x, y) を含む図形を重ねた背景色を返す"""
+    layers = []
+    for record in reversed(records[:index]):
+        if record['kind'] == 'table':
+            continue
+        if not (record['x'] <= x <= record['x'] + record['w'] and record['y'] <= y <= record['y'] + record['h']):
+            continue
+        color = _shape_color(record)
+        if color is None:
+            continue
+        layers.append(color)
+        if color[1] >= 1.0:
+            break
+    result = SLIDE_BACKGROUND
+    for color, alpha in reversed(layers):
+        result = tuple(alpha * c + (1 - alpha) * b for c, b in zip(color, result))
+    return result
+
+
+def _iter_runs(records):
+    """(図形名, テキスト, 文字色, 背景色, サイズ, 太字) をテキストランごとに返す"""
+    for index, record in enumerate(records):
+        cx = record['x'] + record['w'] // 2
+        cy = record['y'] + record['h'] // 2
+        if record['kind'] == 'table':
+            background = _background_at(records, index, cx, cy)
+            for row in record['table']['cells']:
+                for cell in row:
+                    cell_bg = tuple(cell['fill']) if cell['fill'] else background
+                    for para in cell['paragraphs']:
+                        for run in para['runs']:
+                            if run['text'].strip():
+                                yield record['name'], run['text'], run['color'], cell_bg, run['size'], run['bold']
+            continue
+        if not record['paragraphs']:
+            continue
+        own = _shape_color(record)
+        background = _background_at(records, index, cx, cy)
+        if own is not None:
+            color, alpha = own
+            background = tuple(alpha * c + (1 - alpha) * b for c, b in zip(color, background))
+        for para in record['paragraphs']:
+            for run in para['runs']:
+                if run['text'].strip():
+                    yield record['name'], run['text'], run['color'], background, run['size'], run['bold']
+
+
+def audit_slides(slides):
+    """スライドごとのレコードのリストを検査し、基準を満たさないテキストランを返す
+
+    各問題は {'slide', 'shape', 'text', 'color', 'background', 'ratio', 'required'}。
+    """
+    rows = []
+    for number, records in enumerate(slides, 1):
+        for run in _iter_runs(records):
+            rows.append((number,) + run)
+    if not rows:
+        return []
+    numbers, shapes, texts, fg, bg, sizes, bolds = zip(*rows)
+    ratios = contrast_ratios(fg, bg)
+    sizes = np.asarray(sizes, dtype=np.float64)
+    large = (sizes >= LARGE_SIZE) | (np.asarray(bolds) & (sizes >= LARGE_BOLD_SIZE))
+    required = np.where(large, LARGE_RATIO, NORMAL_RATIO)
+    issues = []
+    for i in np.flatnonzero(ratios < required):
+        issues.append({
+            'slide': numbers[i], 'shape': shapes[i], 'text': texts[i],
+            'color': '%02X%02X%02X' % tuple(int(round(c)) for c in fg[i]),
+            'background': '%02X%02X%02X' % tuple(int(round(c)) for c in bg[i]),
+            'ratio': round(float(ratios[i]), 2), 'required': float(required[i]),
+        })
+    return issues
+
+
+def audit_presentation(prs):
+    """生成途中の Presentation を検査する (保存前のゲート用)"""
+    cache = {}
+    return audit_slides([slide_records(slide._element, pptx_placeholders(slide, cache)) for slide in prs.slides])
+
+
+def audit_file(path):
+    """.pptx を ZIP から直接読んで検査する"""
+    cache = {}
+    with zipfile.ZipFile(path) as zf:
+        return audit_slides([slide_records(zf.read(member), slide_placeholders(zf, member, cache))
+                             for member in slide_members(zf)])
+
+
+def format_issue(issue):
+    text = issue['text'] if len(issue['text']) <= 30 else issue['text'][:29] + '…'
+    return "slide %d: %-20s #%s on #%s  %.2f:1 (< %.1f)  %s" % (
+        issue['slide'], issue['shape'], issue['color'], issue['background'],
+        issue['ratio'], issue['required'], text)
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("使用方法: python contrast_audit.py <pptx>...")
+        return
+    failed = 0
+    for path in sys.argv[1:]:
+        issues = audit_file(path)
+        failed += len(issues)
+        for issue in issues:
+            print("%s %s" % (path, format_issue(issue)))
+    print("コントラスト不足: %d 件" % failed, file=sys.stderr)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,255 @@
+"""生成済みデッキの全文検索用の転置インデックス
+
+.pptx からスライド XML を iterparse でストリーム読み込みし、英語は単語単位、
+日本語 (漢字・かな・カタカナ) は文字 bigram 単位でトークン化する。インデックスには日本語の
+各文字 (unigram) も入れるので、"移" のような1文字の検索でも引ける。
+ポスティングにはスライド ID とスライド内での検索語の位置の組を持ち、検索はフレーズ
+(検索語がこの順で隣り合って現れる箇所) を含むスライドを返す。"payback period" と
+"period payback" は別のフレーズで、日本語の bigram も隣り合っている場合だけ一致する。
+インデックスはディスク上のファイルとして保存し、検索時は語彙表・ポスティング・
+スライド表をすべてメモリマップして二分探索するため、開く処理も含めて数ミリ秒で済む。
+
+使い方:
+    python deck_index.py build index/ archive/ great1.pptx sample1.pptx
+    python deck_index.py search index/ "データ移行"
+"""
+import mmap
+import os
+import re
+import struct
+import sys
+import time
+import unicodedata
+import zipfile
+from array import array
+from multiprocessing import Pool
+
+from lxml import etree
+
+from shape_records import NS, slide_members
+
+_A_T = '{%s}t' % NS['a']
+_A_P = '{%s}p' % NS['a']
+
+# 英数字の単語と、日本語の連続部分を取り出す
+_WORD_RE = re.compile(r'[0-9a-z]+(?:[.\'][0-9a-z]+)*|[぀-ヿ㐀-鿿豈-﫿ー]+')
+_CJK_RE = re.compile(r'[぀-ヿ㐀-鿿豈-﫿]')
+
+# 語彙表の1エントリ: 語の位置, 語の長さ, ポスティングの位置 (要素数), 要素数
+# ポスティングは (スライド ID, 位置) の組を平らに並べた uint32 の列
+_TERM_ENTRY = struct.Struct('<QIQI')
+# インデックスの形式 (ポスティングや検索語の形が変わったら上げる)
+INDEX_FORMAT = 3
+
+
+def tokenize(text, unigrams=False):
+    """テキストを (検索語, 位置) のリストにする (英語は小文字の単語、日本語は文字 bigram)
+
+    日本語の連続部分は文字数分の位置を使い、bigram は先頭の文字の位置に置く。unigrams=True
+    (インデックスの作成時) は各文字も同じ位置に加える。
+    """
+    tokens = []
+    position = 0
+    for word in _WORD_RE.findall(unicodedata.normalize('NFKC', text).lower()):
+        if _CJK_RE.match(word):
+            if len(word) == 1:
+                tokens.append((word, position))
+            else:
+                tokens.extend((word[i:i + 2], position + i) for i in range(len(word) - 1))
+                if unigrams:
+                    tokens.extend((char, position + i) for i, char in enumerate(word))
+            position += len(word)
+        else:
+            tokens.append((word, position))
+            position += 1
+    return tokens
+
+
+def iter_slide_texts(path):
+    """デッキの各スライドの (スライド番号, テキスト) を順に返す"""
+    with zipfile.ZipFile(path) as zf:
+        for number, member in enumerate(slide_members(zf), 1):
+            parts = []
+            with zf.open(member) as f:
+                for _, el in etree.iterparse(f, events=('end',), tag=(_A_T, _A_P)):
+                    if el.tag == _A_T:
+                        parts.append(el.text or '')
+                    else:
+                        parts.append('\n')
+                    el.clear()
+            yield number, ''.join(parts)
+
+
+def _deck_tokens(path):
+    """ワーカー用: デッキの [(スライド番号, (検索語, 位置) のリスト)] を返す"""
+    try:
+        return path, [(number, tokenize(text, unigrams=True)) for number, text in iter_slide_texts(path)]
+    except (zipfile.BadZipFile, KeyError, etree.XMLSyntaxError):
+        return path, None
+
+
+def iter_deck_paths(paths):
+    """ファイルとディレクトリ (再帰) から .pptx のパスを列挙する"""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in sorted(files):
+                    if name.endswith('.pptx') and not name.startswith('~$'):
+                        yield os.path.join(root, name)
+        elif path.endswith('.pptx') and not os.path.basename(path).startswith('~$'):
+            yield path
+
+
+def build_index(index_dir, paths, workers=None):
+    """paths のデッキから index_dir にインデックスを作り、(デッキ数, スライド数) を返す"""
+    postings = {}
+    slides = []
+    decks = 0
+    deck_paths = list(iter_deck_paths(paths))
+    with Pool(workers) as pool:
+        for path, deck in pool.imap(_deck_tokens, deck_paths, chunksize=16):
+            if deck is None:
+                continue
+            decks += 1
+            for number, tokens in deck:
+                slide_id = len(slides)
+                slides.append('%s\t%d' % (os.path.abspath(path), number))
+                for token, position in tokens:
+                    ids = postings.get(token)
+                    if ids is None:
+                        ids = postings[token] = array('I')
+                    ids.append(slide_id)
+                    ids.append(position)
+    os.makedirs(index_dir, exist_ok=True)
+    _write_index(index_dir, postings, slides)
+    return decks, len(slides)
+
+
+def _write_index(index_dir, postings, slides):
+    with open(os.path.join(index_dir, 'postings.bin'), 'wb') as post_f, \
+            open(os.path.join(index_dir, 'terms.bin'), 'wb') as term_f, \
+            open(os.path.join(index_dir, 'terms.idx'), 'wb') as idx_f:
+        term_offset = 0
+        post_offset = 0
+        for term in sorted(postings, key=lambda t: t.encode('utf-8')):
+            encoded = term.encode('utf-8')
+            ids = postings[term]
+            idx_f.write(_TERM_ENTRY.pack(term_offset, len(encoded), post_offset, len(ids)))
+            term_f.write(encoded)
+            post_f.write(ids.tobytes())
+            term_offset += len(encoded)
+            post_offset += len(ids)
+    offsets = array('Q')
+    with open(os.path.join(index_dir, 'slides.txt'), 'wb') as f:
+        position = 0
+        for line in slides:
+            encoded = (line + '\n').encode('utf-8')
+            offsets.append(position)
+            f.write(encoded)
+            position += len(encoded)
+    with open(os.path.join(index_dir, 'slides.idx'), 'wb') as f:
+        f.write(offsets.tobytes())
+    with open(os.path.join(index_dir, 'format.txt'), 'w') as f:
+        f.write('%d\n' % INDEX_FORMAT)
+
+
+def _map(path):
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class DeckIndex:
+    """メモリマップしたインデックスに対する検索"""
+
+    def __init__(self, index_dir):
+        try:
+            with open(os.path.join(index_dir, 'format.txt')) as f:
+                index_format = int(f.read())
+        except FileNotFoundError:
+            index_format = 1
+        if index_format != INDEX_FORMAT:
+            raise ValueError("インデックスの形式が古いので作り直してください: %s" % index_dir)
+        self._terms = _map(os.path.join(index_dir, 'terms.bin'))
+        self._term_idx = _map(os.path.join(index_dir, 'terms.idx'))
+        self._postings = _map(os.path.join(index_dir, 'postings.bin'))
+        self._slides = _map(os.path.join(index_dir, 'slides.txt'))
+        self._slide_idx = memoryview(_map(os.path.join(index_dir, 'slides.idx'))).cast('B').cast('Q')
+        self._term_count = len(self._term_idx) // _TERM_ENTRY.size
+
+    def _entry(self, i):
+        term_offset, term_len, post_offset, count = _TERM_ENTRY.unpack_from(self._term_idx, i * _TERM_ENTRY.size)
+        return self._terms[term_offset:term_offset + term_len], post_offset, count
+
+    def postings(self, term):
+        """検索語の (スライド ID, 位置) を平らに並べた列 (昇順の memoryview) を返す。無ければ空"""
+        key = term.encode('utf-8')
+        lo, hi = 0, self._term_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._entry(mid)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._term_count:
+            found, post_offset, count = self._entry(lo)
+            if found == key:
+                return memoryview(self._postings)[post_offset * 4:(post_offset + count) * 4].cast('I')
+        return memoryview(b'').cast('I')
+
+    def slide(self, slide_id):
+        """スライド ID から (デッキのパス, スライド番号) を返す"""
+        start = self._slide_idx[slide_id]
+        end = self._slides.find(b'\n', start)
+        path, number = self._slides[start:end].decode('utf-8').rsplit('\t', 1)
+        return path, int(number)
+
+    def search_ids(self, query):
+        """フレーズ (検索語がこの順で隣り合う箇所) を含むスライドの ID を昇順で返す"""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        lists = [self.postings(token) for token, _ in tokens]
+        # 件数の少ない検索語から、フレーズの先頭の位置の候補 (スライド ID, 位置) を絞り込む
+        order = sorted(range(len(tokens)), key=lambda i: len(lists[i]))
+        first, offset = lists[order[0]], tokens[order[0]][1]
+        starts = {(slide_id, position - offset) for slide_id, position in zip(first[0::2], first[1::2])}
+        for i in order[1:]:
+            if not starts:
+                break
+            candidates = {slide_id for slide_id, _ in starts}
+            ids, offset = lists[i], tokens[i][1]
+            starts.intersection_update((slide_id, position - offset) for slide_id, position in zip(ids[0::2], ids[1::2])
+                                       if slide_id in candidates)
+        return sorted({slide_id for slide_id, _ in starts})
+
+    def search(self, query, limit=None):
+        """フレーズを含むスライドを [(デッキのパス, スライド番号), ...] で返す"""
+        ids = self.search_ids(query)
+        if limit is not None:
+            ids = ids[:limit]
+        return [self.slide(slide_id) for slide_id in ids]
+
+
+def main():
+    if len(sys.argv) < 4 or sys.argv[1] not in ('build', 'search'):
+        print("使用方法: python deck_index.py build <index_dir> <pptx|dir>...")
+        print("          python deck_index.py search <index_dir> <フレーズ>")
+        return
+    command, index_dir = sys.argv[1], sys.argv[2]
+    start = time.perf_counter()
+    if command == 'build':
+        decks, slides = build_index(index_dir, sys.argv[3:])
+        print("インデックスを作成しました: %d デッキ / %d スライド (%.2f 秒)"
+              % (decks, slides, time.perf_counter() - start))
+        return
+    hits = DeckIndex(index_dir).search(' '.join(sys.argv[3:]))
+    elapsed = time.perf_counter() - start
+    for path, number in hits:
+        print("%s\tスライド %d" % (path, number))
+    print("%d 件 (%.2f ms)" % (len(hits), elapsed * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,238 @@
+"""生成済みの .pptx を読み戻して内容モデル (デッキ仕様) にする
+
+ppt.py / main.py / doer.py / slide.py のどれで作ったデッキでも、スライドごとに
+タイトル・本文 (【】見出し / • / - の箇条書きレベル)・表・フッターを取り出す。
+スライドは ZIP から1枚ずつ読み込んでパースするため、大きなアーカイブでも
+必要なスライドの分しかメモリを使わない。多数のデッキは convert() でプロセス並列に変換できる。
+
+内容モデルは model.py のオブジェクト (to_dict() で JSON にできる) で、本文の段落は
+to_text_list() で各ビルダーの apply_body_style() にそのまま渡せる文字列リストに戻せる。
+
+使い方:
+    python deck_reader.py great1.pptx
+    python deck_reader.py archive/ --out specs/ --workers 4
+    python deck_reader.py --check slide     # slide.py のデッキを読み戻してタイトル・本文を照合する
+"""
+import json
+import os
+import re
+import sys
+import zipfile
+from multiprocessing import Pool
+
+from model import Cell, Deck, Paragraph, Run, Slide, Table, TextBlock
+from shape_records import EMU_PER_INCH, plain_text, slide_members, slide_placeholders, slide_records, slide_size
+
+# スライド下端からこの範囲に収まるテキストをフッターとみなす
+FOOTER_ZONE = int(0.5 * EMU_PER_INCH)
+
+_PAGE_RE = re.compile(r'\s*\|?\s*(\d+)\s*/\s*(\d+)\s*$')
+
+
+def _max_size(paragraphs):
+    return max((run['size'] or 0 for para in paragraphs for run in para['runs']), default=0)
+
+
+def _hex(color):
+    return '%02X%02X%02X' % tuple(color) if color else None
+
+
+def _strip_marker(runs, marker):
+    """先頭のランから箇条書き記号を取り除く"""
+    for run in runs:
+        if run.text.strip():
+            run.text = run.text.lstrip()[len(marker):].lstrip()
+            return
+
+
+def parse_items(paragraphs):
+    """段落レコードを箇条書き項目 (model.Paragraph) のリストにする"""
+    items = []
+    for para in paragraphs:
+        runs = [Run(run['text'], run['size'], run['bold'], _hex(run['color']), run['font'])
+                for run in para['runs']]
+        stripped = ''.join(run.text for run in runs).strip()
+        level = para['level']
+        heading = False
+        if stripped.startswith('【') and stripped.endswith('】'):
+            level, heading = 0, True
+        elif stripped.startswith('•'):
+            _strip_marker(runs, '•')
+            level = max(level, 1)
+        elif stripped.startswith('- '):
+            _strip_marker(runs, '-')
+            level = max(level, 2)
+        items.append(Paragraph(runs, level, heading))
+    # 末尾の空段落 (text_frame.clear() の名残) は取り除く
+    while items and not items[-1].text.strip():
+        items.pop()
+    return items
+
+
+def to_text_list(items):
+    """箇条書き項目を apply_body_style() 形式の文字列リストに戻す"""
+    return [item.to_text() for item in items]
+
+
+def _table_block(record):
+    rows = [[Cell(plain_text(cell['paragraphs']), _hex(cell['fill'])) for cell in row]
+            for row in record['table']['cells']]
+    return Table(rows, _box(record))
+
+
+def _box(record):
+    return (record['x'], record['y'], record['w'], record['h'])
+
+
+def read_slide(records, slide_width, slide_height, index=None):
+    """1枚分の図形レコードから内容モデル (model.Slide) を作る
+
+    blocks は上から順 (同じ高さなら左から) に並ぶ TextBlock ('text' / 'bullets') と Table。
+    """
+    footer = None
+    texts = []
+    tables = []
+    for record in records:
+        if record['kind'] == 'table':
+            tables.append(record)
+            continue
+        if not record['paragraphs'] or not plain_text(record['paragraphs']).strip():
+            continue
+        if footer is None and record['y'] >= slide_height - FOOTER_ZONE:
+            footer = record
+        else:
+            texts.append(record)
+
+    title = None
+    if texts:
+        # フォントサイズが最大のもの (同じなら上にあるもの) をタイトルとする
+        title = max(texts, key=lambda r: (_max_size(r['paragraphs']), -r['y']))
+        texts.remove(title)
+
+    footer_text, page, total = None, None, None
+    if footer is not None:
+        footer_text = plain_text(footer['paragraphs']).strip()
+        match = _PAGE_RE.search(footer_text)
+        if match:
+            page, total = int(match.group(1)), int(match.group(2))
+            footer_text = footer_text[:match.start()].strip()
+
+    blocks = [TextBlock(parse_items(record['paragraphs']), _box(record)) for record in texts]
+    blocks.extend(_table_block(record) for record in tables)
+    blocks.sort(key=lambda block: (block.y, block.x))
+
+    return Slide(plain_text(title['paragraphs']).strip() if title else None, blocks,
+                 footer_text, page, total, index)
+
+
+def iter_deck(path):
+    """デッキのスライドの内容モデルを1枚ずつ返す (ZIP からスライドを逐次読み込む)"""
+    with zipfile.ZipFile(path) as zf:
+        width, height = slide_size(zf)
+        cache = {}
+        for index, member in enumerate(slide_members(zf), 1):
+            records = slide_records(zf.read(member), slide_placeholders(zf, member, cache))
+            yield read_slide(records, width, height, index)
+
+
+def read_deck(path):
+    """デッキ全体の内容モデル (model.Deck) を返す"""
+    with zipfile.ZipFile(path) as zf:
+        width, height = slide_size(zf)
+    return Deck(iter_deck(path), width, height, path)
+
+
+def _item_text(line):
+    """apply_body_style() 形式の1行から箇条書き記号を除いた本文"""
+    stripped = line.strip()
+    for marker in ('•', '- '):
+        if stripped.startswith(marker):
+            return stripped[len(marker):].strip()
+    return stripped
+
+
+def check_roundtrip(module_name='slide'):
+    """ビルダーのデッキを保存して読み戻し、プレースホルダーに入れたタイトルと本文が
+    内容モデルに戻るかを確かめる。食い違いの (スライド番号, 説明) のリストを返す"""
+    import importlib
+    import io
+    module = importlib.import_module(module_name)
+    prs = module.build_presentation()
+    data = io.BytesIO()
+    prs.save(data)
+    problems = []
+    for slide, read in zip(prs.slides, iter_deck(data)):
+        for shape in slide.placeholders:
+            if not shape.has_text_frame or not shape.text_frame.text.strip():
+                continue
+            if shape.placeholder_format.idx == 0:
+                if read.title != shape.text_frame.text.strip():
+                    problems.append((read.index, "タイトル %r が %r として読まれました" % (shape.text_frame.text, read.title)))
+                continue
+            lines = [_item_text(p.text) for p in shape.text_frame.paragraphs]
+            while lines and not lines[-1]:
+                lines.pop()
+            if not any(isinstance(block, TextBlock) and [p.text.strip() for p in block.paragraphs] == lines
+                       for block in read.blocks):
+                problems.append((read.index, "%s の本文が読み戻せません" % shape.name))
+    return problems
+
+
+def _convert_one(task):
+    path, out_path = task
+    try:
+        deck = read_deck(path)
+    except (zipfile.BadZipFile, KeyError) as e:
+        return path, "読み込みに失敗しました: %s" % e
+    with open(out_path, 'w', encoding='utf-8') as f:
+        json.dump(deck.to_dict(), f, ensure_ascii=False, indent=1)
+    return path, None
+
+
+def convert(paths, out_dir, workers=None):
+    """paths のデッキを out_dir に JSON として書き出し、(成功数, [(パス, エラー)]) を返す"""
+    from deck_index import iter_deck_paths
+    os.makedirs(out_dir, exist_ok=True)
+    tasks = []
+    for path in iter_deck_paths(paths):
+        name = os.path.splitext(os.path.basename(path))[0]
+        tasks.append((path, os.path.join(out_dir, '%s_%d.json' % (name, len(tasks) + 1))))
+    converted, errors = 0, []
+    with Pool(workers) as pool:
+        for path, error in pool.imap_unordered(_convert_one, tasks, chunksize=8):
+            if error:
+                errors.append((path, error))
+            else:
+                converted += 1
+    return converted, errors
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='.pptx を内容モデル (JSON) に変換する')
+    parser.add_argument('paths', nargs='*', help='.pptx ファイルまたはディレクトリ')
+    parser.add_argument('--out', help='JSON の出力先ディレクトリ (省略時は標準出力)')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--check', metavar='MODULE', help='MODULE のデッキを読み戻してタイトル・本文を照合する')
+    args = parser.parse_args()
+    if args.check:
+        problems = check_roundtrip(args.check)
+        for index, message in problems:
+            print("slide %d: %s" % (index, message))
+        print("%s: 読み戻しの食い違い %d 件" % (args.check, len(problems)))
+        sys.exit(1 if problems else 0)
+    if not args.paths:
+        parser.error('.pptx ファイルまたはディレクトリを指定してください')
+    if args.out is None:
+        for path in args.paths:
+            json.dump(read_deck(path).to_dict(), sys.stdout, ensure_ascii=False, indent=1)
+            print()
+        return
+    converted, errors = convert(args.paths, args.out, args.workers)
+    for path, error in errors:
+        print("%s: %s" % (path, error), file=sys.stderr)
+    print("%d 件を変換しました: %s" % (converted, args.out))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,14 @@
 import os
 from pptx import Presentation
 from pptx.util import Inches, Pt
-from pptx.enum.text import PP_ALIGN
+from pptx.enum.text import PP_ALIGN, MSO_AUTO_SIZE
 from pptx.dml.color import RGBColor
 from pptx.enum.shapes import MSO_SHAPE
 from pptx.enum.dml import MSO_THEME_COLOR, MSO_FILL
 
+from markup import add_runs, parse_line
+from saver import presentation_bytes, save_presentation
+
 # 白と黒を基調としたシンプルなカラーパレット
 class ColorPalette:
     BACKGROUND = RGBColor(255, 255, 255)  # ホワイト
@@ -30,12 +33,13 @@ SUBHEADING_SIZE = Pt(20)
 BODY_SIZE = Pt(16)
 CAPTION_SIZE = Pt(12)
 
-def create_presentation():
-    prs = Presentation()
-    
-    # スライドサイズを16:9に設定
-    prs.slide_width = Inches(13.33)
-    prs.slide_height = Inches(7.5)
+def build_presentation(prs=None):
+    if prs is None:
+        prs = Presentation()
+        
+        # スライドサイズを16:9に設定
+        prs.slide_width = Inches(13.33)
+        prs.slide_height = Inches(7.5)
     
     # スライドを作成
     create_title_slide(prs)
@@ -48,11 +52,19 @@ def create_presentation():
     create_budget(prs)
     create_success_criteria(prs)
     create_conclusion(prs)
+    return prs
+
+def create_presentation():
+    prs = build_presentation()
     
     # プレゼンテーションを保存
-    prs.save('great1.pptx')
+    save_presentation(prs, 'great1.pptx')
     print("洗練されたプレゼンテーションが作成されました: great1.pptx")
 
+def build_presentation_bytes(**options):
+    # ファイルに書き出さずに .pptx のバイト列を返す（options は saver.presentation_bytes() に渡す）
+    return presentation_bytes(build_presentation(), **options)
+
 def apply_title_style(title_shape, text, font_size=TITLE_SIZE, color=ColorPalette.TEXT, align=PP_ALIGN.LEFT, bold=True):
     """タイトルのスタイルを適用する"""
     title_shape.text = text
@@ -72,57 +84,29 @@ def apply_body_style(body_shape, text_list, font_size=BODY_SIZE, color=ColorPale
     p = tf.add_paragraph()
     
     for i, original_text in enumerate(text_list):
-        text_to_set = original_text  # スタイル適用用のテキスト
-
         # 2番目以降は新しい段落を追加
         if i > 0:
             p = tf.add_paragraph()
 
+        # 行頭の記号と行内の **太字**・{色:…}・[リンク](URL) を解析（文字列ごとにキャッシュ）
+        line = parse_line(original_text, ColorPalette)
+
         # 空文字列または空白のみの場合
-        if not original_text.strip():
+        if not line.spans:
             p.text = ""
             p.space_after = para_spacing
             continue
 
-        # レベル決定とテキスト変更
-        level = 0
-        space_before = Pt(0)
-        is_heading = False
-        is_bullet1 = False
-        is_bullet2 = False
-
-        if original_text.startswith('【') and original_text.endswith('】'):
-            level = 0
-            space_before = Pt(15) if i > 0 else Pt(0)
-            is_heading = True
-        elif original_text.startswith('• '):
-            level = 1
-            text_to_set = original_text[2:]
-            is_bullet1 = True
-        elif original_text.startswith('  - '):
-            level = 2
-            text_to_set = original_text[4:]
-            is_bullet2 = True
-        else:
-            level = 0
-
-        # テキスト、レベル、スペースを設定
-        p.text = text_to_set
-        p.level = level
+        # レベル、スペースを設定
+        p.level = line.level
         p.space_after = para_spacing
-        p.space_before = space_before
-
-        run = p.runs[0] if p.runs else p.add_run()
-        run.font.name = BODY_FONT
-        run.font.size = font_size
+        p.space_before = Pt(15) if line.heading and i > 0 else Pt(0)
 
-        if is_heading:
-            run.font.bold = True
-            run.font.size = font_size + Pt(4)  # 見出しは少し大きく
-            run.font.color.rgb = color
+        if line.heading:
+            # 見出しは太字で少し大きく
+            add_runs(p, line.spans, BODY_FONT, font_size + Pt(4), color, bold=True, palette=ColorPalette)
         else:
-            run.font.bold = False
-            run.font.color.rgb = color
+            add_runs(p, line.spans, BODY_FONT, font_size, color, palette=ColorPalette)
 
 def add_shape(slide, shape_type, left, top, width, height, fill_color=None, line_color=None, 
               line_width=Pt(0.75), shadow=False, transparency=0, gradient_to=None, text=None):
@@ -173,7 +157,7 @@ def add_shape(slide, shape_type, left, top, width, height, fill_color=None, line
         shape.text = text
         tf = shape.text_frame
         tf.word_wrap = True
-        tf.auto_size = True
+        tf.auto_size = MSO_AUTO_SIZE.SHAPE_TO_FIT_TEXT
         p = tf.paragraphs[0]
         p.alignment = PP_ALIGN.CENTER
         run = p.runs[0] if p.runs else p.add_run()
@@ -1035,12 +1019,26 @@ def main():
     import sys
     if len(sys.argv) > 1 and sys.argv[1] == 'ppt':
         ppt()
+    elif len(sys.argv) > 1 and sys.argv[1] == 'watch':
+        watch(sys.argv[2:])
     else:
-        print("使用方法: doer ppt")
+        print("使用方法: doer ppt | doer watch [--module ppt] [--fields fields.json] [-o 出力.pptx]")
     print("Doerは仕事を完了しました。")
 
 def ppt():
     print("doer ppt が実行されました")
 
+def watch(args):
+    """ビルダーのソースと差し込み値を監視し、変わったスライドだけを作り直す"""
+    import argparse
+    import watcher
+    parser = argparse.ArgumentParser(prog='doer watch')
+    parser.add_argument('--module', default='ppt', help='SLIDE_BUILDERS を持つモジュール')
+    parser.add_argument('--fields', default=None, help='PROPOSAL_FIELDS を上書きする JSON ファイル')
+    parser.add_argument('-o', '--output', default='project_proposal.pptx')
+    parser.add_argument('--debounce', type=float, default=0.3, help='保存が続いたときに待つ秒数')
+    options = parser.parse_args(args)
+    watcher.watch(options.module, options.fields, options.output, debounce=options.debounce)
+
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,704 @@
+"""ドライラン: python-pptx を使わずにビルダーを実行し、図形の配置だけを JSON にする
+
+プレビューやレイアウト検査に必要なのは「どこに何が置かれるか」だけで、.pptx は要らない。
+DryPresentation はビルダーが使う python-pptx の API (slides.add_slide / shapes.add_textbox /
+add_shape / add_table / add_group_shape / text_frame / fill / line など) と同じ名前の
+軽いオブジェクトを返し、XML を作らずに値を覚えておく。records() は実際に生成した
+スライドを shape_records.slide_records で読んだときと同じ形式のレコード (種類・位置・塗り・
+線・段落とラン) を返すので、layout_lint とサムネイル描画はそのまま使える。
+
+図形 ID・名前・既定の塗りと文字色 (オートシェイプのスタイル)・表の列幅と行の高さなどは
+python-pptx の既定値に合わせている。--check で実際の生成結果と全レコードを比べられる。
+レイアウトのプレースホルダー (slide.shapes.title など) は位置を python-pptx 同梱テンプレートの
+レイアウト・マスターから継承する。slide_records と同じく、テキストの無いものは描画対象にしない。
+
+使い方:
+    python dryrun.py ppt -o layout.json
+    python dryrun.py ppt --lint --overflow        # layout_lint で検査する
+    python dryrun.py main --thumbnails thumbs/    # サムネイルを描画する
+    python dryrun.py ppt --check --bench          # 実際の生成結果との比較と速度の比較
+"""
+import functools
+import importlib
+import json
+import time
+
+from pptx.shapes.autoshape import AutoShapeType
+from pptx.util import Emu, Inches
+
+from shape_records import TABLE_BAND_FILLS, TABLE_HEADER_FILL, THEME_COLORS, placeholder_boxes
+
+_DEFAULT_INSETS = (91440, 45720, 91440, 45720)
+_DEFAULT_LINE_WIDTH = 9525
+_DEFAULT_FONT_SIZE = 18.0
+# オートシェイプのスタイル (塗り accent1・線 accent1 の 50% 暗・文字 lt1)
+_STYLE_FILL = THEME_COLORS['accent1']
+_STYLE_LINE = tuple(int(c * 0.5) for c in THEME_COLORS['accent1'])
+_STYLE_TEXT = THEME_COLORS['lt1']
+
+# python-pptx 同梱テンプレートのレイアウトごとのプレースホルダー (名前の前半, idx)。日付・フッター・
+# スライド番号は複製されない
+DEFAULT_LAYOUTS = (
+    (('Title', 0), ('Subtitle', 1)),
+    (('Title', 0), ('Content Placeholder', 1)),
+    (('Title', 0), ('Text Placeholder', 1)),
+    (('Title', 0), ('Content Placeholder', 1), ('Content Placeholder', 2)),
+    (('Title', 0), ('Text Placeholder', 1), ('Content Placeholder', 2), ('Text Placeholder', 3),
+     ('Content Placeholder', 4)),
+    (('Title', 0),),
+    (),
+    (('Title', 0), ('Content Placeholder', 1), ('Text Placeholder', 2)),
+    (('Title', 0), ('Picture Placeholder', 1), ('Text Placeholder', 2)),
+    (('Title', 0), ('Vertical Text Placeholder', 1)),
+    (('Vertical Title', 0), ('Vertical Text Placeholder', 1)),
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _default_placeholder_boxes():
+    """同梱テンプレートのレイアウトごとの placeholder_boxes() (DEFAULT_LAYOUTS と同じ順)"""
+    from pptx import Presentation
+    return tuple(placeholder_boxes(layout._element, layout.slide_master._element)
+                 for layout in Presentation().slide_layouts)
+
+
+def _rgb(color):
+    return [color[0], color[1], color[2]]
+
+
+class _Color:
+    def __init__(self):
+        self.rgb = None
+        self.theme_color = None
+
+
+class _Font:
+    def __init__(self):
+        self.name = None
+        self.size = None
+        self.bold = None
+        self.italic = None
+        self.underline = None
+        self.color = _Color()
+
+
+class _Hyperlink:
+    def __init__(self, run):
+        self._run = run
+        self.address = None
+
+
+class _Run:
+    def __init__(self, text=''):
+        self.text = text
+        self.font = _Font()
+        self.hyperlink = _Hyperlink(self)
+
+
+class _Break:
+    text = '\n'
+
+
+def _split_breaks(text):
+    """p.text の '\\n' / '\\v' は改行 (a:br) になる"""
+    items = []
+    for i, piece in enumerate(text.replace('\v', '\n').split('\n')):
+        if i:
+            items.append(_Break())
+        if piece:
+            items.append(_Run(piece))
+    return items
+
+
+class _Paragraph:
+    def __init__(self, align=None):
+        self._items = []
+        self.alignment = align
+        self.level = 0
+        self.space_before = None
+        self.space_after = None
+        self.line_spacing = None
+        self.font = _Font()
+
+    @property
+    def runs(self):
+        return tuple(item for item in self._items if isinstance(item, _Run))
+
+    @property
+    def text(self):
+        return ''.join(item.text for item in self._items)
+
+    @text.setter
+    def text(self, text):
+        self._items = _split_breaks(str(text))
+
+    def add_run(self):
+        run = _Run()
+        self._items.append(run)
+        return run
+
+    def add_line_break(self):
+        self._items.append(_Break())
+
+    def clear(self):
+        self._items = []
+        return self
+
+
+class _TextFrame:
+    def __init__(self, wrap, anchor=None, align=None):
+        self.paragraphs = [_Paragraph(align)]
+        self.word_wrap = wrap
+        self.vertical_anchor = anchor
+        self.auto_size = None
+        self.margin_left = self.margin_top = self.margin_right = self.margin_bottom = None
+
+    @property
+    def paragraphs(self):
+        return tuple(self._paragraphs)
+
+    @paragraphs.setter
+    def paragraphs(self, paragraphs):
+        self._paragraphs = list(paragraphs)
+
+    @property
+    def text(self):
+        return '\n'.join(p.text for p in self._paragraphs)
+
+    @text.setter
+    def text(self, text):
+        # tf.text は '\n' ごとに段落を分ける (段落の書式は残らない)
+        self._paragraphs = []
+        for line in str(text).split('\n'):
+            p = _Paragraph()
+            p._items = _split_breaks(line)
+            self._paragraphs.append(p)
+
+    def add_paragraph(self):
+        p = _Paragraph()
+        self._paragraphs.append(p)
+        return p
+
+    def clear(self):
+        del self._paragraphs[1:]
+        self._paragraphs[0].clear()
+
+    def _insets(self):
+        margins = (self.margin_left, self.margin_top, self.margin_right, self.margin_bottom)
+        return [int(m) if m is not None else d for m, d in zip(margins, _DEFAULT_INSETS)]
+
+
+class _GradientStop:
+    def __init__(self, position):
+        self.position = position
+        self.color = _Color()
+
+
+class _Fill:
+    def __init__(self, kind):
+        self._kind = kind  # 'style' / 'none' / 'solid' / 'gradient'
+        self.fore_color = _Color()
+        self.gradient_stops = ()
+        self.gradient_angle = None
+
+    def solid(self):
+        self._kind = 'solid'
+
+    def background(self):
+        self._kind = 'none'
+
+    def gradient(self):
+        self._kind = 'gradient'
+        self.gradient_stops = (_GradientStop(0.0), _GradientStop(1.0))
+        self.gradient_angle = 0.0
+
+    def _record(self):
+        if self._kind == 'style':
+            return {'fill': tuple(_STYLE_FILL), 'alpha': 1.0, 'gradient': None}
+        if self._kind == 'solid' and self.fore_color.rgb is not None:
+            return {'fill': tuple(self.fore_color.rgb), 'alpha': 1.0, 'gradient': None}
+        if self._kind == 'gradient':
+            stops = [[int(round(stop.position * 100000)) / 100000.0, _rgb(stop.color.rgb if stop.color.rgb is not None else _STYLE_FILL)]
+                     for stop in self.gradient_stops]
+            # python-pptx の角度 (反時計回り) を a:lin の ang (時計回り) に直す
+            angle = 0.0
+            if self.gradient_angle:
+                angle = int(round((360.0 - self.gradient_angle) % 360.0 * 60000)) / 60000.0
+            return {'fill': stops[0][1], 'alpha': 1.0, 'gradient': {'stops': stops, 'angle': angle}}
+        return {'fill': None, 'alpha': 1.0, 'gradient': None}
+
+
+class _Line:
+    def __init__(self, styled):
+        self._styled = styled
+        self.width = None
+        self.dash_style = None
+        self.fill = _Fill(None)
+
+    @property
+    def color(self):
+        # python-pptx と同じく、線の色に触れると単色の線になる
+        if self.fill._kind != 'solid':
+            self.fill.solid()
+        return self.fill.fore_color
+
+    def _record(self):
+        if self.fill._kind == 'none':
+            return None
+        color = self.fill.fore_color.rgb if self.fill._kind == 'solid' else None
+        if color is None:
+            if not self._styled:
+                return None
+            color = _STYLE_LINE
+        return {'color': _rgb(color), 'width': int(self.width) if self.width is not None else _DEFAULT_LINE_WIDTH}
+
+
+class _Shadow:
+    def __init__(self):
+        self.inherit = True
+
+
+class _Shape:
+    """オートシェイプとテキストボックス"""
+
+    def __init__(self, shape_id, name, geom, left, top, width, height, textbox):
+        self.shape_id = shape_id
+        self.name = name
+        self.geom = geom
+        self.left, self.top, self.width, self.height = Emu(left), Emu(top), Emu(width), Emu(height)
+        self._textbox = textbox
+        if textbox:
+            self.text_frame = _TextFrame(False)
+            self.fill = _Fill('none')
+        else:
+            self.text_frame = _TextFrame(None, 'ctr', 'ctr')
+            self.fill = _Fill('style')
+        self.line = _Line(not textbox)
+        self.shadow = _Shadow()
+        self.rotation = 0.0
+
+    @property
+    def text(self):
+        return self.text_frame.text
+
+    @text.setter
+    def text(self, text):
+        self.text_frame.text = text
+
+    def _record(self, links):
+        tf = self.text_frame
+        default_color = THEME_COLORS['dk1'] if self._textbox else _STYLE_TEXT
+        record = {
+            'kind': 'textbox' if self._textbox else 'shape',
+            'id': self.shape_id, 'name': self.name, 'geom': self.geom,
+            'x': int(self.left), 'y': int(self.top), 'w': int(self.width), 'h': int(self.height),
+            'line': self.line._record(),
+            'paragraphs': _paragraph_records(tf.paragraphs, default_color, links),
+            'wrap': tf.word_wrap is not False,
+            'anchor': tf.vertical_anchor.xml_value if hasattr(tf.vertical_anchor, 'xml_value')
+            else (tf.vertical_anchor or 't'),
+            'insets': tf._insets(),
+        }
+        record.update(self.fill._record())
+        return record
+
+
+def _points(length):
+    # spcPts と sz は 1/100 pt の整数で保存される
+    return int(length) // 127 / 100.0 if length is not None else 0.0
+
+
+def _paragraph_records(paragraphs, default_color, links):
+    records = []
+    for p in paragraphs:
+        align = p.alignment
+        para = {
+            'level': int(p.level or 0),
+            'align': align.xml_value if hasattr(align, 'xml_value') else (align or 'l'),
+            'space_before': _points(p.space_before),
+            'space_after': _points(p.space_after),
+            'runs': [],
+        }
+        for item in p._items:
+            if isinstance(item, _Break):
+                para['runs'].append({'text': '\n', 'size': _DEFAULT_FONT_SIZE, 'bold': False,
+                                     'color': _rgb(default_color), 'font': None})
+                continue
+            font = item.font
+            run = {
+                'text': item.text,
+                'size': _points(font.size) if font.size is not None else _DEFAULT_FONT_SIZE,
+                'bold': bool(font.bold),
+                'color': _rgb(font.color.rgb if font.color.rgb is not None else default_color),
+                'font': font.name,
+            }
+            if item.hyperlink.address:
+                run['link'] = links(item.hyperlink.address)
+            para['runs'].append(run)
+        records.append(para)
+    return records
+
+
+class _Cell:
+    def __init__(self):
+        self.text_frame = _TextFrame(None)
+        self.fill = _Fill('table')
+        self.margin_left = self.margin_top = self.margin_right = self.margin_bottom = None
+        self.vertical_anchor = None
+
+    @property
+    def text(self):
+        return self.text_frame.text
+
+    @text.setter
+    def text(self, text):
+        self.text_frame.text = text
+
+
+class _Column:
+    def __init__(self, frame, width):
+        self._frame = frame
+        self._width = width
+
+    @property
+    def width(self):
+        return Emu(self._width)
+
+    @width.setter
+    def width(self, value):
+        # python-pptx と同じく、列幅を変えると表の枠の幅も列幅の合計になる
+        self._width = int(value)
+        self._frame.width = Emu(sum(col._width for col in self._frame.table.columns))
+
+
+class _Row:
+    def __init__(self, frame, height, cells):
+        self._frame = frame
+        self._height = height
+        self.cells = cells
+
+    @property
+    def height(self):
+        return Emu(self._height)
+
+    @height.setter
+    def height(self, value):
+        self._height = int(value)
+        self._frame.height = Emu(sum(row._height for row in self._frame.table.rows))
+
+
+class _Table:
+    def __init__(self, frame, rows, cols, width, height):
+        self.columns = tuple(_Column(frame, int(width / cols)) for _ in range(cols))
+        self.rows = tuple(_Row(frame, int(height / rows), tuple(_Cell() for _ in range(cols)))
+                          for _ in range(rows))
+        self.first_row = True
+        self.horz_banding = True
+
+    def cell(self, row, col):
+        return self.rows[row].cells[col]
+
+
+class _GraphicFrame:
+    def __init__(self, shape_id, name, rows, cols, left, top, width, height):
+        self.shape_id = shape_id
+        self.name = name
+        self.left, self.top, self.width, self.height = Emu(left), Emu(top), Emu(width), Emu(height)
+        self.table = _Table(self, rows, cols, width, height)
+
+    def _record(self, links):
+        table = self.table
+        cells = []
+        for ri, row in enumerate(table.rows):
+            header = table.first_row and ri == 0
+            if header:
+                default_fill, text_color = TABLE_HEADER_FILL, THEME_COLORS['lt1']
+            else:
+                band = (ri - (1 if table.first_row else 0)) % 2 if table.horz_banding else 1
+                default_fill, text_color = TABLE_BAND_FILLS[band], THEME_COLORS['dk1']
+            record_row = []
+            for cell in row.cells:
+                kind = cell.fill._kind
+                if kind == 'none':
+                    fill = None
+                elif kind == 'solid' and cell.fill.fore_color.rgb is not None:
+                    fill = _rgb(cell.fill.fore_color.rgb)
+                else:
+                    fill = _rgb(default_fill)
+                paragraphs = _paragraph_records(cell.text_frame.paragraphs, text_color, links)
+                if header:
+                    for para in paragraphs:
+                        for run in para['runs']:
+                            run['bold'] = True
+                record_row.append({'fill': fill, 'paragraphs': paragraphs})
+            cells.append(record_row)
+        return {
+            'kind': 'table', 'id': self.shape_id, 'name': self.name,
+            'x': int(self.left), 'y': int(self.top), 'w': int(self.width), 'h': int(self.height),
+            'table': {'cols': [col._width for col in table.columns],
+                      'rows': [row._height for row in table.rows], 'cells': cells},
+        }
+
+
+class _Placeholder(_Shape):
+    """レイアウトから位置を継承するプレースホルダー (テキストが無ければレコードにならない)"""
+
+    def __init__(self, shape_id, name, idx, layout):
+        super().__init__(shape_id, name, 'rect', 0, 0, 0, 0, True)
+        self.text_frame = _TextFrame(None)
+        self.placeholder_idx = idx
+        self._layout = layout
+
+    def _box(self):
+        if self._layout not in DEFAULT_LAYOUTS:
+            return None
+        boxes = _default_placeholder_boxes()[DEFAULT_LAYOUTS.index(self._layout)]
+        return boxes.get(('idx', self.placeholder_idx))
+
+    def _record(self, links):
+        if not any(run.text.strip() for p in self.text_frame.paragraphs for run in p.runs):
+            return None
+        box = self._box()
+        if box is None:
+            return None
+        record = super()._record(links)
+        record['kind'] = 'shape'
+        record['x'], record['y'], record['w'], record['h'] = box
+        return record
+
+
+class _Shapes:
+    def __init__(self, slide):
+        self._slide = slide
+        self._shapes = []
+
+    def __iter__(self):
+        return iter(self._shapes)
+
+    def __len__(self):
+        return len(self._shapes)
+
+    def _add(self, shape):
+        self._shapes.append(shape)
+        return shape
+
+    def add_textbox(self, left, top, width, height):
+        shape_id = self._slide._next_id()
+        return self._add(_Shape(shape_id, 'TextBox %d' % (shape_id - 1), 'rect', left, top, width, height, True))
+
+    def add_shape(self, autoshape_type_id, left, top, width, height):
+        shape_id = self._slide._next_id()
+        autoshape = AutoShapeType(autoshape_type_id)
+        return self._add(_Shape(shape_id, '%s %d' % (autoshape.basename, shape_id - 1), autoshape.prst,
+                                left, top, width, height, False))
+
+    def add_table(self, rows, cols, left, top, width, height):
+        shape_id = self._slide._next_id()
+        return self._add(_GraphicFrame(shape_id, 'Table %d' % (shape_id - 1), rows, cols, left, top, width, height))
+
+    def add_group_shape(self, shapes=()):
+        shape_id = self._slide._next_id()
+        group = self._add(_Group(self._slide, shape_id, 'Group %d' % (shape_id - 1)))
+        for shape in shapes:
+            self._shapes.remove(shape)
+            group.shapes._shapes.append(shape)
+        return group
+
+    @property
+    def title(self):
+        for shape in self._shapes:
+            if isinstance(shape, _Placeholder) and shape.placeholder_idx == 0:
+                return shape
+        return None
+
+    def _records(self, links):
+        records = []
+        for shape in self._shapes:
+            if isinstance(shape, _Group):
+                records.extend(shape.shapes._records(links))
+                continue
+            record = shape._record(links)
+            if record is not None:
+                records.append(record)
+        return records
+
+
+class _Group:
+    def __init__(self, slide, shape_id, name):
+        self.shape_id = shape_id
+        self.name = name
+        self.shapes = _Shapes(slide)
+
+
+class _Placeholders:
+    def __init__(self, shapes):
+        self._shapes = shapes
+
+    def __getitem__(self, idx):
+        for shape in self._shapes:
+            if isinstance(shape, _Placeholder) and shape.placeholder_idx == idx:
+                return shape
+        raise KeyError("no placeholder on this slide with idx == %d" % idx)
+
+    def __iter__(self):
+        return (shape for shape in self._shapes if isinstance(shape, _Placeholder))
+
+
+class DrySlide:
+    def __init__(self, layout):
+        self._last_id = 1  # spTree 自身が id 1
+        self.shapes = _Shapes(self)
+        for base, idx in layout:
+            shape_id = self._next_id()
+            self.shapes._add(_Placeholder(shape_id, '%s %d' % (base, shape_id - 1), idx, layout))
+        self.placeholders = _Placeholders(self.shapes)
+
+    def _next_id(self):
+        self._last_id += 1
+        return self._last_id
+
+    def records(self):
+        """shape_records.slide_records と同じ形式のレコードのリスト"""
+        links = {}
+
+        def link_id(address):
+            # スライドのリレーションは rId1 がレイアウト。同じ URL は同じ rId を使う
+            return links.setdefault(address, 'rId%d' % (len(links) + 2))
+
+        return self.shapes._records(link_id)
+
+
+class _Slides:
+    def __init__(self):
+        self._slides = []
+
+    def add_slide(self, layout):
+        slide = DrySlide(layout)
+        self._slides.append(slide)
+        return slide
+
+    def __iter__(self):
+        return iter(self._slides)
+
+    def __len__(self):
+        return len(self._slides)
+
+    def __getitem__(self, index):
+        return self._slides[index]
+
+
+class DryPresentation:
+    """ビルダーに渡す Presentation の代わり"""
+
+    def __init__(self, width=Inches(13.33), height=Inches(7.5), layouts=DEFAULT_LAYOUTS):
+        self.slide_width = Emu(width)
+        self.slide_height = Emu(height)
+        self.slide_layouts = layouts
+        self.slides = _Slides()
+
+    def records(self):
+        """(スライド幅, 高さ, [スライドごとのレコード]) (shape_records.presentation_records と同じ形)"""
+        return self.slide_width, self.slide_height, [slide.records() for slide in self.slides]
+
+
+def dry_run(module_name='ppt', width=Inches(13.33), height=Inches(7.5)):
+    """module_name の build_presentation() をドライランで実行し、(幅, 高さ, レコード) を返す"""
+    module = importlib.import_module(module_name)
+    prs = DryPresentation(width, height)
+    module.build_presentation(prs)
+    return prs.records()
+
+
+def to_json(records):
+    width, height, slides = records
+    return {'width': int(width), 'height': int(height), 'slides': slides}
+
+
+def compare(module_name='ppt'):
+    """ドライランと実際の生成結果のレコードを比べ、違うスライド番号と図形のリストを返す"""
+    from shape_records import presentation_records
+    module = importlib.import_module(module_name)
+    _, _, expected = presentation_records(module.build_presentation())
+    _, _, actual = dry_run(module_name)
+    differences = []
+    for index, (want, got) in enumerate(zip(expected, actual), 1):
+        if want != got:
+            names = [w.get('name') for w, g in zip(want, got) if w != g] or ['図形の数 %d / %d' % (len(want), len(got))]
+            differences.append((index, names))
+    if len(expected) != len(actual):
+        differences.append((None, ['スライドの数 %d / %d' % (len(expected), len(actual))]))
+    return differences
+
+
+def _bench(module_name='ppt', repeat=20):
+    """実際の生成 (build_presentation + slide_records) とドライランの1デッキあたりの秒数を返す"""
+    from shape_records import presentation_records
+    module = importlib.import_module(module_name)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        presentation_records(module.build_presentation())
+    real = (time.perf_counter() - start) / repeat
+    start = time.perf_counter()
+    for _ in range(repeat):
+        dry_run(module_name)
+    dry = (time.perf_counter() - start) / repeat
+    return real, dry
+
+
+def main():
+    import argparse
+    import sys
+    parser = argparse.ArgumentParser(description='python-pptx を使わずにビルダーを実行し、図形の配置を JSON にする')
+    parser.add_argument('module', nargs='?', default='ppt', help='build_presentation() を持つモジュール')
+    parser.add_argument('-o', '--output', default=None, help='JSON の出力先 (省略時は標準出力)')
+    parser.add_argument('--lint', action='store_true', help='layout_lint で検査する')
+    parser.add_argument('--overflow', action='store_true', help='--lint で本文のはみ出しも調べる')
+    parser.add_argument('--thumbnails', default=None, help='サムネイル PNG の出力ディレクトリ')
+    parser.add_argument('--check', action='store_true', help='実際の生成結果とレコードを比べる')
+    parser.add_argument('--bench', action='store_true', help='実際の生成との速度を比べる')
+    args = parser.parse_args()
+
+    if args.check or args.bench:
+        if args.check:
+            differences = compare(args.module)
+            for index, names in differences:
+                print("slide %s: %s" % (index, ', '.join(str(name) for name in names)))
+            print("%s: 実際の生成結果との違い %d 枚" % (args.module, len(differences)))
+        if args.bench:
+            real, dry = _bench(args.module)
+            print("%s: 実際の生成 %.1f ms / ドライラン %.2f ms (%.0f 倍)"
+                  % (args.module, real * 1000, dry * 1000, real / dry))
+        return
+
+    start = time.perf_counter()
+    records = dry_run(args.module)
+    elapsed = time.perf_counter() - start
+    width, height, slides = records
+    if args.lint:
+        from layout_lint import format_issue, lint_slide_records
+        problems = 0
+        for index, slide in enumerate(slides, 1):
+            for issue in lint_slide_records(slide, width, height, index, args.overflow):
+                problems += 1
+                print("%s %s" % (args.module, format_issue(issue)))
+        print("%d スライドを検査: 問題 %d 件" % (len(slides), problems), file=sys.stderr)
+        sys.exit(1 if problems else 0)
+    if args.thumbnails:
+        import os
+        from thumbnail import render_records
+        os.makedirs(args.thumbnails, exist_ok=True)
+        for index, slide in enumerate(slides, 1):
+            render_records(slide, width, height).save(os.path.join(args.thumbnails, 'slide%d.png' % index))
+        print("サムネイルを作成しました: %d 枚 -> %s" % (len(slides), args.thumbnails))
+        return
+    text = json.dumps(to_json(records), ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+        print("作成しました: %s (%d スライド, %.1f ms)" % (args.output, len(slides), elapsed * 1000))
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,320 @@
+"""12 カラムのグリッドと縦積みの制約で図形の位置・大きさを決めるレイアウトエンジン
+
+ビルダーは図形ごとに Inches(1.15), Inches(4.4) のような座標を直接書いているため、
+文言が1行増えるだけで下の図形を手で動かす必要があった。このモジュールではスライドの
+構成をノードの木 (テンプレート) として書き、本文の高さ (linebreak.py で見積もる) から
+各ノードの Box (left, top, width, height) を計算する。
+
+ノード:
+    Text(name, font_size, para_spacing)   本文 (content[name] の行のリスト)。高さは内容から決まる
+    Fixed(name, height)                   高さが決まっている図形 (表など)
+    Fill(name, min_height)                残りの高さを埋める図形 (名前が None なら空白)
+    Stack(items, gap)                     上から順に積む。余った高さは Fill を含む子で分ける
+    Columns(cells, gap)                   横に並べる。Cell(start, span, node) は親の幅を
+                                          12 カラムに分けたときの位置と幅。高さは一番高い子に揃える
+    Panel(name, child, padding)           子を囲む図形 (角丸の枠など)。padding は内側の余白
+
+横方向の位置は内容によらずテンプレートだけで決まるので、先に幅を求めて本文を折り返し、
+Text ノードの高さのタプル (内容の形) を作る。縦方向の解決は (テンプレート, 内容の形) ごとに
+lru_cache で覚えておくので、文言が違っても行数が同じデッキは解決をやり直さない。
+領域に収まらない場合も子は自然な高さのまま積み、はみ出した量を Layout.overflow に入れる
+(layout_lint --overflow で検出できる)。
+
+ppt.py は全スライドの本文領域をテンプレートで配置している。main.py / doer.py / slide.py は
+まだ座標を直接書いており、移行は別の作業とする。
+
+使い方:
+    from grid import Template, Columns, Cell, Stack, Text, Fixed, solve
+    LAYOUT = Template('summary', Columns((Cell(0, 6, Text('left', BODY_SIZE, Pt(8))),
+                                          Cell(6, 6, Fixed('table', Inches(3))))))
+    layout = solve(LAYOUT, {'left': left_content})
+    box = slide.shapes.add_textbox(*layout['left'])
+
+    python grid.py show ppt     # ppt.py のテンプレートを解決して Box を表示する
+    python grid.py bench --decks 1000
+"""
+import functools
+import time
+from collections import namedtuple
+
+from pptx.util import Emu, Inches, Pt
+
+from linebreak import block_height, paragraph_height
+
+GRID_COLUMNS = 12
+# テキストボックスの既定の内側の余白 (python-pptx の add_textbox と同じ)
+TEXT_INSET_X = Inches(0.1)
+TEXT_INSET_Y = Inches(0.05)
+
+Box = namedtuple('Box', 'left top width height')
+# left / right / top / bottom: 内容を置く領域の余白 (EMU)。gutter: カラムの間隔
+Grid = namedtuple('Grid', 'width height columns left right top bottom gutter')
+
+Text = namedtuple('Text', 'name font_size para_spacing bold heading_space',
+                  defaults=(Pt(0), False, Pt(12)))
+Fixed = namedtuple('Fixed', 'name height')
+Fill = namedtuple('Fill', 'name min_height', defaults=(None, 0))
+Stack = namedtuple('Stack', 'items gap', defaults=(Inches(0.2),))
+Cell = namedtuple('Cell', 'start span node')
+Columns = namedtuple('Columns', 'cells gap', defaults=(Inches(0.2),))
+Panel = namedtuple('Panel', 'name child padding', defaults=(Inches(0.1),))
+
+# 13.33 x 7.5 インチのスライドで、ヘッダー帯 (1 インチ) の下からフッターの上までを使う
+DEFAULT_GRID = Grid(Inches(13.33), Inches(7.5), GRID_COLUMNS,
+                    Inches(1), Inches(1), Inches(1.3), Inches(0.5), Inches(0.2))
+
+
+class Template(namedtuple('Template', 'name root grid')):
+    """名前・ノードの木・グリッドの組 (ハッシュ可能なので、そのままキャッシュのキーになる)"""
+    __slots__ = ()
+
+    def __new__(cls, name, root, grid=DEFAULT_GRID):
+        return super().__new__(cls, name, root, grid)
+
+    def area(self):
+        """内容を置く領域の Box"""
+        g = self.grid
+        return Box(g.left, g.top, g.width - g.left - g.right, g.height - g.top - g.bottom)
+
+
+class Layout:
+    """解決したレイアウト。layout[name] でノードの Box を返す"""
+    __slots__ = ('boxes', 'overflow')
+
+    def __init__(self, boxes, overflow):
+        self.boxes = boxes
+        self.overflow = overflow
+
+    def __getitem__(self, name):
+        return self.boxes[name]
+
+    def __contains__(self, name):
+        return name in self.boxes
+
+    def __iter__(self):
+        return iter(self.boxes)
+
+
+def column_span(width, start, span, columns=GRID_COLUMNS, gutter=Inches(0.2)):
+    """幅 width を columns カラムに分けたとき、start 番目から span カラム分の (左端の位置, 幅)"""
+    if start < 0 or span < 1 or start + span > columns:
+        raise ValueError("カラムの範囲が不正です: start=%d span=%d (全 %d カラム)" % (start, span, columns))
+    column = (width - gutter * (columns - 1)) / columns
+    return int(start * (column + gutter)), int(span * column + (span - 1) * gutter)
+
+
+def _texts(node, left, width, grid, found):
+    """Text ノードを (ノード, 幅) の組で木の順に集める (横方向は内容によらない)"""
+    kind = type(node)
+    if kind is Text:
+        found.append((node, width))
+    elif kind is Stack:
+        for item in node.items:
+            _texts(item, left, width, grid, found)
+    elif kind is Columns:
+        for cell in node.cells:
+            offset, span_width = column_span(width, cell.start, cell.span, grid.columns, node.gap)
+            _texts(cell.node, left + offset, span_width, grid, found)
+    elif kind is Panel:
+        _texts(node.child, left + node.padding, width - 2 * node.padding, grid, found)
+    return found
+
+
+@functools.lru_cache(maxsize=256)
+def _text_nodes(template):
+    area = template.area()
+    return tuple(_texts(template.root, area.left, area.width, template.grid, []))
+
+
+def text_height(node, text_list, width):
+    """Text ノードの高さ (EMU、上下の余白を含む)"""
+    inner = max(width - 2 * TEXT_INSET_X, 1)
+    if node.bold:
+        height = sum(paragraph_height(text, inner, node.font_size, bold=True) + node.para_spacing
+                     for text in text_list)
+    else:
+        height = block_height(text_list, inner, node.font_size, node.para_spacing,
+                              heading_space=node.heading_space)
+    return height + 2 * TEXT_INSET_Y
+
+
+def signature(template, content):
+    """内容の形: Text ノードごとの高さ (EMU) のタプル"""
+    heights = []
+    for node, width in _text_nodes(template):
+        if node.name not in content:
+            raise ValueError("テンプレート %s の本文 %s がありません" % (template.name, node.name))
+        heights.append(text_height(node, tuple(content[node.name]), width))
+    return tuple(heights)
+
+
+class _Solver:
+    """縦方向の解決。heights は Text ノードの名前から高さへの辞書"""
+
+    def __init__(self, template, heights):
+        self.grid = template.grid
+        self.heights = heights
+        self.boxes = {}
+        self._natural = {}
+        self._flexible = {}
+
+    def natural(self, node):
+        """子を自然な高さで並べたときの高さ"""
+        key = id(node)
+        if key in self._natural:
+            return self._natural[key]
+        kind = type(node)
+        if kind is Text:
+            height = self.heights[node.name]
+        elif kind is Fixed:
+            height = node.height
+        elif kind is Fill:
+            height = node.min_height
+        elif kind is Stack:
+            height = sum(self.natural(item) for item in node.items) + node.gap * max(len(node.items) - 1, 0)
+        elif kind is Columns:
+            height = max((self.natural(cell.node) for cell in node.cells), default=0)
+        elif kind is Panel:
+            height = self.natural(node.child) + 2 * node.padding
+        else:
+            raise ValueError("不明なノードです: %r" % (node,))
+        self._natural[key] = height
+        return height
+
+    def flexible(self, node):
+        """余った高さを受け取れるか (Fill を含むか)"""
+        key = id(node)
+        if key not in self._flexible:
+            kind = type(node)
+            if kind is Fill:
+                value = True
+            elif kind is Stack:
+                value = any(self.flexible(item) for item in node.items)
+            elif kind is Columns:
+                value = any(self.flexible(cell.node) for cell in node.cells)
+            elif kind is Panel:
+                value = self.flexible(node.child)
+            else:
+                value = False
+            self._flexible[key] = value
+        return self._flexible[key]
+
+    def place(self, node, left, top, width, height):
+        kind = type(node)
+        name = getattr(node, 'name', None)
+        if kind is Stack:
+            self._place_stack(node, left, top, width, height)
+        elif kind is Columns:
+            for cell in node.cells:
+                offset, span_width = column_span(width, cell.start, cell.span, self.grid.columns, node.gap)
+                self.place(cell.node, left + offset, top, span_width, height)
+        elif kind is Panel:
+            pad = node.padding
+            self.place(node.child, left + pad, top + pad, width - 2 * pad, height - 2 * pad)
+        if name is not None:
+            self.boxes[name] = Box(Emu(left), Emu(top), Emu(width), Emu(height))
+
+    def _place_stack(self, node, left, top, width, height):
+        naturals = [self.natural(item) for item in node.items]
+        flexible = [item for item in node.items if self.flexible(item)]
+        extra = height - self.natural(node)
+        share = extra // len(flexible) if flexible and extra > 0 else 0
+        for item, item_height in zip(node.items, naturals):
+            if share and self.flexible(item):
+                item_height += share
+            self.place(item, left, top, width, item_height)
+            top += item_height + node.gap
+
+
+@functools.lru_cache(maxsize=4096)
+def _solve(template, heights):
+    names = [node.name for node, _ in _text_nodes(template)]
+    solver = _Solver(template, dict(zip(names, heights)))
+    area = template.area()
+    overflow = max(solver.natural(template.root) - area.height, 0)
+    solver.place(template.root, area.left, area.top, area.width, area.height)
+    return tuple(solver.boxes.items()), overflow
+
+
+def solve(template, content=None):
+    """テンプレートを内容 (Text ノードの名前から行のリストへの辞書) で解決して Layout を返す"""
+    boxes, overflow = _solve(template, signature(template, content or {}))
+    return Layout(dict(boxes), overflow)
+
+
+def cache_info():
+    """解決結果のキャッシュの統計 (functools の CacheInfo)"""
+    return _solve.cache_info()
+
+
+def cache_clear():
+    _solve.cache_clear()
+
+
+def _recorded(module_name='ppt'):
+    """module_name のデッキを1回生成し、ビルダーが solve() に渡した (テンプレート, 内容) のリストを返す"""
+    import importlib
+    module = importlib.import_module(module_name)
+    calls = []
+
+    def record(template, content=None):
+        calls.append((template, content or {}))
+        return solve(template, content)
+
+    module.solve = record
+    try:
+        module.build_presentation()
+    finally:
+        module.solve = solve
+    return calls
+
+
+def _bench(decks=1000, module_name='ppt'):
+    """module_name のビルダーのレイアウトを decks 回解決し、(キャッシュなしの秒数, ありの秒数, テンプレート数) を返す"""
+    layouts = _recorded(module_name)
+    cache_clear()
+    start = time.perf_counter()
+    for _ in range(decks):
+        for template, content in layouts:
+            _solve.__wrapped__(template, signature(template, content))
+    plain = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(decks):
+        for template, content in layouts:
+            solve(template, content)
+    cached = time.perf_counter() - start
+    return plain, cached, len(layouts)
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='グリッドレイアウトの解決')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('show', help='モジュールのビルダーのレイアウトを解決して Box を表示する')
+    p.add_argument('module', nargs='?', default='ppt')
+    p = sub.add_parser('bench', help='キャッシュなしとありで解決時間を比べる')
+    p.add_argument('module', nargs='?', default='ppt')
+    p.add_argument('--decks', type=int, default=1000)
+    args = parser.parse_args()
+
+    if args.command == 'bench':
+        plain, cached, count = _bench(args.decks, args.module)
+        print("%d テンプレート × %d デッキ: キャッシュなし %.3f 秒 / キャッシュあり %.3f 秒"
+              % (count, args.decks, plain, cached))
+        info = cache_info()
+        print("キャッシュ: %d 件 / ヒット %d・ミス %d" % (info.currsize, info.hits, info.misses))
+        return
+    for template, content in _recorded(args.module):
+        layout = solve(template, content)
+        print("%s%s" % (template.name, " (はみ出し %.2f インチ)" % Emu(layout.overflow).inches
+                                       if layout.overflow else ""))
+        for name in layout:
+            box = layout[name]
+            print("  %-20s x=%.2f y=%.2f w=%.2f h=%.2f" % (name, box.left.inches, box.top.inches,
+                                                          box.width.inches, box.height.inches))
+
+
+if __name__ == '__main__':
+    # ビルダーは import した grid のノード型でテンプレートを作るので、そちらの main() で解決する
+    import grid
+    grid.main()
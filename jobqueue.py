@@ -0,0 +1,379 @@
+"""SQLite に永続化する、再開可能なデッキ生成ジョブのキュー
+
+各ジョブはデッキの仕様 (JSON) とそのハッシュ・状態・試行回数・出力先・所要時間を持つ。
+ワーカーはジョブをまとめて取得 (claim) し、取得した行にリース (担当ワーカーと期限) を付ける。
+途中でワーカーが落ちても、期限切れのリースは他のワーカーが取り直すため、夜間バッチは
+止まったところから再開できる。同じ仕様を再投入しても、完了済みのジョブはハッシュで読み飛ばす。
+
+ジョブの仕様は次のような dict:
+    {"module": "ppt", "output": "out/acme.pptx", "fields": {"company": "ACME"}, "compression": "fast"}
+module は build_presentation() を持つビルダー。fields は PROPOSAL_FIELDS を持つビルダー
+(ppt.py) でだけ使える。処理できない仕様は submit() の時点で ValueError にする。
+
+使い方:
+    python jobqueue.py submit jobs.db specs.jsonl
+    python jobqueue.py run jobs.db --workers 4 --batch 16
+    python jobqueue.py status jobs.db
+"""
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import time
+import traceback
+import uuid
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+DEFAULT_LEASE = 300.0
+DEFAULT_MAX_ATTEMPTS = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    spec_hash TEXT NOT NULL UNIQUE,
+    spec TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    output TEXT,
+    digest TEXT,
+    error TEXT,
+    lease_owner TEXT,
+    lease_expires REAL,
+    submitted_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    duration REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (status, lease_expires);
+"""
+
+
+def spec_hash(spec):
+    """仕様のハッシュ (キーの順序や空白に依らない)"""
+    canonical = json.dumps(spec, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class JobQueue:
+    """jobs テーブルを持つ SQLite データベースへの接続"""
+
+    def __init__(self, path, lease_seconds=DEFAULT_LEASE, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        # トランザクションは明示的に BEGIN IMMEDIATE で開始する
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.executescript(_SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def _transaction(self):
+        return _Immediate(self.db)
+
+    def submit(self, specs):
+        """仕様を投入し (追加数, 既存のため読み飛ばした数) を返す
+
+        同じハッシュのジョブが失敗済みなら、試行回数を戻して再び待ち状態にする。
+        処理できない仕様があれば ValueError を送出し、何も投入しない。
+        """
+        added = skipped = 0
+        now = time.time()
+        with self._transaction():
+            for spec in specs:
+                check_spec(spec)
+                h = spec_hash(spec)
+                row = self.db.execute('SELECT status FROM jobs WHERE spec_hash = ?', (h,)).fetchone()
+                if row is None:
+                    self.db.execute(
+                        'INSERT INTO jobs (spec_hash, spec, output, submitted_at) VALUES (?, ?, ?, ?)',
+                        (h, json.dumps(spec, ensure_ascii=False), spec.get('output'), now))
+                    added += 1
+                elif row['status'] == FAILED:
+                    self.db.execute(
+                        "UPDATE jobs SET status = 'pending', attempts = 0, error = NULL WHERE spec_hash = ?", (h,))
+                    added += 1
+                else:
+                    skipped += 1
+        return added, skipped
+
+    def claim(self, owner, batch_size=16):
+        """待ち状態 (またはリース切れ) のジョブを最大 batch_size 件取得してリースを付ける
+
+        [(id, spec), ...] を返す。
+        """
+        now = time.time()
+        with self._transaction():
+            # 試行回数を使い切ったままリースが切れたジョブは失敗として確定する
+            self.db.execute(
+                "UPDATE jobs SET status = ?, error = COALESCE(error, 'lease expired'), "
+                'lease_owner = NULL, lease_expires = NULL '
+                'WHERE status = ? AND lease_expires < ? AND attempts >= ?',
+                (FAILED, RUNNING, now, self.max_attempts))
+            rows = self.db.execute(
+                'SELECT id, spec FROM jobs WHERE (status = ? OR (status = ? AND lease_expires < ?)) '
+                'AND attempts < ? ORDER BY id LIMIT ?',
+                (PENDING, RUNNING, now, self.max_attempts, batch_size)).fetchall()
+            if rows:
+                self.db.executemany(
+                    'UPDATE jobs SET status = ?, lease_owner = ?, lease_expires = ?, '
+                    'attempts = attempts + 1, started_at = ? WHERE id = ?',
+                    [(RUNNING, owner, now + self.lease_seconds, now, row['id']) for row in rows])
+        return [(row['id'], json.loads(row['spec'])) for row in rows]
+
+    def renew(self, owner, job_ids):
+        """処理中のジョブのリースを延長する"""
+        expires = time.time() + self.lease_seconds
+        with self._transaction():
+            self.db.executemany(
+                'UPDATE jobs SET lease_expires = ? WHERE id = ? AND lease_owner = ? AND status = ?',
+                [(expires, job_id, owner, RUNNING) for job_id in job_ids])
+
+    def complete(self, owner, job_id, output=None, digest=None, duration=None):
+        """ジョブを完了にする。リースを失っていれば (他のワーカーが取り直した) False
+
+        duration はそのジョブ自体の処理時間 (秒)。省略時は取得からの経過時間になる。
+        """
+        now = time.time()
+        with self._transaction():
+            cursor = self.db.execute(
+                'UPDATE jobs SET status = ?, output = COALESCE(?, output), digest = ?, error = NULL, '
+                'lease_owner = NULL, lease_expires = NULL, finished_at = ?, '
+                'started_at = COALESCE(? - ?, started_at), duration = COALESCE(?, ? - started_at) '
+                'WHERE id = ? AND lease_owner = ? AND status = ?',
+                (DONE, output, digest, now, now, duration, duration, now, job_id, owner, RUNNING))
+        return cursor.rowcount == 1
+
+    def fail(self, owner, job_id, error, duration=None):
+        """ジョブの失敗を記録する。試行回数が上限に達していなければ待ち状態に戻す
+
+        移した状態 (PENDING か FAILED) を返す。リースを失っていれば None。
+        """
+        now = time.time()
+        with self._transaction():
+            cursor = self.db.execute(
+                'UPDATE jobs SET status = CASE WHEN attempts < ? THEN ? ELSE ? END, error = ?, '
+                'lease_owner = NULL, lease_expires = NULL, finished_at = ?, '
+                'duration = COALESCE(?, ? - started_at) '
+                'WHERE id = ? AND lease_owner = ? AND status = ?',
+                (self.max_attempts, PENDING, FAILED, error, now, duration, now, job_id, owner, RUNNING))
+            if cursor.rowcount != 1:
+                return None
+            return self.db.execute('SELECT status FROM jobs WHERE id = ?', (job_id,)).fetchone()['status']
+
+    def requeue_running(self):
+        """処理中のジョブをすべて待ち状態に戻す (ワーカーが動いていないと分かっているとき用)"""
+        with self._transaction():
+            cursor = self.db.execute(
+                'UPDATE jobs SET status = ?, lease_owner = NULL, lease_expires = NULL, '
+                'attempts = MAX(attempts - 1, 0) WHERE status = ?', (PENDING, RUNNING))
+        return cursor.rowcount
+
+    def counts(self):
+        """状態ごとのジョブ数"""
+        rows = self.db.execute('SELECT status, COUNT(*) AS n FROM jobs GROUP BY status').fetchall()
+        return {row['status']: row['n'] for row in rows}
+
+    def stats(self):
+        """完了ジョブの件数・平均所要時間・最大所要時間 (秒)"""
+        row = self.db.execute(
+            'SELECT COUNT(*) AS n, AVG(duration) AS mean, MAX(duration) AS worst FROM jobs WHERE status = ?',
+            (DONE,)).fetchone()
+        return row['n'], row['mean'], row['worst']
+
+
+class _Immediate:
+    """BEGIN IMMEDIATE ... COMMIT / ROLLBACK を行うコンテキストマネージャー"""
+
+    def __init__(self, db):
+        self.db = db
+
+    def __enter__(self):
+        self.db.execute('BEGIN IMMEDIATE')
+        return self.db
+
+    def __exit__(self, exc_type, exc, tb):
+        self.db.execute('ROLLBACK' if exc_type else 'COMMIT')
+        return False
+
+
+def check_spec(spec):
+    """build_job() で処理できる仕様かを調べ、できなければ ValueError を送出する"""
+    import importlib
+    name = spec.get('module', 'ppt')
+    if 'output' not in spec:
+        raise ValueError("出力先 (output) がありません: %s" % json.dumps(spec, ensure_ascii=False))
+    try:
+        module = importlib.import_module(name)
+    except ImportError:
+        raise ValueError("ビルダーのモジュールが見つかりません: %s" % name)
+    if not hasattr(module, 'build_presentation'):
+        raise ValueError("build_presentation() の無いモジュールです: %s" % name)
+    if spec.get('fields') and not hasattr(module, 'PROPOSAL_FIELDS'):
+        raise ValueError("%s は差し込み (fields) に対応していません" % name)
+
+
+def build_job(spec):
+    """既定のジョブ処理: 仕様に従ってデッキを生成・保存し、(出力パス, ダイジェスト) を返す"""
+    import importlib
+    import metrics
+    from watcher import write_atomic
+    module = importlib.import_module(spec.get('module', 'ppt'))
+    metrics.instrument_builders(module)
+    output = spec['output']
+    fields = spec.get('fields')
+    if fields:
+        saved = dict(module.PROPOSAL_FIELDS)
+        try:
+            module.PROPOSAL_FIELDS.update(fields)
+            prs = module.build_presentation()
+        finally:
+            module.PROPOSAL_FIELDS.clear()
+            module.PROPOSAL_FIELDS.update(saved)
+    else:
+        prs = module.build_presentation()
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # 書きかけのファイルが残らないよう、一時ファイルから置き換える
+    digest = write_atomic(prs, output, compression=spec.get('compression'))
+    return output, digest
+
+
+def serve_metrics(path, port):
+    """キューの状態ごとのジョブ数をメトリクスに加え、port で /metrics を公開する"""
+    import metrics
+
+    def depth(status):
+        def read():
+            queue = JobQueue(path)
+            try:
+                return queue.counts().get(status, 0)
+            finally:
+                queue.close()
+        return read
+
+    for status in (PENDING, RUNNING, FAILED):
+        metrics.QUEUE_DEPTH.labels(status).set_function(depth(status))
+    return metrics.serve(port)
+
+
+def run_worker(path, handler=build_job, batch_size=16, lease_seconds=DEFAULT_LEASE,
+               max_attempts=DEFAULT_MAX_ATTEMPTS, owner=None, metrics_port=None):
+    """ジョブが無くなるまで取得と処理を繰り返し、(完了数, 失敗数) を返す
+
+    失敗数は再試行の上限に達して FAILED になったジョブの数 (再試行に回した失敗は数えない)。
+    metrics_port を指定すると処理中は /metrics を公開する。
+    """
+    queue = JobQueue(path, lease_seconds, max_attempts)
+    server = serve_metrics(path, metrics_port) if metrics_port else None
+    owner = owner or '%s-%d-%s' % (socket.gethostname(), os.getpid(), uuid.uuid4().hex[:6])
+    done = failed = 0
+    try:
+        while True:
+            batch = queue.claim(owner, batch_size)
+            if not batch:
+                return done, failed
+            remaining = [job_id for job_id, _ in batch]
+            renewed_at = time.monotonic()
+            for job_id, spec in batch:
+                # バッチの処理がリース期間の半分を超えたら残りのリースを延長する
+                if time.monotonic() - renewed_at > lease_seconds / 2:
+                    queue.renew(owner, remaining)
+                    renewed_at = time.monotonic()
+                start = time.perf_counter()
+                try:
+                    output, digest = handler(spec)
+                except Exception:
+                    status = queue.fail(owner, job_id, traceback.format_exc(limit=5), time.perf_counter() - start)
+                    if status == FAILED:
+                        failed += 1
+                else:
+                    if queue.complete(owner, job_id, output, digest, time.perf_counter() - start):
+                        done += 1
+                remaining.remove(job_id)
+    finally:
+        queue.close()
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+
+def _run_worker_args(args):
+    return run_worker(*args)
+
+
+def run(path, workers=1, batch_size=16, lease_seconds=DEFAULT_LEASE, metrics_port=None):
+    """workers 個のプロセスでキューを処理し、(完了数, 失敗数) を返す
+
+    metrics_port を指定すると、i 番目のワーカーは metrics_port + i で /metrics を公開する。
+    """
+    if workers <= 1:
+        return run_worker(path, batch_size=batch_size, lease_seconds=lease_seconds, metrics_port=metrics_port)
+    from multiprocessing import Pool
+    tasks = [(path, build_job, batch_size, lease_seconds, DEFAULT_MAX_ATTEMPTS, None,
+              metrics_port + i if metrics_port else None) for i in range(workers)]
+    with Pool(workers) as pool:
+        results = pool.map(_run_worker_args, tasks)
+    return sum(r[0] for r in results), sum(r[1] for r in results)
+
+
+def _read_specs(path):
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='SQLite に永続化するデッキ生成ジョブのキュー')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('submit', help='JSON Lines の仕様を投入する')
+    p.add_argument('db')
+    p.add_argument('specs')
+    p = sub.add_parser('run', help='キューが空になるまでジョブを処理する')
+    p.add_argument('db')
+    p.add_argument('--workers', type=int, default=1)
+    p.add_argument('--batch', type=int, default=16)
+    p.add_argument('--lease', type=float, default=DEFAULT_LEASE, help='リース期間 (秒)')
+    p.add_argument('--metrics-port', type=int, default=None, help='/metrics を公開するポート (ワーカーごとに +1)')
+    p = sub.add_parser('status', help='状態ごとのジョブ数を表示する')
+    p.add_argument('db')
+    p = sub.add_parser('requeue', help='処理中のまま残ったジョブを待ち状態に戻す')
+    p.add_argument('db')
+    args = parser.parse_args()
+
+    if args.command == 'submit':
+        queue = JobQueue(args.db)
+        try:
+            added, skipped = queue.submit(_read_specs(args.specs))
+        except ValueError as e:
+            parser.error(str(e))
+        print("投入: %d 件 (完了済み・登録済みのため読み飛ばし: %d 件)" % (added, skipped))
+    elif args.command == 'run':
+        start = time.perf_counter()
+        done, failed = run(args.db, args.workers, args.batch, args.lease, args.metrics_port)
+        print("完了: %d 件 / 失敗: %d 件 (%.2f 秒)" % (done, failed, time.perf_counter() - start))
+    elif args.command == 'status':
+        queue = JobQueue(args.db)
+        counts = queue.counts()
+        for status in (PENDING, RUNNING, DONE, FAILED):
+            print("%-8s %d" % (status, counts.get(status, 0)))
+        n, mean, worst = queue.stats()
+        if n:
+            print("所要時間: 平均 %.3f 秒 / 最大 %.3f 秒" % (mean, worst))
+    elif args.command == 'requeue':
+        print("待ち状態に戻しました: %d 件" % JobQueue(args.db).requeue_running())
+
+
+if __name__ == '__main__':
+    main()
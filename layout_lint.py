@@ -0,0 +1,180 @@
+"""スライドのレイアウトを幾何的に検査する
+
+各ビルダーは Inches(...) の手書き座標で図形を置いているため、パネル内のテキストボックス同士が
+重なったり、フッター領域 (高さ 7.5 インチのスライドで下端から 0.4 インチ) にはみ出したりしやすい。
+スライドごとに全図形のバウンディングボックスを集め、x 方向のスイープラインで
+重なりの候補だけを調べて次の問題を報告する:
+
+- out_of_bounds: スライドの外にはみ出したテキスト・表
+- overlap: 一部だけ重なっているテキスト・表の組 (一方が他方を完全に含む場合は意図した配置とみなす)
+- footer: フッター領域に入り込んでいる本文の図形
+- overflow: 折り返した本文の高さ (linebreak の禁則処理付き行分割で見積もる) が図形の高さを
+  超えているもの。--overflow を付けたときだけ調べる
+
+テキストを持たない装飾図形 (背景の円や帯・矢印) は、スライドからの裁ち落としや
+本文との重なりが意図的なデザインなので対象外にしている。
+
+使い方:
+    python layout_lint.py sample1.pptx great1.pptx archive/ --workers 4
+    python layout_lint.py project_proposal.pptx --overflow
+"""
+import sys
+import time
+import zipfile
+from functools import partial
+from multiprocessing import Pool
+
+from lxml import etree
+
+from shape_records import (EMU_PER_INCH, pptx_placeholders, record_boxes, slide_boxes, slide_members,
+                           slide_placeholders, slide_records, slide_size)
+
+FOOTER_HEIGHT = int(0.4 * EMU_PER_INCH)
+# フッター領域は aspect.py で用紙サイズを変えたデッキでも同じ割合になるよう、スライドの高さに比例させる
+BASE_SLIDE_HEIGHT = int(7.5 * EMU_PER_INCH)
+# 辺が接しているだけ、あるいは丸め誤差程度の食い込みは問題にしない
+TOLERANCE = int(0.02 * EMU_PER_INCH)
+# 本文の高さは見積もりなので、1行に満たない程度のはみ出し (行間・下余白の分) は問題にしない
+OVERFLOW_TOLERANCE = int(0.15 * EMU_PER_INCH)
+
+
+def _label(record):
+    return '%s#%s' % (record['name'], record['id'])
+
+
+def _contains(outer, inner):
+    return (outer[0] <= inner[0] + TOLERANCE and outer[1] <= inner[1] + TOLERANCE
+            and outer[2] + TOLERANCE >= inner[2] and outer[3] + TOLERANCE >= inner[3])
+
+
+def lint_records(records, slide_width, slide_height, slide=None):
+    """1枚分の図形レコード (shape_records.slide_boxes の出力) を検査して問題 (dict) のリストを返す
+
+    各問題は {'slide', 'kind', 'shapes': [名前#ID, ...], 'box': [x, y, w, h]} で、
+    box は問題の範囲 (はみ出し部分・重なり部分) を EMU で表す。
+    """
+    issues = []
+    footer_top = slide_height - FOOTER_HEIGHT * slide_height // BASE_SLIDE_HEIGHT
+    # (左, 上, 右, 下, レコード) を左端でソートしておく
+    boxes = sorted(((r['x'], r['y'], r['x'] + r['w'], r['y'] + r['h'], r)
+                    for r in records if r['has_text']), key=lambda box: box[0])
+
+    for left, top, right, bottom, record in boxes:
+        if (left < -TOLERANCE or top < -TOLERANCE
+                or right > slide_width + TOLERANCE or bottom > slide_height + TOLERANCE):
+            issues.append({'slide': slide, 'kind': 'out_of_bounds', 'shapes': [_label(record)],
+                           'box': [left, top, right - left, bottom - top]})
+        # フッター領域より上から始まり、領域内まで伸びている本文
+        if top < footer_top - TOLERANCE and bottom > footer_top + TOLERANCE:
+            issues.append({'slide': slide, 'kind': 'footer', 'shapes': [_label(record)],
+                           'box': [left, footer_top, right - left, bottom - footer_top]})
+
+    # スイープライン: 左端順に走査し、x 方向に重なりうる図形だけを active に残す
+    active = []
+    for box in boxes:
+        left = box[0]
+        active = [other for other in active if other[2] > left + TOLERANCE]
+        for other in active:
+            top = max(box[1], other[1])
+            bottom = min(box[3], other[3])
+            if bottom - top <= TOLERANCE:
+                continue
+            if _contains(box, other) or _contains(other, box):
+                continue
+            right = min(box[2], other[2])
+            issues.append({'slide': slide, 'kind': 'overlap',
+                           'shapes': [_label(other[4]), _label(box[4])],
+                           'box': [left, top, right - left, bottom - top]})
+        active.append(box)
+    return issues
+
+
+def overflow_issues(records, slide=None):
+    """折り返した本文が図形の下端を超えているテキスト (shape_records.slide_records の出力) を返す
+
+    box は図形の下端からはみ出した部分。折り返しなしの図形は改行だけで高さを見積もる。
+    """
+    from linebreak import record_text_height
+    issues = []
+    for record in records:
+        if not any(run['text'].strip() for para in record.get('paragraphs', ()) for run in para['runs']):
+            continue
+        needed = record_text_height(record)
+        if needed > record['h'] + OVERFLOW_TOLERANCE:
+            issues.append({'slide': slide, 'kind': 'overflow', 'shapes': [_label(record)],
+                           'box': [record['x'], record['y'] + record['h'], record['w'], needed - record['h']]})
+    return issues
+
+
+def _lint_slide(sld, width, height, index, overflow, placeholders):
+    issues = lint_records(slide_boxes(sld, placeholders), width, height, index)
+    if overflow:
+        issues.extend(overflow_issues(slide_records(sld, placeholders), index))
+    return issues
+
+
+def lint_slide_records(records, width, height, index=None, overflow=False):
+    """slide_records 形式のレコード (dryrun.py の出力など) を検査する"""
+    issues = lint_records(record_boxes(records), width, height, index)
+    if overflow:
+        issues.extend(overflow_issues(records, index))
+    return issues
+
+
+def lint_presentation(prs, overflow=False):
+    """Presentation の全スライドを検査する"""
+    issues, cache = [], {}
+    for index, slide in enumerate(prs.slides, 1):
+        issues.extend(_lint_slide(slide._element, prs.slide_width, prs.slide_height, index, overflow,
+                                  pptx_placeholders(slide, cache)))
+    return issues
+
+
+def lint_file(path, overflow=False):
+    """.pptx を ZIP から直接読んで検査し、(パス, スライド数, 問題のリスト) を返す"""
+    issues, cache = [], {}
+    with zipfile.ZipFile(path) as zf:
+        width, height = slide_size(zf)
+        members = slide_members(zf)
+        for index, member in enumerate(members, 1):
+            issues.extend(_lint_slide(etree.fromstring(zf.read(member)), width, height, index, overflow,
+                                      slide_placeholders(zf, member, cache)))
+    return path, len(members), issues
+
+
+def lint_files(paths, workers=None, overflow=False):
+    """複数のデッキをプロセス並列で検査し、(パス, スライド数, 問題のリスト) を順に返す"""
+    from deck_index import iter_deck_paths
+    with Pool(workers) as pool:
+        yield from pool.imap(partial(lint_file, overflow=overflow), iter_deck_paths(paths), chunksize=16)
+
+
+def format_issue(issue):
+    x, y, w, h = (value / EMU_PER_INCH for value in issue['box'])
+    return "slide %s: %-13s %s (x=%.2f y=%.2f w=%.2f h=%.2f in)" % (
+        issue['slide'], issue['kind'], ' / '.join(issue['shapes']), x, y, w, h)
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='スライドのレイアウトを検査する')
+    parser.add_argument('paths', nargs='+', help='.pptx ファイルまたはディレクトリ')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--overflow', action='store_true', help='折り返した本文が図形からはみ出していないかも調べる')
+    args = parser.parse_args()
+    start = time.perf_counter()
+    decks = slides = problems = 0
+    for path, count, issues in lint_files(args.paths, args.workers, args.overflow):
+        decks += 1
+        slides += count
+        problems += len(issues)
+        for issue in issues:
+            print("%s %s" % (path, format_issue(issue)))
+    elapsed = time.perf_counter() - start
+    print("%d デッキ / %d スライドを検査: 問題 %d 件 (%.2f 秒, 1枚あたり %.3f ms)"
+          % (decks, slides, problems, elapsed, elapsed * 1000 / max(slides, 1)), file=sys.stderr)
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,325 @@
+"""日本語の禁則処理付き行分割と、テキストブロックの高さの事前計算
+
+「クラウドベースの統合管理システム導入により業務効率を30%向上」のような箇条書きは、
+どこで折り返すかを PowerPoint に任せているため、生成時には高さが分からない。
+このモジュールは文字幅 (em 単位) を使って改行位置を先に決め、段落・ブロックの
+高さを EMU で返す。レイアウト検査 (layout_lint --overflow) や、長い箇条書きを
+複数のスライドに分ける paginate() から使う。
+
+行分割の規則:
+- 和文は1文字ごと、欧文 (英数字の並び) は単語ごとに折り返せる。空白は行末にぶら下げる
+- 行頭禁則: 、。）」』】 ・ ー 小書きの仮名 ％ などは行頭に置かず、前の文字と一緒に次の行へ送る
+- 行末禁則: （「『【 ¥ $ などは行末に置かず、次の文字と一緒に次の行へ送る
+- ぶら下げ: hanging=True (既定) なら行末の 、。,. は幅からはみ出してもよい
+- 1語が行より長い場合だけ、禁則を無視して文字単位で分ける
+
+文字幅は全角 (East Asian Width が W/F) を 1em とし、それ以外はサムネイルと同じフォント
+(thumbnail.FONT_CANDIDATES) で1回だけ測って文字ごとにキャッシュする。Pillow が無い環境では
+平均的な欧文の字幅で代用する。改行位置は (文字列, 行幅 / 文字サイズ, 太字) ごとに
+lru_cache で覚えるので、定型の箇条書きは何枚のスライドに現れても1回しか計算しない。
+
+使い方:
+    from linebreak import break_lines, block_height
+    lines = break_lines('クラウドベースの統合管理システム導入により業務効率を30%向上', Inches(5), Pt(18))
+    height = block_height(text_list, Inches(5), Pt(18), Pt(8))
+
+    python linebreak.py "クラウドベースの統合管理システム導入により業務効率を30%向上" --width 4 --size 18
+    python linebreak.py --bench --slides 500
+"""
+import functools
+import re
+import time
+import unicodedata
+
+from pptx.util import Pt
+
+from markup import parse_line
+
+LINE_SPACING = 1.2     # 行の高さ / 文字サイズ (thumbnail.py と同じ)
+LEVEL_INDENT = 457200  # 段落レベルごとの字下げ (EMU、thumbnail.py と同じ)
+EMU_PER_PT = 12700
+
+# 行頭に置かない文字
+NO_START = frozenset(
+    '、。，．,.・：；:;？！?!‼⁇⁈⁉ー－～〜…‥゛゜ヽヾゝゞ々〻'
+    '）)］]｝}」』】〕〉》〙〗〟’”｠»'
+    'ぁぃぅぇぉっゃゅょゎゕゖァィゥェォッャュョヮヵヶㇰㇱㇲㇳㇴㇵㇶㇷㇸㇹㇺㇻㇼㇽㇾㇿ'
+    '％%‰℃°′″'
+)
+# 行末に置かない文字
+NO_END = frozenset('（(［[｛{「『【〔〈《〘〖〝‘“｟«￥¥＄$＃#')
+# ぶら下げを許す句読点
+HANGING = frozenset('、。，．,.')
+
+# 欧文の単語 (英数字と単語内の記号の並び)・空白・それ以外の1文字
+_UNIT_RE = re.compile(r'[A-Za-z0-9À-ɏ.,:;!?%\'"/&+\-@_=*]+|[ \t　]+|.', re.S)
+_BREAK_RE = re.compile('\n|\v')
+
+# Pillow もフォントも無いときの半角文字の幅 (em)
+_FALLBACK_WIDTH = 0.55
+_SPACE_WIDTH = 0.28
+
+_widths = {False: {}, True: {}}
+_measure_fonts = {}
+
+
+def _measure_font(bold):
+    # 1000px のフォントで測った幅を 1/1000 して em にする
+    if bold not in _measure_fonts:
+        try:
+            from thumbnail import get_font
+            _measure_fonts[bold] = get_font(1000, bold)
+        except ImportError:
+            _measure_fonts[bold] = None
+    return _measure_fonts[bold]
+
+
+def glyph_width(ch, bold=False):
+    """1文字の幅 (em)。測った値は文字ごとにキャッシュする"""
+    widths = _widths[bold]
+    width = widths.get(ch)
+    if width is None:
+        if unicodedata.east_asian_width(ch) in ('W', 'F'):
+            width = 1.0
+        else:
+            font = _measure_font(bold)
+            if font is not None:
+                width = font.getlength(ch) / 1000.0
+            else:
+                width = _SPACE_WIDTH if ch.isspace() else _FALLBACK_WIDTH
+        widths[ch] = width
+    return width
+
+
+def _units_width(text, bold):
+    widths = _widths[bold]
+    total = 0.0
+    for ch in text:
+        width = widths.get(ch)
+        total += width if width is not None else glyph_width(ch, bold)
+    return total
+
+
+def text_width(text, size, bold=False):
+    """1行に並べたときの幅 (EMU)"""
+    return int(_units_width(text, bold) * size)
+
+
+def _clusters(text, bold):
+    """禁則で切り離せない単位ごとに [文字列, 幅(em), 空白か] のリストにする"""
+    clusters = []
+    for unit in _UNIT_RE.findall(text):
+        width = _units_width(unit, bold)
+        if unit.isspace():
+            clusters.append([unit, width, True])
+        elif clusters and not clusters[-1][2] and (unit[0] in NO_START or clusters[-1][0][-1] in NO_END):
+            clusters[-1][0] += unit
+            clusters[-1][1] += width
+        else:
+            clusters.append([unit, width, False])
+    return clusters
+
+
+def _split_chars(text, width, bold, lines):
+    # 行より長い単位を文字単位で分け、最後の (行の途中までの) 部分を返す
+    line, line_width = '', 0.0
+    for ch in text:
+        w = glyph_width(ch, bold)
+        if line and line_width + w > width:
+            lines.append(line)
+            line, line_width = '', 0.0
+        line += ch
+        line_width += w
+    return line, line_width
+
+
+def _break_segment(text, width, bold, hanging, lines):
+    line, line_width, pending = '', 0.0, ''
+    for unit, unit_width, is_space in _clusters(text, bold):
+        if is_space:
+            # 空白は次の語が来たときだけ行に入れる (行末の空白は幅に数えない)
+            if line:
+                pending += unit
+            continue
+        fit_width = unit_width
+        if hanging and unit[-1] in HANGING:
+            fit_width -= glyph_width(unit[-1], bold)
+        space_width = _units_width(pending, bold)
+        if line and line_width + space_width + fit_width > width:
+            lines.append(line)
+            line, line_width, pending, space_width = '', 0.0, '', 0.0
+        if not line and fit_width > width:
+            line, line_width = _split_chars(unit, width, bold, lines)
+            continue
+        line += pending + unit
+        line_width += space_width + unit_width
+        pending = ''
+    lines.append(line)
+
+
+@functools.lru_cache(maxsize=65536)
+def _break_em(text, width_em, bold, hanging):
+    lines = []
+    for segment in _BREAK_RE.split(text):
+        _break_segment(segment, width_em, bold, hanging, lines)
+    return tuple(lines)
+
+
+def break_lines(text, width, size, bold=False, hanging=True):
+    """text を幅 width (EMU) に文字サイズ size (EMU) で並べたときの行のタプル
+
+    改行 (\\n, \\v) は必ず改行する。空の文字列は空の1行になる。
+    """
+    # 幅は 1/1000 em に丸めてキャッシュのキーにする (文字サイズが違っても同じ比なら共有する)
+    width_em = round(width / size, 3) if size else 0.0
+    return _break_em(text, width_em, bold, hanging)
+
+
+def line_height(size):
+    """1行の高さ (EMU)"""
+    return int(size * LINE_SPACING)
+
+
+def paragraph_height(text, width, size, bold=False, level=0, hanging=True):
+    """段落の高さ (EMU、段落前後の間隔は含まない)"""
+    lines = break_lines(text, max(width - level * LEVEL_INDENT, 1), size, bold, hanging)
+    return len(lines) * line_height(size)
+
+
+def layout_block(text_list, width, font_size, para_spacing, heading_delta=Pt(2), heading_space=Pt(15)):
+    """apply_body_style() に渡す行のリストを並べ、段落ごとの (行のタプル, 高さ) のリストを返す
+
+    width は本文の幅 (図形の幅から左右の余白を引いたもの)。heading_delta は【】見出しの
+    文字サイズの増分、heading_space は2段落目以降の見出しの前の間隔 (いずれも EMU)。
+    高さには段落後の間隔と見出しの前の間隔を含む。
+    """
+    laid = []
+    for i, original_text in enumerate(text_list):
+        line = parse_line(original_text)
+        size = font_size + heading_delta if line.heading else font_size
+        text = ''.join(span.text for span in line.spans)
+        lines = break_lines(text, max(width - line.level * LEVEL_INDENT, 1), size, line.heading)
+        height = len(lines) * line_height(size) + para_spacing
+        if line.heading and i > 0:
+            height += heading_space
+        laid.append((lines, height))
+    return laid
+
+
+def block_height(text_list, width, font_size, para_spacing, heading_delta=Pt(2), heading_space=Pt(15)):
+    """apply_body_style() に渡す行のリストの高さ (EMU)"""
+    return sum(height for _, height in
+               layout_block(text_list, width, font_size, para_spacing, heading_delta, heading_space))
+
+
+def paginate(text_list, width, height, font_size, para_spacing, heading_delta=Pt(2), heading_space=Pt(15)):
+    """高さ height に収まるように行のリストを複数のページ (行のリスト) に分ける
+
+    段落の途中では分けず、【】見出しはページの最後に残さずに次のページへ送る。
+    1段落だけで height を超える場合はその段落だけのページにする。
+    """
+    laid = layout_block(text_list, width, font_size, para_spacing, heading_delta, heading_space)
+    pages, page, used = [], [], 0
+    for i, (original_text, (_, para_height)) in enumerate(zip(text_list, laid)):
+        if page and used + para_height > height:
+            carry = []
+            if len(page) > 1 and parse_line(page[-1]).heading:
+                carry = [page.pop()]
+            pages.append(page)
+            page = carry
+            used = block_height(carry, width, font_size, para_spacing, heading_delta, heading_space)
+            if not carry and i > 0 and parse_line(original_text).heading:
+                # ページの先頭の見出しには前の間隔が要らない
+                para_height -= heading_space
+        page.append(original_text)
+        used += para_height
+    if page:
+        pages.append(page)
+    return pages
+
+
+def record_text_height(record):
+    """shape_records のレコード (テキストを持つ図形) の本文の高さ (EMU、上下の余白を含む)
+
+    折り返しなし (wrap="none") の図形は改行だけで行を数える。
+    """
+    left, top, right, bottom = record['insets']
+    width = max(record['w'] - left - right, 1) if record.get('wrap', True) else float('inf')
+    total = top + bottom
+    for i, para in enumerate(record['paragraphs']):
+        runs = para['runs']
+        # 改行 (a:br) には文字が無いので、文字サイズと太字はテキストのランだけで決める
+        glyphs = [run for run in runs if run['text'] != '\n']
+        size = max((run['size'] for run in glyphs), default=18.0) * EMU_PER_PT
+        text = ''.join(run['text'] for run in runs)
+        bold = bool(glyphs) and all(run.get('bold') for run in glyphs)
+        if width == float('inf'):
+            count = len(_BREAK_RE.split(text))
+        else:
+            count = len(break_lines(text, max(width - para.get('level', 0) * LEVEL_INDENT, 1), size, bold))
+        total += count * line_height(size)
+        total += para.get('space_after', 0.0) * EMU_PER_PT
+        if i > 0:
+            total += para.get('space_before', 0.0) * EMU_PER_PT
+    return int(total)
+
+
+def _bench(slides=500):
+    """ppt.py のデッキを slides 枚分並べ、全段落の行分割にかかる時間を測る
+
+    (段落数, キャッシュなしの秒数, キャッシュありの秒数) を返す。
+    """
+    import ppt
+    from shape_records import presentation_records
+    _, _, per_slide = presentation_records(ppt.build_presentation())
+    records = [record for i in range(slides) for record in per_slide[i % len(per_slide)]
+               if record.get('paragraphs')]
+    tasks = []
+    for record in records:
+        left, _, right, _ = record['insets']
+        for para in record['paragraphs']:
+            if para['runs']:
+                size = max(run['size'] for run in para['runs']) * EMU_PER_PT
+                text = ''.join(run['text'] for run in para['runs'])
+                tasks.append((text, round((record['w'] - left - right) / size, 3), False, True))
+    start = time.perf_counter()
+    for task in tasks:
+        _break_em.__wrapped__(*task)
+    plain = time.perf_counter() - start
+    _break_em.cache_clear()
+    start = time.perf_counter()
+    for record in records:
+        record_text_height(record)
+    cached = time.perf_counter() - start
+    return len(tasks), plain, cached
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='禁則処理付きの行分割と高さの計算')
+    parser.add_argument('text', nargs='*')
+    parser.add_argument('--width', type=float, default=5.0, help='行の幅 (インチ)')
+    parser.add_argument('--size', type=float, default=18.0, help='文字サイズ (pt)')
+    parser.add_argument('--bold', action='store_true')
+    parser.add_argument('--bench', action='store_true', help='全段落の行分割にかかる時間を測る')
+    parser.add_argument('--slides', type=int, default=500)
+    args = parser.parse_args()
+
+    if args.bench:
+        paragraphs, plain, cached = _bench(args.slides)
+        info = _break_em.cache_info()
+        print("%d スライド / %d 段落: キャッシュなし %.3f 秒 (1段落あたり %.1f µs) / キャッシュあり %.3f 秒"
+              % (args.slides, paragraphs, plain, plain * 1e6 / max(paragraphs, 1), cached))
+        print("キャッシュ: %d 件 / ヒット %d・ミス %d" % (info.currsize, info.hits, info.misses))
+        return
+    width = int(args.width * 914400)
+    size = int(args.size * EMU_PER_PT)
+    for text in args.text:
+        lines = break_lines(text, width, size, args.bold)
+        for line in lines:
+            print("| %s" % line)
+        print("%d 行 / 高さ %.2f インチ" % (len(lines), len(lines) * line_height(size) / 914400))
+
+
+if __name__ == '__main__':
+    main()
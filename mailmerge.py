@@ -0,0 +1,181 @@
+"""宛先リスト (CSV / Parquet) から個別の提案書を差し込み生成する
+
+デッキの骨格は1回だけ生成する。ppt.PROPOSAL_FIELDS を {{company}} のような差し込み
+トークンに置き換えて組み立て、各パートを XML のバイト列として保持する。
+トークンを含まないパート (マスター・レイアウト・テーマなど) は最初に圧縮して
+そのまま ZIP に書き写し、宛先ごとにはトークンを含むパートだけを置換・圧縮する。
+行は1行ずつ読み込んで書き出すため、行数に関係なくメモリ使用量は一定になる。
+
+使い方:
+    python mailmerge.py clients.csv -o "proposals/{index:06d}_{company}.pptx" --compression fast
+"""
+import csv
+import io
+import os
+import re
+import struct
+import sys
+import time
+import zlib
+from xml.sax.saxutils import escape
+
+import ppt
+from saver import iter_package_items, normalize_core_properties, normalize_shape_ids, resolve_compression
+
+TOKEN_RE = re.compile(rb'\{\{(\w+)\}\}')
+
+# 1980-01-01 00:00:00 を DOS 形式で表したもの
+_DOS_TIME = 0
+_DOS_DATE = (1 << 5) | 1
+_LOCAL_HEADER = struct.Struct('<IHHHHHIIIHH')
+_CENTRAL_HEADER = struct.Struct('<IHHHHHHIIIHHHHHII')
+_END_RECORD = struct.Struct('<IHHHHIIH')
+
+
+def _compress(name, data, level):
+    """ZIP エントリ (名前, 圧縮方式, CRC, 圧縮後サイズ, 元サイズ, 圧縮データ) を作る"""
+    crc = zlib.crc32(data)
+    if level:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+        payload = compressor.compress(data) + compressor.flush()
+        method = 8
+    else:
+        payload, method = data, 0
+    return name.encode('utf-8'), method, crc, len(payload), len(data), payload
+
+
+def write_zip(stream, entries):
+    """圧縮済みエントリをそのまま ZIP として stream に書き出す"""
+    central = []
+    offset = 0
+    for name, method, crc, csize, usize, payload in entries:
+        header = _LOCAL_HEADER.pack(0x04034b50, 20, 0, method, _DOS_TIME, _DOS_DATE,
+                                    crc, csize, usize, len(name), 0)
+        stream.write(header)
+        stream.write(name)
+        stream.write(payload)
+        central.append(_CENTRAL_HEADER.pack(0x02014b50, 20, 20, 0, method, _DOS_TIME, _DOS_DATE,
+                                            crc, csize, usize, len(name), 0, 0, 0, 0, 0, offset) + name)
+        offset += len(header) + len(name) + csize
+    directory = b''.join(central)
+    stream.write(directory)
+    stream.write(_END_RECORD.pack(0x06054b50, 0, 0, len(central), len(central),
+                                  len(directory), offset, 0))
+
+
+class MailMergeTemplate:
+    """差し込みトークン入りのデッキ骨格。render() で宛先ごとの .pptx バイト列を作る"""
+
+    def __init__(self, module=ppt, compression='default'):
+        levels = resolve_compression(compression)
+        saved = dict(module.PROPOSAL_FIELDS)
+        self.defaults = saved
+        try:
+            module.PROPOSAL_FIELDS.update({name: '{{%s}}' % name for name in saved})
+            prs = module.build_presentation()
+        finally:
+            module.PROPOSAL_FIELDS.clear()
+            module.PROPOSAL_FIELDS.update(saved)
+        normalize_core_properties(prs)
+        normalize_shape_ids(prs)
+        # 各パートは静的エントリ (圧縮済み) か、置換が必要なテンプレート (bytes) のどちらか
+        self._parts = []
+        for membername, blob in iter_package_items(prs):
+            kind = 'xml' if membername.endswith(('.xml', '.rels')) else 'media'
+            level = levels[kind]
+            if TOKEN_RE.search(blob):
+                self._parts.append((membername, blob, level))
+            else:
+                self._parts.append(_compress(membername, blob, level))
+
+    @property
+    def dynamic_parts(self):
+        """宛先ごとに置換されるパート名のリスト"""
+        return [part[0] for part in self._parts if len(part) == 3]
+
+    def _values(self, row):
+        values = {}
+        for name, default in self.defaults.items():
+            value = row.get(name)
+            if value is None or value == '':
+                value = default
+            values[name.encode('ascii')] = escape(str(value)).encode('utf-8')
+        return values
+
+    def write(self, row, stream):
+        """row (dict) の値を差し込んだ .pptx を stream に書き出す"""
+        values = self._values(row)
+
+        def substitute(match):
+            return values.get(match.group(1), match.group(0))
+
+        entries = []
+        for part in self._parts:
+            if len(part) == 3:
+                membername, blob, level = part
+                entries.append(_compress(membername, TOKEN_RE.sub(substitute, blob), level))
+            else:
+                entries.append(part)
+        write_zip(stream, entries)
+
+    def render(self, row):
+        """row の値を差し込んだ .pptx のバイト列を返す"""
+        buffer = io.BytesIO()
+        self.write(row, buffer)
+        return buffer.getvalue()
+
+
+def iter_rows(path, batch_size=1024):
+    """CSV または Parquet の行を dict として1行ずつ返す"""
+    if path.endswith('.parquet'):
+        # Parquet は任意依存 (pyarrow) で、行グループ単位に読み進める
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet の読み込みには pyarrow が必要です: pip install pyarrow")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+            yield from batch.to_pylist()
+        return
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        yield from csv.DictReader(f)
+
+
+def _safe(value):
+    return str(value).replace('/', '_').replace('\\', '_')
+
+
+def merge(input_path, output_pattern, module=ppt, compression='default'):
+    """input_path の各行から output_pattern に従ってファイルを生成し、件数を返す
+
+    output_pattern には {index} と各列名を使える (例: "out/{index:06d}_{company}.pptx")。
+    """
+    template = MailMergeTemplate(module, compression)
+    count = 0
+    for index, row in enumerate(iter_rows(input_path), 1):
+        fields = {key: _safe(value) for key, value in row.items() if key}
+        path = output_pattern.format(index=index, **fields)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'wb') as f:
+            template.write(row, f)
+        count += 1
+    return count
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='宛先リストから提案書を差し込み生成する')
+    parser.add_argument('input', help='CSV または Parquet ファイル')
+    parser.add_argument('-o', '--output', default='proposals/proposal_{index:06d}.pptx')
+    parser.add_argument('--compression', default='default')
+    args = parser.parse_args()
+    start = time.perf_counter()
+    count = merge(args.input, args.output, compression=args.compression)
+    elapsed = time.perf_counter() - start
+    print("差し込み生成が完了しました: %d 件 (%.2f 秒, 1件あたり %.2f ms)"
+          % (count, elapsed, elapsed * 1000 / max(count, 1)), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,241 @@
+"""本文テキストの小さなマークアップ言語 (行頭の記号と、行内の太字・色・リンク)
+
+apply_body_style() に渡す各行は次の書式で書ける。
+
+行頭 (行全体に効く):
+    【見出し】          見出し (レベル 0)
+    • 項目              箇条書き (レベル 1)
+      - 項目            下位の箇条書き (レベル 2、先頭は半角スペース2つ)
+    (空白だけの行)      空の段落
+
+行内:
+    **太字**
+    {ACCENT1:色付き}    ColorPalette の色名 (大文字)。{#FF9F40:色付き} のように16進でも書ける。
+                        palette に無い名前 ({PROD: region A} など) は普通の文字のまま
+    [リンク](https://example.com)
+    \\*  \\{  \\}  \\[  \\]  \\\\   記号そのもの
+
+対になっていない記号は普通の文字として扱うので、記号を使っていない既存の文字列は
+これまでと同じ1つのランになる。
+
+行はまとめて1つの正規表現 (_TOKEN_RE) で字句に分けてから組み立てる。同じ定型文は
+何千ものデッキで繰り返し現れるため、parse_line() の結果は (文字列, palette) ごとに
+lru_cache (linebreak と同じく最大 65536 件) で覚えておき、2回目以降は解析しない。結果はタプル (Line / Span) なので共有しても
+書き換えられることはない。
+
+使い方:
+    from markup import parse_line, add_runs
+    line = parse_line('• 年間コスト **2,000万円** 削減', ColorPalette)
+    add_runs(p, line.spans, BODY_FONT, BODY_SIZE, ColorPalette.DARK, palette=ColorPalette)
+
+    python markup.py bench   # キャッシュなしとありの解析時間
+"""
+import functools
+import re
+import time
+from collections import namedtuple
+
+from pptx.dml.color import RGBColor
+
+# text: 文字列 / bold: 太字か / color: '#RRGGBB' か色名 (指定なしは None) / link: URL か None
+Span = namedtuple('Span', 'text bold color link')
+# level: 0〜2 / heading: 【】見出しか / spans: Span のタプル (空行は空のタプル)
+Line = namedtuple('Line', 'level heading spans')
+
+_TOKEN_RE = re.compile(r'''
+    \\(?P<escape>[\\*{}\[\]])
+  | (?P<bold>\*\*)
+  | \{(?P<color>\#[0-9A-Fa-f]{6}|[A-Z][A-Z0-9_]*):
+  | (?P<close>\})
+  | \[(?P<label>(?:\\.|[^\]\\])*)\]\((?P<url>[^()\s]+)\)
+''', re.VERBOSE)
+
+_BREAK_RE = re.compile('\n|\v')
+
+BLANK = Line(0, False, ())
+
+
+def _is_color(name, palette):
+    if name.startswith('#'):
+        return True
+    return palette is not None and isinstance(getattr(palette, name, None), RGBColor)
+
+
+def _tokens(text, palette):
+    """(種類, 値) の列に分ける。種類は text / bold / color / close / link"""
+    items = []
+    pos = 0
+    for m in _TOKEN_RE.finditer(text):
+        if m.start() > pos:
+            items.append(['text', text[pos:m.start()]])
+        kind = m.lastgroup
+        if kind == 'escape':
+            items.append(['text', m.group('escape')])
+        elif kind == 'url':
+            items.append(['link', (m.group('label'), m.group('url'))])
+        elif kind == 'color' and not _is_color(m.group('color'), palette):
+            items.append(['text', m.group(0)])
+        else:
+            items.append([kind, m.group(kind)])
+        pos = m.end()
+    if pos < len(text):
+        items.append(['text', text[pos:]])
+    return items
+
+
+def _pair(items):
+    """対になっていない ** と {色: と } を文字に戻す"""
+    bolds = [item for item in items if item[0] == 'bold']
+    if len(bolds) % 2:
+        bolds[-1][0] = 'text'
+    opened = []
+    for item in items:
+        if item[0] == 'color':
+            opened.append(item)
+        elif item[0] == 'close':
+            if opened:
+                opened.pop()
+            else:
+                item[0] = 'text'
+    for item in opened:
+        item[0] = 'text'
+        item[1] = '{%s:' % item[1]
+
+
+def _append(spans, text, bold, color, link):
+    # 直前と同じ書式なら1つのランにまとめる
+    if spans and spans[-1][1:] == (bold, color, link):
+        spans[-1] = Span(spans[-1].text + text, bold, color, link)
+    elif text:
+        spans.append(Span(text, bold, color, link))
+
+
+def parse_inline(text, palette=None):
+    """行内のマークアップを Span のタプルにする (色名は palette にあるものだけ)"""
+    items = _tokens(text, palette)
+    _pair(items)
+    spans = []
+    bold = False
+    colors = []
+    for kind, value in items:
+        color = colors[-1] if colors else None
+        if kind == 'text':
+            _append(spans, value, bold, color, None)
+        elif kind == 'bold':
+            bold = not bold
+        elif kind == 'color':
+            colors.append(value)
+        elif kind == 'close':
+            colors.pop()
+        else:
+            label, url = value
+            for span in parse_inline(label, palette):
+                _append(spans, span.text, bold or span.bold, span.color or color, url)
+    return tuple(spans)
+
+
+@functools.lru_cache(maxsize=65536)
+def parse_line(text, palette=None):
+    """apply_body_style() の1行を Line にする (同じ文字列と palette は1回だけ解析する)
+
+    {NAME: は NAME が palette の色 (RGBColor) のときだけ色の指定になる。palette を渡さなければ
+    16進の色だけを色の指定とみなす。
+    """
+    if not text.strip():
+        return BLANK
+    if text.startswith('【') and text.endswith('】'):
+        return Line(0, True, parse_inline(text, palette))
+    if text.startswith('• '):
+        return Line(1, False, parse_inline(text[2:], palette))
+    if text.startswith('  - '):
+        return Line(2, False, parse_inline(text[4:], palette))
+    return Line(0, False, parse_inline(text, palette))
+
+
+def resolve_color(color, palette=None):
+    """'#RRGGBB' か palette の色名を RGBColor にする"""
+    if color.startswith('#'):
+        return RGBColor.from_string(color[1:].upper())
+    value = getattr(palette, color, None) if palette is not None else None
+    if not isinstance(value, RGBColor):
+        raise ValueError("色名が見つかりません: %s" % color)
+    return value
+
+
+def add_runs(p, spans, font_name, font_size, color, bold=False, palette=None):
+    """段落 p に spans のランを追加して書式を付け、追加したランのリストを返す
+
+    font_name / font_size / color / bold は段落の既定の書式で、Span の太字・色・リンクで上書きする。
+    改行 (\\n, \\v) は p.text と同じく行区切り (a:br) にする。
+    """
+    runs = []
+    for span in spans:
+        for i, piece in enumerate(_BREAK_RE.split(span.text)):
+            if i > 0:
+                p.add_line_break()
+            if not piece:
+                continue
+            run = p.add_run()
+            run.text = piece
+            run.font.name = font_name
+            run.font.size = font_size
+            run.font.bold = bold or span.bold
+            run.font.color.rgb = resolve_color(span.color, palette) if span.color else color
+            if span.link:
+                run.hyperlink.address = span.link
+            runs.append(run)
+    return runs
+
+
+def _bench(decks=1000):
+    """ppt.py の本文の行を decks 回解析し、(キャッシュなしの秒数, ありの秒数, 行数) を返す"""
+    import ast
+    import os
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ppt.py')
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    lines = [node.value for node in ast.walk(tree)
+             if isinstance(node, ast.Constant) and isinstance(node.value, str)
+             and node.value.startswith(('【', '• ', '  - '))]
+    parse_line.cache_clear()
+    start = time.perf_counter()
+    for _ in range(decks):
+        for text in lines:
+            parse_line.__wrapped__(text)
+    plain = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(decks):
+        for text in lines:
+            parse_line(text)
+    cached = time.perf_counter() - start
+    return plain, cached, len(lines)
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='本文テキストのマークアップ')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('parse', help='行を解析して段落とランを表示する')
+    p.add_argument('lines', nargs='+')
+    p = sub.add_parser('bench', help='キャッシュなしとありで解析時間を比べる')
+    p.add_argument('--decks', type=int, default=1000)
+    args = parser.parse_args()
+
+    if args.command == 'bench':
+        plain, cached, count = _bench(args.decks)
+        print("%d 行 × %d デッキ: キャッシュなし %.3f 秒 / キャッシュあり %.3f 秒"
+              % (count, args.decks, plain, cached))
+        info = parse_line.cache_info()
+        print("キャッシュ: %d 件 / ヒット %d・ミス %d" % (info.currsize, info.hits, info.misses))
+        return
+    for text in args.lines:
+        line = parse_line(text)
+        print("レベル %d%s" % (line.level, " (見出し)" if line.heading else ""))
+        for span in line.spans:
+            print("  %r%s%s%s" % (span.text, " 太字" if span.bold else "",
+                                  " 色=%s" % span.color if span.color else "",
+                                  " リンク=%s" % span.link if span.link else ""))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,474 @@
+"""複数のデッキを1つの .pptx に結合する (マスター・レイアウト・テーマ・画像は重複を除く)
+
+生成した提案書を何十個も手作業でコピーして結合すると、デッキごとにマスターと
+レイアウトが複製されてファイルが膨らむ。ここでは python-pptx で読み込まずに ZIP の
+パートを直接コピーし、スライドから参照されるパートを内容のハッシュで共有する。
+
+- スライドとノートはデッキごとに新しいパートとしてコピーする
+- それ以外のパート (マスター・レイアウト・テーマ・画像など) のキーは、そのパートから
+  リレーションでたどれるパートの内容とリレーションの形 (rId・種類・たどった順番) の
+  ハッシュ。マスターとレイアウトは互いを参照しあうので、パート単体ではなく
+  たどれる範囲全体で比べる。同じキーのパートは最初にコピーしたものを使い回す
+- パートの XML は書き換えず、リレーションのターゲットだけを新しいパート名にする。
+  例外はマスターのレイアウト ID (sldLayoutId) で、デッキをまたいで重複しないよう振り直す
+- ノートマスターはプレゼンテーションに1つしか置けないので、最初のものに統一する
+- プレゼンテーションのプロパティ・表スタイル・ドキュメントのプロパティは最初のデッキのもの
+
+デッキは1つずつ開いてパートを出力の ZIP に書き出していくので、メモリに残るのは
+パート名とキーの対応表だけで、何百個のデッキでも全体を読み込むことはない。
+スライドのサイズが最初のデッキと 1% 以上異なるデッキは結合できない (ValueError)。
+
+使い方:
+    python merge.py proposals/ -o mega.pptx
+    python merge.py a.pptx b.pptx c.pptx -o merged.pptx --compression archive
+"""
+import hashlib
+import os
+import posixpath
+import re
+import tempfile
+import time
+import zipfile
+
+from lxml import etree
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+
+from saver import ZIP_TIMESTAMP, _XML_EXTENSIONS, _zip_info, resolve_compression
+from shape_records import NS
+
+_CT_NS = 'http://schemas.openxmlformats.org/package/2006/content-types'
+_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+_P = '{%s}' % NS['p']
+_R_ID = '{%s}id' % NS['r']
+_R_ATTRS = (_R_ID, '{%s}embed' % NS['r'], '{%s}link' % NS['r'])
+_XML_DECLARATION = b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+# スライドごとにコピーする (共有しない) パートの種類
+_PER_SLIDE = (RT.SLIDE, RT.NOTES_SLIDE)
+# 最初のマスター ID (sldMasterId と sldLayoutId は 2^31 以上で、全体で重複しない)
+FIRST_MASTER_ID = 2147483648
+FIRST_SLIDE_ID = 256
+# 結合できるスライドサイズの差 (最初のデッキのサイズに対する割合)
+SIZE_TOLERANCE = 0.01
+
+
+def rels_member(member):
+    """パートのリレーションのメンバー名 ('ppt/slides/slide1.xml' -> 'ppt/slides/_rels/slide1.xml.rels')"""
+    directory, name = posixpath.split(member)
+    return posixpath.join(directory, '_rels', name + '.rels')
+
+
+def resolve(member, target):
+    """member のリレーションのターゲットを ZIP のメンバー名にする"""
+    if target.startswith('/'):
+        return target[1:]
+    return posixpath.normpath(posixpath.join(posixpath.dirname(member), target))
+
+
+def relative(member, target_member):
+    """member から target_member への相対ターゲット"""
+    return posixpath.relpath(target_member, posixpath.dirname(member))
+
+
+def read_rels(zf, member):
+    """パートのリレーションを (rId, 種類, ターゲット, 外部参照か) のリストで返す"""
+    try:
+        data = zf.read(rels_member(member) if member else '_rels/.rels')
+    except KeyError:
+        return []
+    return [(rel.get('Id'), rel.get('Type'), rel.get('Target'), rel.get('TargetMode') == 'External')
+            for rel in etree.fromstring(data).iter('{%s}Relationship' % _REL_NS)]
+
+
+def rels_xml(rels):
+    """(rId, 種類, ターゲット, 外部参照か) のリストをリレーションの XML にする"""
+    root = etree.Element('{%s}Relationships' % _REL_NS, nsmap={None: _REL_NS})
+    for rId, reltype, target, external in rels:
+        rel = etree.SubElement(root, '{%s}Relationship' % _REL_NS, Id=rId, Type=reltype, Target=target)
+        if external:
+            rel.set('TargetMode', 'External')
+    return _XML_DECLARATION + etree.tostring(root)
+
+
+def read_content_types(zf):
+    """[Content_Types].xml を ({拡張子: 種類}, {メンバー名: 種類}) で返す"""
+    root = etree.fromstring(zf.read('[Content_Types].xml'))
+    defaults = {el.get('Extension').lower(): el.get('ContentType') for el in root.iter('{%s}Default' % _CT_NS)}
+    overrides = {el.get('PartName').lstrip('/'): el.get('ContentType') for el in root.iter('{%s}Override' % _CT_NS)}
+    return defaults, overrides
+
+
+def content_types_xml(defaults, overrides):
+    root = etree.Element('{%s}Types' % _CT_NS, nsmap={None: _CT_NS})
+    for extension, content_type in sorted(defaults.items()):
+        etree.SubElement(root, '{%s}Default' % _CT_NS, Extension=extension, ContentType=content_type)
+    for member, content_type in overrides.items():
+        etree.SubElement(root, '{%s}Override' % _CT_NS, PartName='/' + member, ContentType=content_type)
+    return _XML_DECLARATION + etree.tostring(root)
+
+
+def presentation_member(zf):
+    """パッケージのリレーションからプレゼンテーション本体のメンバー名を返す"""
+    for _, reltype, target, _ in read_rels(zf, None):
+        if reltype == RT.OFFICE_DOCUMENT:
+            return resolve('', target)
+    raise ValueError("プレゼンテーションのパートが見つかりません")
+
+
+def _same_size(size, base):
+    # Inches(13.33) の丸め方の違い程度の差 (1% 未満) は同じサイズとみなす
+    if size is None or base is None:
+        return size == base
+    return all(abs(a - b) <= b * SIZE_TOLERANCE for a, b in zip(size, base))
+
+
+class _Source:
+    """結合中の1つのデッキ。リレーションとハッシュはこのデッキの間だけ覚えておく"""
+
+    def __init__(self, zf):
+        self.zf = zf
+        self.defaults, self.overrides = read_content_types(zf)
+        self.names = {}  # 元のメンバー名 -> 出力のメンバー名
+        self._rels = {}
+        self._digests = {}
+        self._keys = {}
+
+    def rels(self, member):
+        rels = self._rels.get(member)
+        if rels is None:
+            rels = self._rels[member] = read_rels(self.zf, member)
+        return rels
+
+    def content_type(self, member):
+        if member in self.overrides:
+            return self.overrides[member]
+        return self.defaults.get(posixpath.splitext(member)[1][1:].lower())
+
+    def _digest(self, member):
+        digest = self._digests.get(member)
+        if digest is None:
+            digest = self._digests[member] = hashlib.sha1(self.zf.read(member)).digest()
+        return digest
+
+    def key(self, member):
+        """member からたどれるパート (スライドとノートは除く) の内容とリレーションの形のハッシュ"""
+        key = self._keys.get(member)
+        if key is not None:
+            return key
+        order = {member: 0}
+        queue = [member]
+        h = hashlib.sha1()
+        for current in queue:
+            h.update(('%s %s\n' % (posixpath.splitext(current)[1], self.content_type(current))).encode())
+            h.update(self._digest(current))
+            for rId, reltype, target, external in self.rels(current):
+                if external:
+                    label = target
+                elif reltype in _PER_SLIDE:
+                    label = ''
+                else:
+                    target = resolve(current, target)
+                    if target not in order:
+                        order[target] = len(order)
+                        queue.append(target)
+                    label = order[target]
+                h.update(('%s %s %s\n' % (rId, reltype, label)).encode())
+        key = self._keys[member] = h.hexdigest()
+        return key
+
+
+class DeckMerger:
+    """デッキを順に add() し、close() でプレゼンテーション本体を書いて結合を終える
+
+    file がパスの場合は同じディレクトリの一時ファイルに書き、close() が成功したときだけ
+    os.replace で置き換える。途中で失敗したら (with の中の例外も) 一時ファイルを削除するので、
+    書きかけの ZIP が出力先に残ることはない。
+    """
+
+    def __init__(self, file, compression=None):
+        self._levels = resolve_compression(compression)
+        self._path = self._tmp_path = None
+        if isinstance(file, (str, os.PathLike)):
+            self._path = os.fspath(file)
+            fd, self._tmp_path = tempfile.mkstemp(suffix='.pptx', prefix='.tmp-',
+                                                  dir=os.path.dirname(os.path.abspath(self._path)))
+            file = self._file = os.fdopen(fd, 'w+b')
+        self._zf = zipfile.ZipFile(file, 'w')
+        self._defaults = {}
+        self._overrides = {}
+        self._used = {'[Content_Types].xml', '_rels/.rels', 'ppt/presentation.xml'}
+        self._counters = {}
+        self._shared = {}        # キー -> 出力のメンバー名
+        self._masters = []       # (出力のメンバー名, マスター ID)
+        self._slides = []
+        self._notes_master = None
+        self._next_master_id = FIRST_MASTER_ID
+        self._first = None       # 最初のデッキのプレゼンテーション XML・リレーション・その他のパートの対応
+        self._slide_size = None
+        self.decks = 0
+        self.reused = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if exc[0] is None:
+            self.close()
+        else:
+            self.discard()
+
+    def discard(self):
+        """結合をやめる (パスに書き出す場合は一時ファイルを削除する)"""
+        self._zf.close()
+        if self._tmp_path is not None:
+            self._file.close()
+            os.unlink(self._tmp_path)
+            self._tmp_path = None
+
+    def _write(self, member, data):
+        kind = 'xml' if member.endswith(_XML_EXTENSIONS) else 'media'
+        level = self._levels[kind]
+        self._zf.writestr(_zip_info(member, level, ZIP_TIMESTAMP), data, compresslevel=level or None)
+
+    def _allocate(self, member):
+        """member が未使用ならそのまま、使用済みなら番号だけが違う未使用のメンバー名を返す"""
+        if member not in self._used:
+            self._used.add(member)
+            return member
+        match = re.match(r'^(.*?)(\d*)(\.[^./]*)?$', member)
+        stem, extension = match.group(1), match.group(3) or ''
+        number = self._counters.get((stem, extension), 0)
+        while True:
+            number += 1
+            name = '%s%d%s' % (stem, number, extension)
+            if name not in self._used:
+                break
+        self._counters[(stem, extension)] = number
+        self._used.add(name)
+        return name
+
+    def _record_content_type(self, src, member, name):
+        extension = posixpath.splitext(member)[1][1:].lower()
+        if member in src.overrides:
+            self._overrides[name] = src.overrides[member]
+        elif extension in src.defaults:
+            self._defaults.setdefault(extension, src.defaults[extension])
+
+    def _copy(self, src, member, reltype):
+        """src のパート member (とリレーションの先) をコピーし、出力のメンバー名を返す"""
+        name = src.names.get(member)
+        if name is not None:
+            return name
+        if reltype == RT.NOTES_MASTER and self._notes_master is not None:
+            src.names[member] = self._notes_master
+            return self._notes_master
+        if reltype in _PER_SLIDE:
+            name = self._allocate(member)
+        else:
+            key = src.key(member)
+            name = self._shared.get(key)
+            if name is not None:
+                src.names[member] = name
+                self.reused += 1
+                return name
+            name = self._shared[key] = self._allocate(member)
+        src.names[member] = name
+        if reltype == RT.NOTES_MASTER:
+            self._notes_master = name
+
+        rels = []
+        for rId, rel_type, target, external in src.rels(member):
+            if not external:
+                target = relative(name, self._copy(src, resolve(member, target), rel_type))
+            rels.append((rId, rel_type, target, external))
+        data = src.zf.read(member)
+        if reltype == RT.SLIDE_MASTER:
+            data = self._renumber_master(name, data)
+        self._write(name, data)
+        if rels:
+            self._write(rels_member(name), rels_xml(rels))
+        self._record_content_type(src, member, name)
+        return name
+
+    def _renumber_master(self, name, data):
+        """マスター ID を割り当て、マスターのレイアウト ID を出力全体で重複しない値に振り直す"""
+        master_id = self._next_master_id
+        root = etree.fromstring(data)
+        next_id = master_id + 1
+        for layout_id in root.iter(_P + 'sldLayoutId'):
+            layout_id.set('id', str(next_id))
+            next_id += 1
+        self._next_master_id = next_id
+        self._masters.append((name, master_id))
+        return _XML_DECLARATION + etree.tostring(root)
+
+    def add(self, path):
+        """path のデッキのスライドを末尾に追加し、追加したスライドの数を返す"""
+        with zipfile.ZipFile(path) as zf:
+            src = _Source(zf)
+            member = presentation_member(zf)
+            presentation = etree.fromstring(zf.read(member))
+            size = presentation.find(_P + 'sldSz')
+            size = (int(size.get('cx')), int(size.get('cy'))) if size is not None else None
+            if self._slide_size is None:
+                self._slide_size = size
+            elif not _same_size(size, self._slide_size):
+                raise ValueError("スライドサイズが違うデッキは結合できません: %s (%s)" % (path, size))
+            first = self._first is None
+            if first:
+                package_rels = self._package_parts(src)
+            pres_rels = {rId: (reltype, resolve(member, target), external)
+                         for rId, reltype, target, external in src.rels(member)}
+
+            # マスターはスライドから使われていなくても残す
+            for master_id in presentation.iter(_P + 'sldMasterId'):
+                reltype, target, _ = pres_rels[master_id.get(_R_ID)]
+                self._copy(src, target, reltype)
+            renamed = {}
+            for rId, (reltype, target, external) in pres_rels.items():
+                if reltype == RT.NOTES_MASTER or (first and reltype not in (RT.SLIDE, RT.SLIDE_MASTER)):
+                    renamed[rId] = (reltype, target if external else self._copy(src, target, reltype), external)
+            count = 0
+            for slide_id in presentation.iter(_P + 'sldId'):
+                reltype, target, _ = pres_rels[slide_id.get(_R_ID)]
+                name = self._copy(src, target, reltype)
+                self._slides.append(name)
+                renamed[slide_id.get(_R_ID)] = (reltype, name, False)
+                count += 1
+            for master_id in presentation.iter(_P + 'sldMasterId'):
+                reltype, target, _ = pres_rels[master_id.get(_R_ID)]
+                renamed[master_id.get(_R_ID)] = (reltype, src.names[target], False)
+            if first:
+                self._first = (presentation, renamed, package_rels)
+        self.decks += 1
+        return count
+
+    def _package_parts(self, src):
+        """パッケージのリレーションとドキュメントのプロパティは最初のデッキのものを使う"""
+        package_rels = []
+        for rId, reltype, target, external in read_rels(src.zf, None):
+            if reltype == RT.OFFICE_DOCUMENT:
+                target = 'ppt/presentation.xml'
+            elif not external:
+                part = resolve('', target)
+                self._used.add(part)
+                self._write(part, src.zf.read(part))
+                self._record_content_type(src, part, part)
+            package_rels.append((rId, reltype, target, external))
+        return package_rels
+
+    def close(self):
+        """プレゼンテーション本体・リレーション・[Content_Types].xml を書いて ZIP を閉じる"""
+        try:
+            self._finish()
+        except BaseException:
+            self.discard()
+            raise
+        if self._tmp_path is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            os.replace(self._tmp_path, self._path)
+            self._tmp_path = None
+
+    def _finish(self):
+        if self._first is None:
+            raise ValueError("結合するデッキがありません")
+        presentation, renamed, package_rels = self._first
+        member = 'ppt/presentation.xml'
+        rels = []
+        new_ids = {}
+
+        def add_rel(reltype, target, external=False):
+            rId = 'rId%d' % (len(rels) + 1)
+            rels.append((rId, reltype, target if external else relative(member, target), external))
+            return rId
+
+        master_rids = [add_rel(RT.SLIDE_MASTER, name) for name, _ in self._masters]
+        notes_rid = add_rel(RT.NOTES_MASTER, self._notes_master) if self._notes_master else None
+        slide_rids = [add_rel(RT.SLIDE, name) for name in self._slides]
+        for old, (reltype, target, external) in renamed.items():
+            if reltype == RT.SLIDE_MASTER:
+                new_ids[old] = master_rids[[name for name, _ in self._masters].index(target)]
+            elif reltype == RT.NOTES_MASTER:
+                new_ids[old] = notes_rid
+            elif reltype == RT.SLIDE:
+                new_ids[old] = slide_rids[self._slides.index(target)]
+            else:
+                new_ids[old] = add_rel(reltype, target, external)
+
+        masters = presentation.find(_P + 'sldMasterIdLst')
+        for child in list(masters):
+            masters.remove(child)
+        for (_, master_id), rId in zip(self._masters, master_rids):
+            etree.SubElement(masters, _P + 'sldMasterId', {'id': str(master_id), _R_ID: rId})
+        notes = presentation.find(_P + 'notesMasterIdLst')
+        if notes is not None:
+            presentation.remove(notes)
+        if notes_rid:
+            notes = etree.Element(_P + 'notesMasterIdLst')
+            etree.SubElement(notes, _P + 'notesMasterId', {_R_ID: notes_rid})
+            masters.addnext(notes)
+        slides = presentation.find(_P + 'sldIdLst')
+        if slides is None:
+            slides = etree.Element(_P + 'sldIdLst')
+            presentation.find(_P + 'sldSz').addprevious(slides)
+        for child in list(slides):
+            slides.remove(child)
+        for i, rId in enumerate(slide_rids):
+            etree.SubElement(slides, _P + 'sldId', {'id': str(FIRST_SLIDE_ID + i), _R_ID: rId})
+        # 残りの参照 (ハンドアウトマスター・埋め込みフォントなど) は最初のデッキの rId を付け替える
+        for el in presentation.iter():
+            if el.getparent() in (masters, notes, slides):
+                continue
+            for attr in _R_ATTRS:
+                old = el.get(attr)
+                if old is not None and old in new_ids:
+                    el.set(attr, new_ids[old])
+
+        self._write(member, _XML_DECLARATION + etree.tostring(presentation))
+        self._write(rels_member(member), rels_xml(rels))
+        self._overrides[member] = 'application/vnd.openxmlformats-officedocument.presentationml.presentation.main+xml'
+        self._defaults.setdefault('rels', 'application/vnd.openxmlformats-package.relationships+xml')
+        self._defaults.setdefault('xml', 'application/xml')
+        self._write('_rels/.rels', rels_xml(package_rels))
+        self._write('[Content_Types].xml', content_types_xml(self._defaults, self._overrides))
+        self._zf.close()
+
+    def stats(self):
+        return {'decks': self.decks, 'slides': len(self._slides), 'masters': len(self._masters),
+                'parts': len(self._used), 'reused': self.reused}
+
+
+def merge_decks(paths, file, compression=None):
+    """paths のデッキを順に結合して file (パスまたは書き込み可能なファイルオブジェクト) に書き出し、統計を返す
+
+    paths にはディレクトリも指定できる (中の .pptx を再帰的に名前順で結合する)。
+    """
+    from deck_index import iter_deck_paths
+    with DeckMerger(file, compression) as merger:
+        for path in iter_deck_paths(paths):
+            merger.add(path)
+    return merger.stats()
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='複数のデッキを1つに結合する (マスター・レイアウト・画像は共有)')
+    parser.add_argument('paths', nargs='+', help='.pptx ファイルまたはディレクトリ (この順に結合する)')
+    parser.add_argument('-o', '--output', default='merged.pptx')
+    parser.add_argument('--compression', default=None, help='preview / fast / default / archive')
+    args = parser.parse_args()
+    start = time.perf_counter()
+    try:
+        stats = merge_decks(args.paths, args.output, args.compression)
+    except ValueError as e:
+        parser.error(str(e))
+    elapsed = time.perf_counter() - start
+    print("結合しました: %s (%d デッキ / %d スライド / マスター %d / 共有したパート %d 件, %.1f KB, %.2f 秒)" % (
+        args.output, stats['decks'], stats['slides'], stats['masters'], stats['reused'],
+        os.path.getsize(args.output) / 1024, elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,487 @@
+"""生成処理のメトリクスを Prometheus のテキスト形式で公開するレジストリ
+
+サービスとして提案書を生成するときのスループット・レイテンシを観測するため、
+生成デッキ数・スライド数・ビルダー (create_* 関数) ごとのレイテンシのヒストグラム・
+保存 (シリアライズ) 時間・出力バイト数・キューの滞留数・ワーカーの RSS を記録する。
+
+カウンターとヒストグラムはスレッドごとのシャード (数値のリスト) に書き込むため、
+記録時にロックを取らない。ロックはスレッドが初めて記録するときと、スクレイプ時に
+シャードを合計するときだけ取る。メトリクスはプロセスごとに持つので、複数プロセスで
+動かす場合はプロセスごとに別のポートで公開する (jobqueue.py run --metrics-port)。
+
+使い方:
+    import metrics
+    metrics.instrument_builders(ppt)     # ppt の create_* 関数の所要時間を記録する
+    metrics.serve(9100)                  # http://localhost:9100/metrics
+
+    python metrics.py serve --port 9100 --module ppt --repeat 0
+"""
+import abc
+import bisect
+import functools
+import os
+import threading
+import time
+
+# レイテンシ (秒) の既定のバケット境界
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(pairs):
+    if not pairs:
+        return ''
+    return '{%s}' % ','.join('%s="%s"' % (name, _escape(value)) for name, value in pairs)
+
+
+class _Sharded:
+    """スレッドごとのシャードに加算し、読み出し時に合計する数値の列"""
+
+    def __init__(self, size):
+        self._size = size
+        self._local = threading.local()
+        self._shards = []
+        self._lock = threading.Lock()
+
+    def _shard(self):
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = [0.0] * self._size
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def _totals(self):
+        with self._lock:
+            shards = list(self._shards)
+        totals = [0.0] * self._size
+        for shard in shards:
+            for i, value in enumerate(shard):
+                totals[i] += value
+        return totals
+
+
+class _CounterChild(_Sharded):
+
+    def __init__(self):
+        super().__init__(1)
+
+    def inc(self, amount=1):
+        if amount < 0:
+            raise ValueError("カウンターは減らせません: %r" % amount)
+        self._shard()[0] += amount
+
+    def get(self):
+        return self._totals()[0]
+
+
+class _GaugeChild:
+
+    def __init__(self):
+        self._value = 0.0
+        self._function = None
+        self._lock = threading.Lock()
+
+    def set(self, value):
+        self._value = value
+
+    def inc(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount=1):
+        self.inc(-amount)
+
+    def set_function(self, function):
+        """スクレイプのたびに function() の戻り値を値とする"""
+        self._function = function
+
+    def get(self):
+        if self._function is not None:
+            return self._function()
+        return self._value
+
+
+class _HistogramChild(_Sharded):
+    # シャードは [バケットごとの件数 (末尾は +Inf)..., 合計値]
+
+    def __init__(self, buckets):
+        super().__init__(len(buckets) + 2)
+        self._buckets = buckets
+
+    def observe(self, value):
+        shard = self._shard()
+        shard[bisect.bisect_left(self._buckets, value)] += 1
+        shard[-1] += value
+
+    def time(self):
+        """with ブロックの所要時間を記録するコンテキストマネージャーを返す"""
+        return _Timer(self)
+
+    def get(self):
+        """(累積バケット [(上限, 件数)], 件数, 合計) を返す"""
+        totals = self._totals()
+        cumulative, count = [], 0
+        for bound, n in zip(self._buckets + (float('inf'),), totals[:-1]):
+            count += n
+            cumulative.append((bound, count))
+        return cumulative, count, totals[-1]
+
+
+class _Timer:
+
+    def __init__(self, child):
+        self._child = child
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._child.observe(time.perf_counter() - self._start)
+        return False
+
+
+class _Metric(abc.ABC):
+    """ラベルの値の組ごとに子 (実際の値) を持つメトリクス"""
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=(), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self._children[()] = self._new_child()
+        (REGISTRY if registry is None else registry).register(self)
+
+    @abc.abstractmethod
+    def _new_child(self):
+        """ラベルの値の組1つ分の子 (_CounterChild など) を作る"""
+
+    def labels(self, *values, **labels):
+        """ラベルの値に対応する子を返す (ホットパスでは戻り値を保持して使い回す)"""
+        if labels:
+            values = tuple(labels[name] for name in self.labelnames)
+        key = tuple(str(value) for value in values)
+        try:
+            return self._children[key]
+        except KeyError:
+            if len(key) != len(self.labelnames):
+                raise ValueError("ラベルの数が一致しません: %s %r" % (self.name, key))
+            with self._lock:
+                return self._children.setdefault(key, self._new_child())
+
+    def _samples(self):
+        with self._lock:
+            children = sorted(self._children.items())
+        for key, child in children:
+            yield list(zip(self.labelnames, key)), child
+
+    def render(self):
+        lines = ['# HELP %s %s' % (self.name, self.documentation.replace('\n', ' ')),
+                 '# TYPE %s %s' % (self.name, self.kind)]
+        for pairs, child in self._samples():
+            lines.extend(self._render_child(pairs, child))
+        return lines
+
+    def _render_child(self, pairs, child):
+        return ['%s%s %s' % (self.name, _format_labels(pairs), _format_value(child.get()))]
+
+
+class Counter(_Metric):
+    """単調増加するカウンター"""
+    kind = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1):
+        self._default.inc(amount)
+
+    def get(self):
+        return self._default.get()
+
+
+class Gauge(_Metric):
+    """増減する値 (キューの滞留数・メモリ使用量など)"""
+    kind = 'gauge'
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value):
+        self._default.set(value)
+
+    def inc(self, amount=1):
+        self._default.inc(amount)
+
+    def dec(self, amount=1):
+        self._default.dec(amount)
+
+    def set_function(self, function):
+        self._default.set_function(function)
+
+    def get(self):
+        return self._default.get()
+
+
+class Histogram(_Metric):
+    """観測値の分布 (バケットごとの累積件数・件数・合計)"""
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS, registry=None):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value):
+        self._default.observe(value)
+
+    def time(self):
+        return self._default.time()
+
+    def get(self):
+        return self._default.get()
+
+    def _render_child(self, pairs, child):
+        cumulative, count, total = child.get()
+        lines = ['%s_bucket%s %s' % (self.name, _format_labels(pairs + [('le', _format_value(bound))]), _format_value(n))
+                 for bound, n in cumulative]
+        lines.append('%s_sum%s %s' % (self.name, _format_labels(pairs), _format_value(total)))
+        lines.append('%s_count%s %s' % (self.name, _format_labels(pairs), _format_value(count)))
+        return lines
+
+
+class Registry:
+    """メトリクスの集合。render() で Prometheus のテキスト形式にする"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError("同じ名前のメトリクスが登録済みです: %s" % metric.name)
+            self._metrics[metric.name] = metric
+
+    def get(self, name):
+        return self._metrics[name]
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+
+def rss_bytes():
+    """このプロセスの常駐メモリ (RSS) のバイト数"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        # /proc が無い環境では最大 RSS で代用する (Linux は KiB、macOS はバイト)
+        import resource
+        import sys
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss if sys.platform == 'darwin' else maxrss * 1024
+
+
+DECKS_GENERATED = Counter('proposal_decks_generated_total', '保存したデッキの数')
+SLIDES_GENERATED = Counter('proposal_slides_generated_total', '保存したデッキに含まれるスライドの数')
+BUILDER_SECONDS = Histogram('proposal_builder_seconds', 'スライドビルダー (create_* 関数) 1回の所要時間 (秒)',
+                            ('module', 'builder'))
+SAVE_SECONDS = Histogram('proposal_save_seconds', 'デッキのシリアライズと書き出しの所要時間 (秒)')
+OUTPUT_BYTES = Counter('proposal_output_bytes_total', '書き出したデッキの合計バイト数')
+QUEUE_DEPTH = Gauge('proposal_queue_depth', 'ジョブキューの状態ごとのジョブ数', ('status',))
+WORKER_RSS = Gauge('proposal_worker_rss_bytes', 'ワーカープロセスの常駐メモリ (バイト)')
+WORKER_RSS.set_function(rss_bytes)
+
+
+def record_save(prs, seconds, size):
+    """保存1回分 (デッキ数・スライド数・所要時間・バイト数) を記録する"""
+    DECKS_GENERATED.inc()
+    SLIDES_GENERATED.inc(len(prs.slides._sldIdLst))
+    SAVE_SECONDS.observe(seconds)
+    if size is not None:
+        OUTPUT_BYTES.inc(size)
+
+
+def _is_builder(name, function):
+    if not name.startswith('create_') or not callable(function):
+        return False
+    code = getattr(function, '__code__', None)
+    # 第1引数が prs の create_* 関数をスライドビルダーとみなす (create_table などは除く)
+    return code is not None and code.co_argcount > 0 and code.co_varnames[0] == 'prs'
+
+
+def timed_builder(builder, module_name):
+    """builder の呼び出しごとに所要時間を BUILDER_SECONDS に記録するラッパーを返す"""
+    child = BUILDER_SECONDS.labels(module_name, builder.__name__)
+    observe = child.observe
+    perf_counter = time.perf_counter
+
+    @functools.wraps(builder)
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return builder(*args, **kwargs)
+        finally:
+            observe(perf_counter() - start)
+    wrapper.__timed__ = True
+    return wrapper
+
+
+def instrument_builders(module):
+    """module のスライドビルダーを計測用のラッパーに置き換え、置き換えた名前のリストを返す
+
+    モジュールのグローバル (create_presentation() から呼ばれる) と SLIDE_BUILDERS の
+    両方を置き換える。2回呼んでも二重には計測しない。
+    """
+    module_name = module.__name__
+    replaced = []
+    for name, function in list(vars(module).items()):
+        if name == 'create_presentation' or getattr(function, '__timed__', False):
+            continue
+        if _is_builder(name, function):
+            setattr(module, name, timed_builder(function, module_name))
+            replaced.append(name)
+    builders = getattr(module, 'SLIDE_BUILDERS', None)
+    if builders is not None:
+        builders[:] = [getattr(module, builder.__name__, builder) for builder in builders]
+    return replaced
+
+
+def serve(port, addr='', registry=None):
+    """/metrics を返す HTTP サーバーをデーモンスレッドで起動し、サーバーを返す"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    registry = REGISTRY if registry is None else registry
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] not in ('/metrics', '/'):
+                self.send_error(404)
+                return
+            body = registry.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((addr, port), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name='metrics-%d' % port, daemon=True)
+    thread.start()
+    return server
+
+
+def _bench(module_name='ppt', repeat=5, calls=200000):
+    """(1回の記録にかかる時間 [秒], デッキ1つの生成時間の中央値 [秒], 1デッキあたりのビルダー数) を返す
+
+    生成時間はばらつきが記録のコストより桁違いに大きいため、記録のコストは
+    何もしない関数を計測用ラッパー経由で呼んだときの差分として測る。
+    """
+    import importlib
+    module = importlib.import_module(module_name)
+    registry = Registry()
+    histogram = Histogram('bench_seconds', 'bench', ('builder',), registry=registry)
+
+    def noop(prs):
+        return prs
+    # BUILDER_SECONDS を汚さないよう、timed_builder() と同じラッパーをベンチ用のヒストグラムで作る
+    observe = histogram.labels('noop').observe
+    perf_counter = time.perf_counter
+
+    def wrapper(prs):
+        start = perf_counter()
+        try:
+            return noop(prs)
+        finally:
+            observe(perf_counter() - start)
+
+    def loop(function):
+        start = perf_counter()
+        for _ in range(calls):
+            function(None)
+        return perf_counter() - start
+
+    per_call = (loop(wrapper) - loop(noop)) / calls
+    timings = []
+    for _ in range(repeat):
+        start = perf_counter()
+        module.build_presentation()
+        timings.append(perf_counter() - start)
+    timings.sort()
+    return per_call, timings[len(timings) // 2], len(module.SLIDE_BUILDERS)
+
+
+def main():
+    import argparse
+    import importlib
+    import io
+    parser = argparse.ArgumentParser(description='生成処理のメトリクスを公開する')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('serve', help='デッキを生成しながら /metrics を公開する')
+    p.add_argument('--port', type=int, default=9100)
+    p.add_argument('--module', default='ppt')
+    p.add_argument('--repeat', type=int, default=0, help='生成する回数 (0 は無限)')
+    p = sub.add_parser('bench', help='計測によるオーバーヘッドを測る')
+    p.add_argument('--module', default='ppt')
+    p.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.command == 'bench':
+        per_call, build, builders = _bench(args.module, args.repeat)
+        print("記録1回: %.2f µs / デッキ生成: %.2f ms / オーバーヘッド: %.4f%%"
+              % (per_call * 1e6, build * 1000, per_call * builders / build * 100))
+        return
+    # python metrics.py で実行するとこのファイルは __main__ になり、saver が import する metrics とは
+    # 別のモジュールになる。カウンターを共有するため、公開と計測は import した metrics で行う
+    import metrics
+    from saver import save_presentation
+    module = importlib.import_module(args.module)
+    metrics.instrument_builders(module)
+    metrics.serve(args.port)
+    print("http://localhost:%d/metrics で公開しています" % args.port)
+    count = 0
+    try:
+        while not args.repeat or count < args.repeat:
+            save_presentation(module.build_presentation(), io.BytesIO())
+            count += 1
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
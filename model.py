@@ -0,0 +1,207 @@
+"""デッキの内容とレイアウトを表すコンパクトなオブジェクトモデル
+
+バッチ処理では段落・ラン・セル・図形が数百万個単位で生成されるため、各クラスは
+__slots__ でインスタンス辞書を持たないようにし、フォント名・色 (16進文字列)・
+フッターのように何度も現れる文字列は sys.intern で1つのオブジェクトを共有する。
+位置とサイズは EMU の整数で保持する。
+
+deck_reader は .pptx をこのモデルに読み戻し、ppt.build_from_model() はこのモデルから
+ppt.py のスタイルでデッキを組み立てる。ppt.py の各ビルダー (create_*) も本文を TextBlock、
+表を Table で組み立てて描画する。
+
+1項目・1セルあたりのメモリ使用量は次で確認できる:
+    python model.py bench
+"""
+import sys
+from sys import intern
+
+_EMPTY = intern('')
+# to_text() で markup.py の記号として解釈されないようにエスケープする文字
+_MARKUP_ESCAPES = str.maketrans({char: '\\' + char for char in '\\*{}[]'})
+
+
+def _intern(value):
+    return intern(value) if value is not None else None
+
+
+class Run:
+    """同じ書式が続くテキストの断片"""
+    __slots__ = ('text', 'size', 'bold', 'color', 'font')
+
+    def __init__(self, text, size=None, bold=False, color=None, font=None):
+        self.text = text
+        self.size = size
+        self.bold = bold
+        self.color = _intern(color)  # 'RRGGBB'
+        self.font = _intern(font)
+
+    def to_dict(self):
+        return {'text': self.text, 'size': self.size, 'bold': self.bold,
+                'color': self.color, 'font': self.font}
+
+
+class Paragraph:
+    """箇条書きの1項目 (level 0 は本文、1 は •、2 は -。heading は【】見出し)"""
+    __slots__ = ('level', 'heading', 'runs')
+
+    def __init__(self, runs=(), level=0, heading=False):
+        self.level = level
+        self.heading = heading
+        self.runs = list(runs)
+
+    @classmethod
+    def of(cls, text, level=0, heading=False):
+        return cls([Run(text)] if text else [], level, heading)
+
+    @property
+    def text(self):
+        if len(self.runs) == 1:
+            return self.runs[0].text
+        return _EMPTY.join(run.text for run in self.runs)
+
+    def to_text(self):
+        """apply_body_style() に渡す形式の文字列 ('【見出し】' / '• 項目' / '  - 項目')
+
+        本文の \\ * { } [ ] はバックスラッシュでエスケープし、マークアップとして解釈させない。
+        """
+        text = self.text.translate(_MARKUP_ESCAPES)
+        if self.heading or self.level == 0:
+            return text
+        if self.level == 1:
+            return '• ' + text
+        return '  - ' + text
+
+    def to_dict(self):
+        return {'level': self.level, 'text': self.text, 'heading': self.heading}
+
+
+class Box:
+    """位置とサイズ (EMU) を持つブロックの基底クラス"""
+    __slots__ = ('x', 'y', 'w', 'h')
+
+    def __init__(self, box=(0, 0, 0, 0)):
+        self.x, self.y, self.w, self.h = box
+
+    @property
+    def box(self):
+        return (self.x, self.y, self.w, self.h)
+
+
+class TextBlock(Box):
+    """テキストボックス1つ分の段落。kind は 'text' (1行の見出しなど) か 'bullets'"""
+    __slots__ = ('kind', 'paragraphs')
+
+    def __init__(self, paragraphs, box=(0, 0, 0, 0), kind=None):
+        super().__init__(box)
+        self.paragraphs = list(paragraphs)
+        if kind is None:
+            bulleted = len(self.paragraphs) > 1 or any(p.level or p.heading for p in self.paragraphs)
+            kind = 'bullets' if bulleted else 'text'
+        self.kind = intern(kind)
+
+    def to_text_list(self):
+        return [paragraph.to_text() for paragraph in self.paragraphs]
+
+    def to_dict(self):
+        return {'kind': self.kind, 'box': list(self.box),
+                'items': [paragraph.to_dict() for paragraph in self.paragraphs]}
+
+
+class Cell:
+    """表のセル (テキストと、あれば塗りの色)"""
+    __slots__ = ('text', 'fill')
+
+    def __init__(self, text, fill=None):
+        self.text = text
+        self.fill = _intern(fill)
+
+
+class Table(Box):
+    """表。rows はセルのリストのリストで、先頭行を見出しとして扱う"""
+    __slots__ = ('rows',)
+    kind = 'table'
+
+    def __init__(self, rows, box=(0, 0, 0, 0)):
+        super().__init__(box)
+        self.rows = [[cell if isinstance(cell, Cell) else Cell(cell) for cell in row] for row in rows]
+
+    @property
+    def shape(self):
+        return len(self.rows), max((len(row) for row in self.rows), default=0)
+
+    def to_dict(self):
+        return {'kind': 'table', 'box': list(self.box),
+                'rows': [[cell.text for cell in row] for row in self.rows]}
+
+
+class Slide:
+    """スライド1枚分の内容。blocks は上から順の TextBlock / Table"""
+    __slots__ = ('index', 'title', 'footer', 'page', 'total', 'blocks')
+
+    def __init__(self, title=None, blocks=(), footer=None, page=None, total=None, index=None):
+        self.index = index
+        self.title = title
+        self.footer = _intern(footer)
+        self.page = page
+        self.total = total
+        self.blocks = list(blocks)
+
+    def to_dict(self):
+        return {'index': self.index, 'title': self.title, 'footer': self.footer,
+                'page': self.page, 'total': self.total,
+                'blocks': [block.to_dict() for block in self.blocks]}
+
+
+class Deck:
+    """デッキ全体 (スライドサイズは EMU)"""
+    __slots__ = ('path', 'width', 'height', 'slides')
+
+    def __init__(self, slides=(), width=None, height=None, path=None):
+        self.path = path
+        self.width = width
+        self.height = height
+        self.slides = list(slides)
+
+    def to_dict(self):
+        return {'path': self.path, 'width': self.width, 'height': self.height,
+                'slides': [slide.to_dict() for slide in self.slides]}
+
+
+def _bench(count=20000):
+    """dict 表現と比べた1項目・1セルあたりのメモリ使用量 (バイト) を返す"""
+    import tracemalloc
+
+    def measure(factory):
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        objects = factory()
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+        del objects
+        return size / count
+
+    texts = ['Bullet text number %d' % i for i in range(count)]
+    colors = ['%06X' % (i % 8) for i in range(count)]
+    results = {}
+    results['bullet (model)'] = measure(lambda: [
+        Paragraph([Run(texts[i], 16.0, False, colors[i], 'Calibri')], 1) for i in range(count)])
+    results['bullet (dict)'] = measure(lambda: [
+        {'level': 1, 'heading': False, 'runs': [{'text': texts[i], 'size': 16.0, 'bold': False,
+                                                 'color': colors[i], 'font': 'Calibri'}]}
+        for i in range(count)])
+    results['cell (model)'] = measure(lambda: [Cell(texts[i], colors[i]) for i in range(count)])
+    results['cell (dict)'] = measure(lambda: [{'text': texts[i], 'fill': colors[i]} for i in range(count)])
+    return results
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] != 'bench':
+        print("使用方法: python model.py bench")
+        return
+    for name, size in _bench().items():
+        print("%-16s %7.1f bytes" % (name, size))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+"""スライドをワーカープロセスで並列に生成し、XML 断片から1つのデッキに組み立てる
+
+各ビルダー (create_* 関数) は自分のスライドしか触らないため、スライドごとに
+別プロセスで生成し、シリアライズしたスライド XML とリレーションだけを親に返す。
+親はそれを新しいパッケージに順番に差し込み、図形 ID・リレーション ID・パート名を振り直す。
+
+使い方:
+    python parallel_build.py --slides 200 --workers 8
+"""
+import importlib
+import inspect
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from lxml import etree
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+
+from shape_records import NS
+
+_R_ATTRS = ('{%s}id' % NS['r'], '{%s}embed' % NS['r'], '{%s}link' % NS['r'])
+
+# ワーカーごとに使い回すプレゼンテーション (モジュール名 -> Presentation)
+_worker_presentations = {}
+
+
+def _builder_args(builder, current_slide, total_slides):
+    """ppt.py 形式 (prs, current_slide, total_slides) と (prs) 形式の両方に対応する"""
+    if len(inspect.signature(builder).parameters) >= 3:
+        return (current_slide, total_slides)
+    return ()
+
+
+def new_presentation(module):
+    """モジュールの new_presentation() か、16:9 の空のプレゼンテーションを返す"""
+    if hasattr(module, 'new_presentation'):
+        return module.new_presentation()
+    from pptx import Presentation
+    from pptx.util import Inches
+    prs = Presentation()
+    prs.slide_width = Inches(13.33)
+    prs.slide_height = Inches(7.5)
+    return prs
+
+
+def _remove_slide(prs, slide):
+    sldIdLst = prs.slides._sldIdLst
+    for sldId in sldIdLst:
+        if prs.part.related_slide(sldId.rId) is slide:
+            prs.part.drop_rel(sldId.rId)
+            sldIdLst.remove(sldId)
+            return
+
+
+def build_fragment(module_name, builder_name, current_slide, total_slides):
+    """1枚のスライドを生成し (レイアウト番号, スライドXML, リレーション) を返す
+
+    リレーションは (rId, reltype, 外部参照 or None, 画像などのバイト列 or None) のタプル。
+    """
+    module = importlib.import_module(module_name)
+    prs = _worker_presentations.get(module_name)
+    if prs is None:
+        prs = _worker_presentations[module_name] = new_presentation(module)
+    builder = getattr(module, builder_name)
+    builder(prs, *_builder_args(builder, current_slide, total_slides))
+    slide = prs.slides[-1]
+    layout_index = list(prs.slide_layouts).index(slide.slide_layout)
+    rels = []
+    for rId, rel in slide.part.rels.items():
+        if rel.reltype == RT.SLIDE_LAYOUT:
+            continue
+        if rel.is_external:
+            rels.append((rId, rel.reltype, rel.target_ref, None))
+        elif rel.reltype == RT.IMAGE:
+            rels.append((rId, rel.reltype, None, rel.target_part.blob))
+        else:
+            raise ValueError("並列生成に未対応のリレーションです: %s" % rel.reltype)
+    xml = etree.tostring(slide._element)
+    # 次のタスクのためにスライドを取り除き、パート名を空けておく
+    _remove_slide(prs, slide)
+    return layout_index, xml, rels
+
+
+def _build_task(task):
+    return build_fragment(*task)
+
+
+def renumber_shape_ids(sld):
+    """スライド内の図形 ID (cNvPr@id) を出現順に 1 から振り直す"""
+    for shape_id, cNvPr in enumerate(sld.iter('{%s}cNvPr' % NS['p']), 1):
+        cNvPr.set('id', str(shape_id))
+
+
+def splice_fragment(prs, layout_index, xml, rels):
+    """XML 断片を prs の新しいスライドとして差し込み、そのスライドを返す"""
+    # Slides.add_slide() はレイアウトのプレースホルダーを複製するが、中身はすぐ置き換えるので
+    # パートの追加と sldId の登録だけを行う
+    rId, slide = prs.part.add_slide(prs.slide_layouts[layout_index])
+    prs.slides._sldIdLst.add_sldId(rId)
+    part = slide.part
+    fragment = etree.fromstring(xml)
+    rid_map = {}
+    for old_rid, reltype, target_ref, blob in rels:
+        if target_ref is not None:
+            rid_map[old_rid] = part.relate_to(target_ref, reltype, is_external=True)
+        else:
+            _, rid_map[old_rid] = part.get_or_add_image_part(io.BytesIO(blob))
+    if rid_map:
+        for el in fragment.iter():
+            for attr in _R_ATTRS:
+                old = el.get(attr)
+                if old in rid_map:
+                    el.set(attr, rid_map[old])
+    sld = slide._element
+    for child in list(sld):
+        sld.remove(child)
+    for child in list(fragment):
+        sld.append(child)
+    renumber_shape_ids(sld)
+    return slide
+
+
+def build_parallel(slides, workers=None, prs=None, module_name='ppt', chunksize=None):
+    """slides を並列に生成して1つのプレゼンテーションに組み立てる
+
+    slides はビルダー名 ('create_budget') または (モジュール名, ビルダー名) のリスト。
+    ページ番号はリスト内の位置から付け直される。
+    """
+    tasks = []
+    total = len(slides)
+    for i, spec in enumerate(slides, 1):
+        name, builder = (module_name, spec) if isinstance(spec, str) else spec
+        tasks.append((name, builder, i, total))
+    if prs is None:
+        prs = new_presentation(importlib.import_module(tasks[0][0] if tasks else module_name))
+    workers = workers or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for fragment in pool.map(_build_task, tasks, chunksize=chunksize):
+            splice_fragment(prs, *fragment)
+    return prs
+
+
+def build_sequential(slides, prs=None, module_name='ppt'):
+    """build_parallel と同じ入力を1プロセスで順番に生成する (比較用)"""
+    module = importlib.import_module(module_name)
+    if prs is None:
+        prs = new_presentation(module)
+    total = len(slides)
+    for i, spec in enumerate(slides, 1):
+        name, builder_name = (module_name, spec) if isinstance(spec, str) else spec
+        builder = getattr(importlib.import_module(name), builder_name)
+        builder(prs, *_builder_args(builder, i, total))
+    return prs
+
+
+def default_slides(module_name='ppt', count=None):
+    """モジュールの SLIDE_BUILDERS を count 枚になるまで繰り返したビルダー名のリスト"""
+    module = importlib.import_module(module_name)
+    names = [builder.__name__ for builder in module.SLIDE_BUILDERS]
+    if count is None:
+        return names
+    return [names[i % len(names)] for i in range(count)]
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='スライドを並列に生成する')
+    parser.add_argument('--module', default='ppt')
+    parser.add_argument('--slides', type=int, default=None)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--output', default='project_proposal_parallel.pptx')
+    parser.add_argument('--compare', action='store_true', help='逐次生成との所要時間を比較する')
+    args = parser.parse_args()
+    slides = default_slides(args.module, args.slides)
+    if args.compare:
+        start = time.perf_counter()
+        build_sequential(slides, module_name=args.module)
+        print("逐次生成: %d 枚 %.3f 秒" % (len(slides), time.perf_counter() - start))
+    start = time.perf_counter()
+    prs = build_parallel(slides, workers=args.workers, module_name=args.module)
+    print("並列生成: %d 枚 %.3f 秒" % (len(slides), time.perf_counter() - start))
+    prs.save(args.output)
+    print("プレゼンテーションが作成されました: %s" % args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,18 @@
 import os
 from pptx import Presentation
 from pptx.util import Inches, Pt
-from pptx.enum.text import PP_ALIGN
+from pptx.enum.text import PP_ALIGN, MSO_AUTO_SIZE
 from pptx.dml.color import RGBColor
 from pptx.enum.shapes import MSO_SHAPE
 from pptx.enum.dml import MSO_THEME_COLOR, MSO_FILL
 from pptx.table import _Cell
 
+from grid import DEFAULT_GRID, Cell, Columns, Fill, Fixed, Panel, Stack, Template, Text, solve
+from markup import add_runs, parse_line
+from model import Paragraph, TextBlock
+from model import Table as ModelTable
+from saver import presentation_bytes, save_presentation
+
 # 白と黒を基調としたシンプルなカラーパレット
 class ColorPalette:
     BACKGROUND = RGBColor(255, 255, 255)  # ホワイト
@@ -22,6 +28,19 @@ class ColorPalette:
     TABLE_ACCENT_BG = RGBColor(230, 230, 230)  # 薄いグレー（テーブル強調行用）
     TABLE_BORDER = RGBColor(180, 180, 180)  # ミディアムグレー（テーブル罫線用）
 
+# 提案書ごとに差し替える項目（mailmerge.py で宛先ごとに置き換えられる）
+PROPOSAL_FIELDS = {
+    'company': 'Your Company Name',
+    'date': 'March 30, 2025',
+    'contact_name': 'Taro Yamada',
+    'contact_email': 'yamada.taro@example.com',
+    'contact_phone': '03-1234-5678',
+    'initial_cost': '¥35M',
+    'annual_cost': '¥8M',
+    'annual_savings': '¥20M',
+    'payback_period': '18 months',
+}
+
 # モダンで洗練されたフォント設定
 TITLE_FONT = 'Lato'
 BODY_FONT = 'Lato'
@@ -35,26 +54,116 @@ CAPTION_SIZE = Pt(12)
 TABLE_HEADER_SIZE = Pt(14)
 TABLE_BODY_SIZE = Pt(12)
 
-def create_presentation():
+# スライドのレイアウト（grid.py の 12 カラムグリッドで、本文の高さから位置を計算する）
+# 表紙はヘッダー帯が無いので上から 2 インチの位置から並べる
+TITLE_LAYOUT = Template('title', Stack((
+    Columns((Cell(0, 6, Fixed('rule', Inches(0.05))),)),
+    Fixed('title', Inches(2)),
+    Text('details', BODY_SIZE),
+), gap=Inches(0.25)), DEFAULT_GRID._replace(top=Inches(2)))
+EXECUTIVE_SUMMARY_LAYOUT = Template('executive_summary', Columns((
+    Cell(0, 6, Text('summary', BODY_SIZE, Pt(6))),
+    Cell(6, 6, Stack((
+        Panel('info_panel', Text('info_title', SUBHEADING_SIZE, bold=True), padding=Inches(0.2)),
+        Text('info', BODY_SIZE, Pt(8)),
+    ), gap=Inches(0.3))),
+)))
+CURRENT_ANALYSIS_LAYOUT = Template('current_analysis', Stack((
+    Fixed('analysis_table', Inches(5)),
+    Fill(),
+)), DEFAULT_GRID._replace(top=Inches(1.5)))
+PROPOSAL_LAYOUT = Template('proposal', Stack((
+    Panel('features_panel', Stack((
+        Text('features_title', SUBHEADING_SIZE, bold=True),
+        Columns((
+            Cell(0, 6, Text('features_left', BODY_SIZE, Pt(6))),
+            Cell(6, 6, Text('features_right', BODY_SIZE, Pt(6))),
+        )),
+    ), gap=0), padding=Inches(0.15)),
+    Panel('functions_panel', Stack((
+        Text('functions_title', SUBHEADING_SIZE, bold=True),
+        Fixed('functions_table', Inches(1.6)),
+    ), gap=Inches(0.1)), padding=Inches(0.15)),
+)))
+SCHEDULE_LAYOUT = Template('schedule', Stack((
+    Fixed('schedule_table', Inches(5)),
+    Fill(),
+)), DEFAULT_GRID._replace(top=Inches(1.5)))
+# 体制図: スポンサー → PM → (技術リード / 業務担当)、下にコミュニケーション計画。
+# 矢印のセルは矢印を置く範囲で、矢印は create_team_structure() でセルの中央に置く
+TEAM_STRUCTURE_LAYOUT = Template('team_structure', Stack((
+    Columns((Cell(4, 4, Panel('sponsor_box', Text('sponsor', BODY_SIZE, bold=True))),)),
+    Columns((Cell(5, 2, Fixed('sponsor_arrow', Inches(0.35))),)),
+    Columns((Cell(4, 4, Panel('pm_box', Text('pm', BODY_SIZE, bold=True))),)),
+    Columns((
+        Cell(0, 4, Panel('tech_box', Text('tech', BODY_SIZE, bold=True))),
+        Cell(4, 2, Stack((Fixed('tech_arrow', Inches(0.7)), Fill()), gap=0)),
+        Cell(6, 2, Stack((Fixed('biz_arrow', Inches(0.7)), Fill()), gap=0)),
+        Cell(8, 4, Panel('biz_box', Text('biz', BODY_SIZE, bold=True))),
+    )),
+    Columns((Cell(2, 8, Panel('comm_box', Text('comm', BODY_SIZE, Pt(0)))),)),
+    Fill(),
+), gap=Inches(0.2)), DEFAULT_GRID._replace(top=Inches(1.5)))
+RISK_MANAGEMENT_LAYOUT = Template('risk_management', Stack((
+    Text('risk_title', SUBHEADING_SIZE, bold=True),
+    Fixed('risk_table', Inches(4.5)),
+    Fill(),
+), gap=Inches(0.1)))
+BUDGET_LAYOUT = Template('budget', Columns((
+    Cell(0, 6, Stack((
+        Text('initial_title', SUBHEADING_SIZE, bold=True),
+        Fixed('initial_table', Inches(2.5)),
+        Text('running_title', SUBHEADING_SIZE, bold=True),
+        Fixed('running_table', Inches(1.9)),
+    ), gap=Inches(0.1))),
+    Cell(6, 6, Panel('roi_panel', Stack((
+        Text('roi_title', SUBHEADING_SIZE, bold=True),
+        Text('roi', BODY_SIZE, Pt(4)),
+        Fill(),
+    ), gap=Inches(0.1)), padding=Inches(0.2))),
+)))
+SUCCESS_CRITERIA_LAYOUT = Template('success_criteria', Stack((
+    Text('kpi_title', SUBHEADING_SIZE, bold=True),
+    Fixed('kpi_table', Inches(2.5)),
+    Text('evaluation_title', SUBHEADING_SIZE, bold=True),
+    Text('evaluation', BODY_SIZE, Pt(8)),
+), gap=Inches(0.1)))
+# 結びのスライドはヘッダー帯が無いので上から 1.5 インチの位置から並べ、連絡先は下端に寄せる
+CONCLUSION_LAYOUT = Template('conclusion', Stack((
+    Text('title', HEADING_SIZE, bold=True),
+    Text('summary', BODY_SIZE, Pt(8)),
+    Text('next_steps', BODY_SIZE, Pt(8)),
+    Fill(),
+    Text('contact', BODY_SIZE),
+), gap=Inches(0.3)), DEFAULT_GRID._replace(top=Inches(1.5)))
+
+def new_presentation():
     prs = Presentation()
     prs.slide_width = Inches(13.33)
     prs.slide_height = Inches(7.5)
-    
-    total_slides = 10
-    
-    create_title_slide(prs, 1, total_slides)
-    create_executive_summary(prs, 2, total_slides)
-    create_current_analysis(prs, 3, total_slides)
-    create_proposal(prs, 4, total_slides)
-    create_schedule(prs, 5, total_slides)
-    create_team_structure(prs, 6, total_slides)
-    create_risk_management(prs, 7, total_slides)
-    create_budget(prs, 8, total_slides)
-    create_success_criteria(prs, 9, total_slides)
-    create_conclusion(prs, 10, total_slides)
-    
-    prs.save('project_proposal.pptx')
-    print("洗練されたプレゼンテーションが作成されました: project_proposal.pptx")
+    return prs
+
+def build_presentation(prs=None):
+    if prs is None:
+        prs = new_presentation()
+    total_slides = len(SLIDE_BUILDERS)
+    for current_slide, builder in enumerate(SLIDE_BUILDERS, 1):
+        builder(prs, current_slide, total_slides)
+    return prs
+
+def create_presentation(slides=None, output='project_proposal.pptx'):
+    # slides ('budget,conclusion' / '8-10' など) を指定するとそのスライドだけを生成する（compose.py）
+    if slides is None:
+        prs = build_presentation()
+    else:
+        from compose import build, select, slide_refs
+        prs = build(select(slide_refs(__name__), slides))
+    save_presentation(prs, output)
+    print("洗練されたプレゼンテーションが作成されました: %s" % output)
+
+def build_presentation_bytes(**options):
+    # ファイルに書き出さずに .pptx のバイト列を返す（options は saver.presentation_bytes() に渡す）
+    return presentation_bytes(build_presentation(), **options)
 
 def apply_title_style(title_shape, text, font_size=TITLE_SIZE, color=ColorPalette.TEXT, align=PP_ALIGN.LEFT, bold=True):
     title_shape.text = text
@@ -67,6 +176,9 @@ def apply_title_style(title_shape, text, font_size=TITLE_SIZE, color=ColorPalett
     title_run.font.color.rgb = color
 
 def apply_body_style(body_shape, text_list, font_size=BODY_SIZE, color=ColorPalette.TEXT, para_spacing=Pt(8)):
+    # text_list は model.TextBlock か、記法の行（'【見出し】' / '• 項目' / '  - 項目'）のリスト
+    if isinstance(text_list, TextBlock):
+        text_list = text_list.to_text_list()
     tf = body_shape.text_frame
     tf.clear()
     tf.word_wrap = True
@@ -75,42 +187,23 @@ def apply_body_style(body_shape, text_list, font_size=BODY_SIZE, color=ColorPale
     p = tf.paragraphs[0]
     
     for i, original_text in enumerate(text_list):
-        text_to_set = original_text
         if i > 0:
             p = tf.add_paragraph()
-        if not original_text.strip():
+        # 行頭の記号と行内の **太字**・{色:…}・[リンク](URL) を解析する (結果は文字列ごとにキャッシュ)
+        line = parse_line(original_text, ColorPalette)
+        if not line.spans:
             p.text = ""
             p.space_after = para_spacing
             continue
-        level = 0
-        space_before = Pt(0)
-        is_heading = False
-        if original_text.startswith('【') and original_text.endswith('】'):
-            level = 0
-            space_before = Pt(12) if i > 0 else Pt(0)
-            is_heading = True
-        elif original_text.startswith('• '):
-            level = 1
-            text_to_set = original_text[2:]
-        else:
-            level = 0
         
-        p.text = text_to_set
-        p.level = level
+        p.level = line.level
         p.space_after = para_spacing
-        p.space_before = space_before
+        p.space_before = Pt(12) if line.heading and i > 0 else Pt(0)
         
-        if p.runs:
-            run = p.runs[0]
-            run.font.name = BODY_FONT
-            run.font.size = font_size
-            if is_heading:
-                run.font.bold = True
-                run.font.size = font_size + Pt(2)
-                run.font.color.rgb = color
-            else:
-                run.font.bold = False
-                run.font.color.rgb = color
+        if line.heading:
+            add_runs(p, line.spans, BODY_FONT, font_size + Pt(2), color, bold=True, palette=ColorPalette)
+        else:
+            add_runs(p, line.spans, BODY_FONT, font_size, color, palette=ColorPalette)
 
 def add_shape(slide, shape_type, left, top, width, height, fill_color=None, line_color=None, line_width=Pt(0.75), shadow=False, transparency=0, gradient_to=None, text=None):
     shape = slide.shapes.add_shape(shape_type, left, top, width, height)
@@ -148,7 +241,7 @@ def add_shape(slide, shape_type, left, top, width, height, fill_color=None, line
         shape.text = text
         tf = shape.text_frame
         tf.word_wrap = True
-        tf.auto_size = True
+        tf.auto_size = MSO_AUTO_SIZE.SHAPE_TO_FIT_TEXT
         p = tf.paragraphs[0]
         p.alignment = PP_ALIGN.CENTER
         run = p.runs[0]
@@ -178,6 +271,10 @@ def create_table(slide, rows, cols, left, top, width, height):
     table = slide.shapes.add_table(rows, cols, left, top, width, height).table
     return table
 
+def centered(box, width):
+    # box の中で横方向の中央に置いた幅 width の (left, top, width, height)
+    return box.left + (box.width - width) // 2, box.top, width, box.height
+
 def set_table_cell_text(table, row, col, text, bold=False, alignment=PP_ALIGN.LEFT, font_size=None):
     cell = table.cell(row, col)
     para = cell.text_frame.paragraphs[0]
@@ -189,12 +286,25 @@ def set_table_cell_text(table, row, col, text, bold=False, alignment=PP_ALIGN.LE
         if font_size:
             run.font.size = font_size
 
+# 本文の段落と表は model のオブジェクト（deck_reader が読み戻すのと同じ形）で組み立てる。
+# apply_body_style() は TextBlock をそのまま受け取り、solve() には to_text_list() の行を渡す
+def heading(text):
+    return Paragraph.of(f"【{text}】", heading=True)
+
+def bullet(text, level=1):
+    return Paragraph.of(text, level)
+
+def blank():
+    return Paragraph.of("")
+
 def create_title_slide(prs, current_slide, total_slides):
     slide_layout = prs.slide_layouts[5]
     slide = prs.slides.add_slide(slide_layout)
     add_background(slide, prs)
-    header_line = add_shape(slide, MSO_SHAPE.RECTANGLE, Inches(1), Inches(2), Inches(6), Inches(0.05), fill_color=ColorPalette.ACCENT)
-    title_box = slide.shapes.add_textbox(Inches(1), Inches(2.3), Inches(10), Inches(2))
+    details = f"{PROPOSAL_FIELDS['date']} | {PROPOSAL_FIELDS['company']}"
+    layout = solve(TITLE_LAYOUT, {'details': [details]})
+    header_line = add_shape(slide, MSO_SHAPE.RECTANGLE, *layout['rule'], fill_color=ColorPalette.ACCENT)
+    title_box = slide.shapes.add_textbox(*layout['title'])
     title_tf = title_box.text_frame
     title_tf.word_wrap = True
     title_p = title_tf.paragraphs[0]
@@ -214,16 +324,16 @@ def create_title_slide(prs, current_slide, total_slides):
     subtitle_run.font.size = SUBHEADING_SIZE
     subtitle_run.font.bold = False
     subtitle_run.font.color.rgb = ColorPalette.TEXT
-    details_box = slide.shapes.add_textbox(Inches(1), Inches(5), Inches(11), Inches(0.5))
+    details_box = slide.shapes.add_textbox(*layout['details'])
     details_tf = details_box.text_frame
     details_p = details_tf.paragraphs[0]
-    details_p.text = "March 30, 2025 | Your Company Name"
+    details_p.text = details
     details_p.alignment = PP_ALIGN.LEFT
     details_run = details_p.runs[0]
     details_run.font.name = BODY_FONT
     details_run.font.size = BODY_SIZE
     details_run.font.color.rgb = ColorPalette.FOOTER_TEXT
-    add_footer(slide, prs, "Your Company Name | Project Proposal", current_slide, total_slides)
+    add_footer(slide, prs, f"{PROPOSAL_FIELDS['company']} | Project Proposal", current_slide, total_slides)
 
 def create_executive_summary(prs, current_slide, total_slides):
     slide_layout = prs.slide_layouts[5]
@@ -240,25 +350,38 @@ def create_executive_summary(prs, current_slide, total_slides):
     header_run.font.size = HEADING_SIZE
     header_run.font.bold = True
     header_run.font.color.rgb = ColorPalette.HEADING_TEXT
-    left_box = slide.shapes.add_textbox(Inches(1), Inches(1.3), Inches(5.5), Inches(4.5))
-    left_content = [
-        "【Project Objective】",
-        "• Revamp the current business system to improve operational efficiency by 30%.",
-        "• Build a foundation for digital transformation.",
-        "",
-        "【Key Proposal】",
-        "• Implement a cloud-based integrated management system.",
-        "• Utilize AI for business process automation and predictive analytics.",
-        "",
-        "【Expected Benefits】",
-        "• Annual cost savings of ¥20 million.",
-        "• Reduction in customer response time by 50%.",
-        "• Enable data-driven decision-making.",
-        "• Expand business opportunities through improved efficiency."
-    ]
-    apply_body_style(left_box, left_content, para_spacing=Pt(8))
-    summary_box = add_shape(slide, MSO_SHAPE.ROUNDED_RECTANGLE, Inches(7), Inches(1.5), Inches(5), Inches(1.2), fill_color=ColorPalette.LIGHT_ACCENT, line_color=ColorPalette.ACCENT, line_width=Pt(1))
-    summary_text = slide.shapes.add_textbox(Inches(7.2), Inches(1.6), Inches(4.6), Inches(1))
+    left_content = TextBlock([
+        heading("Project Objective"),
+        bullet("Revamp the current business system to improve operational efficiency by 30%."),
+        bullet("Build a foundation for digital transformation."),
+        blank(),
+        heading("Key Proposal"),
+        bullet("Implement a cloud-based integrated management system."),
+        bullet("Utilize AI for business process automation and predictive analytics."),
+        blank(),
+        heading("Expected Benefits"),
+        bullet(f"Annual cost savings of {PROPOSAL_FIELDS['annual_savings']}."),
+        bullet("Reduction in customer response time by 50%."),
+        bullet("Enable data-driven decision-making."),
+        bullet("Expand business opportunities through improved efficiency."),
+    ])
+    info_content = TextBlock([
+        heading("Project Timeline"),
+        bullet("Duration: 6 months (Apr 2025 - Sep 2025)"),
+        blank(),
+        heading("Budget Overview"),
+        bullet(f"Initial investment: {PROPOSAL_FIELDS['initial_cost']}"),
+        bullet(f"Annual operating cost: {PROPOSAL_FIELDS['annual_cost']}"),
+        blank(),
+        heading("Return on Investment"),
+        bullet(f"Payback period: {PROPOSAL_FIELDS['payback_period']}"),
+        bullet("Efficiency gains: 30% in target processes"),
+    ])
+    layout = solve(EXECUTIVE_SUMMARY_LAYOUT, {'summary': left_content.to_text_list(), 'info_title': ["Key Project Information"], 'info': info_content.to_text_list()})
+    left_box = slide.shapes.add_textbox(*layout['summary'])
+    apply_body_style(left_box, left_content, para_spacing=Pt(6))
+    summary_box = add_shape(slide, MSO_SHAPE.ROUNDED_RECTANGLE, *layout['info_panel'], fill_color=ColorPalette.LIGHT_ACCENT, line_color=ColorPalette.ACCENT, line_width=Pt(1))
+    summary_text = slide.shapes.add_textbox(*layout['info_title'])
     summary_tf = summary_text.text_frame
     summary_p = summary_tf.paragraphs[0]
     summary_p.text = "Key Project Information"
@@ -268,21 +391,9 @@ def create_executive_summary(prs, current_slide, total_slides):
     summary_run.font.size = SUBHEADING_SIZE
     summary_run.font.bold = True
     summary_run.font.color.rgb = ColorPalette.TEXT
-    info_box = slide.shapes.add_textbox(Inches(7), Inches(3), Inches(5), Inches(3))
-    info_content = [
-        "【Project Timeline】",
-        "• Duration: 6 months (Apr 2025 - Sep 2025)",
-        "",
-        "【Budget Overview】",
-        "• Initial investment: ¥35M",
-        "• Annual operating cost: ¥8M",
-        "",
-        "【Return on Investment】",
-        "• Payback period: 18 months",
-        "• Efficiency gains: 30% in target processes"
-    ]
+    info_box = slide.shapes.add_textbox(*layout['info'])
     apply_body_style(info_box, info_content, para_spacing=Pt(8))
-    add_footer(slide, prs, "Your Company Name | Project Proposal", current_slide, total_slides)
+    add_footer(slide, prs, f"{PROPOSAL_FIELDS['company']} | Project Proposal", current_slide, total_slides)
 
 def create_current_analysis(prs, current_slide, total_slides):
     slide_layout = prs.slide_layouts[5]
@@ -299,31 +410,25 @@ def create_current_analysis(prs, current_slide, total_slides):
     header_run.font.size = HEADING_SIZE
     header_run.font.bold = True
     header_run.font.color.rgb = ColorPalette.HEADING_TEXT
-    table_width = Inches(11)
-    table_height = Inches(5)
-    table = create_table(slide, rows=6, cols=2, left=Inches(1.15), top=Inches(1.5), width=table_width, height=table_height)
-    set_table_cell_text(table, 0, 0, "Current System Situation", bold=True, alignment=PP_ALIGN.CENTER)
-    set_table_cell_text(table, 0, 1, "Key Challenges to Address", bold=True, alignment=PP_ALIGN.CENTER)
-    current_situation = [
-        "Core system operational for 8 years.",
-        "Multiple systems lack integration, causing duplicate data entry.",
-        "Increased maintenance costs due to legacy systems.",
-        "Resource constraints in the on-premises environment.",
-        "Lack of mobile support restricts remote work."
-    ]
-    challenges = [
-        "Centralize data management and standardize business processes.",
-        "Eliminate redundant work through automated system integration.",
-        "Optimize costs by migrating to a cloud environment.",
-        "Establish a remote work environment with mobile support.",
-        "Enhance security and ensure compliance."
-    ]
-    for i, (current, challenge) in enumerate(zip(current_situation, challenges)):
-        set_table_cell_text(table, i+1, 0, current)
-        set_table_cell_text(table, i+1, 1, challenge)
+    analysis = ModelTable([
+        ["Current System Situation", "Key Challenges to Address"],
+        ["Core system operational for 8 years.", "Centralize data management and standardize business processes."],
+        ["Multiple systems lack integration, causing duplicate data entry.", "Eliminate redundant work through automated system integration."],
+        ["Increased maintenance costs due to legacy systems.", "Optimize costs by migrating to a cloud environment."],
+        ["Resource constraints in the on-premises environment.", "Establish a remote work environment with mobile support."],
+        ["Lack of mobile support restricts remote work.", "Enhance security and ensure compliance."]
+    ])
+    layout = solve(CURRENT_ANALYSIS_LAYOUT)
+    table = create_table(slide, *analysis.shape, *layout['analysis_table'])
+    for r, row in enumerate(analysis.rows):
+        for c, cell in enumerate(row):
+            if r == 0:
+                set_table_cell_text(table, r, c, cell.text, bold=True, alignment=PP_ALIGN.CENTER)
+            else:
+                set_table_cell_text(table, r, c, cell.text)
     for col in table.columns:
-        col.width = int(table_width / 2)
-    add_footer(slide, prs, "Your Company Name | Project Proposal", current_slide, total_slides)
+        col.width = int(layout['analysis_table'].width / 2)
+    add_footer(slide, prs, f"{PROPOSAL_FIELDS['company']} | Project Proposal", current_slide, total_slides)
 
 def create_proposal(prs, current_slide, total_slides):
     slide_layout = prs.slide_layouts[5]
@@ -340,8 +445,26 @@ def create_proposal(prs, current_slide, total_slides):
     header_run.font.size = HEADING_SIZE
     header_run.font.bold = True
     header_run.font.color.rgb = ColorPalette.HEADING_TEXT
-    features_box = add_shape(slide, MSO_SHAPE.ROUNDED_RECTANGLE, Inches(1), Inches(1.5), Inches(11.3), Inches(2.5), fill_color=ColorPalette.LIGHT_ACCENT, line_color=ColorPalette.ACCENT, line_width=Pt(1))
-    features_title = slide.shapes.add_textbox(Inches(1.2), Inches(1.6), Inches(10.9), Inches(0.5))
+    features_left_content = TextBlock([
+        bullet("Centralized management of all business data."),
+        bullet("Cloud-based platform accessible from anywhere."),
+        bullet("Intuitive user interface."),
+        bullet("Real-time data synchronization and analysis."),
+    ])
+    features_right_content = TextBlock([
+        bullet("Efficiency gains through business process automation."),
+        bullet("AI-powered predictive analytics and decision support."),
+        bullet("Flexible scalability and customization."),
+        bullet("Enhanced security and compliance features."),
+    ])
+    layout = solve(PROPOSAL_LAYOUT, {
+        'features_title': ["System Features"],
+        'features_left': features_left_content.to_text_list(),
+        'features_right': features_right_content.to_text_list(),
+        'functions_title': ["Key Functions"],
+    })
+    features_box = add_shape(slide, MSO_SHAPE.ROUNDED_RECTANGLE, *layout['features_panel'], fill_color=ColorPalette.LIGHT_ACCENT, line_color=ColorPalette.ACCENT, line_width=Pt(1))
+    features_title = slide.shapes.add_textbox(*layout['features_title'])
     features_tf = features_title.text_frame
     features_p = features_tf.paragraphs[0]
     features_p.text = "System Features"
@@ -350,24 +473,12 @@ def create_proposal(prs, current_slide, total_slides):
     features_run.font.size = SUBHEADING_SIZE
     features_run.font.bold = True
     features_run.font.color.rgb = ColorPalette.TEXT
-    features_left = slide.shapes.add_textbox(Inches(1.2), Inches(2.1), Inches(5.5), Inches(1.8))
-    features_left_content = [
-        "• Centralized management of all business data.",
-        "• Cloud-based platform accessible from anywhere.",
-        "• Intuitive user interface.",
-        "• Real-time data synchronization and analysis."
-    ]
+    features_left = slide.shapes.add_textbox(*layout['features_left'])
     apply_body_style(features_left, features_left_content, para_spacing=Pt(6))
-    features_right = slide.shapes.add_textbox(Inches(6.7), Inches(2.1), Inches(5.5), Inches(1.8))
-    features_right_content = [
-        "• Efficiency gains through business process automation.",
-        "• AI-powered predictive analytics and decision support.",
-        "• Flexible scalability and customization.",
-        "• Enhanced security and compliance features."
-    ]
+    features_right = slide.shapes.add_textbox(*layout['features_right'])
     apply_body_style(features_right, features_right_content, para_spacing=Pt(6))
-    functions_box = add_shape(slide, MSO_SHAPE.ROUNDED_RECTANGLE, Inches(1), Inches(4.2), Inches(11.3), Inches(2.5), fill_color=ColorPalette.LIGHT_ACCENT, line_color=ColorPalette.ACCENT, line_width=Pt(1))
-    functions_title = slide.shapes.add_textbox(Inches(1.2), Inches(4.3), Inches(10.9), Inches(0.5))
+    functions_box = add_shape(slide, MSO_SHAPE.ROUNDED_RECTANGLE, *layout['functions_panel'], fill_color=ColorPalette.LIGHT_ACCENT, line_color=ColorPalette.ACCENT, line_width=Pt(1))
+    functions_title = slide.shapes.add_textbox(*layout['functions_title'])
     functions_tf = functions_title.text_frame
     functions_p = functions_tf.paragraphs[0]
     functions_p.text = "Key Functions"
@@ -376,18 +487,16 @@ def create_proposal(prs, current_slide, total_slides):
     functions_run.font.size = SUBHEADING_SIZE
     functions_run.font.bold = True
     functions_run.font.color.rgb = ColorPalette.TEXT
-    table_width = Inches(10.9)
-    table_height = Inches(1.6)
-    functions_table = create_table(slide, rows=3, cols=2, left=Inches(1.2), top=Inches(4.8), width=table_width, height=table_height)
-    key_functions = [
+    key_functions = ModelTable([
         ["Customer & Case Management", "Real-time Dashboards"],
         ["Workflow Automation", "Role-based Access Control"],
         ["Mobile Application Support", "API Integration Hub"]
-    ]
-    for row_idx, (left_func, right_func) in enumerate(key_functions):
-        set_table_cell_text(functions_table, row_idx, 0, left_func)
-        set_table_cell_text(functions_table, row_idx, 1, right_func)
-    add_footer(slide, prs, "Your Company Name | Project Proposal", current_slide, total_slides)
+    ])
+    functions_table = create_table(slide, *key_functions.shape, *layout['functions_table'])
+    for r, row in enumerate(key_functions.rows):
+        for c, cell in enumerate(row):
+            set_table_cell_text(functions_table, r, c, cell.text)
+    add_footer(slide, prs, f"{PROPOSAL_FIELDS['company']} | Project Proposal", current_slide, total_slides)
 
 def create_schedule(prs, current_slide, total_slides):
     slide_layout = prs.slide_layouts[5]
@@ -404,25 +513,24 @@ def create_schedule(prs, current_slide, total_slides):
     header_run.font.size = HEADING_SIZE
     header_run.font.bold = True
     header_run.font.color.rgb = ColorPalette.HEADING_TEXT
-    table_width = Inches(11)
-    table_height = Inches(5)
-    schedule_table = create_table(slide, rows=5, cols=3, left=Inches(1.15), top=Inches(1.5), width=table_width, height=table_height)
-    set_table_cell_text(schedule_table, 0, 0, "Phase", bold=True, alignment=PP_ALIGN.CENTER)
-    set_table_cell_text(schedule_table, 0, 1, "Timeline", bold=True, alignment=PP_ALIGN.CENTER)
-    set_table_cell_text(schedule_table, 0, 2, "Key Activities", bold=True, alignment=PP_ALIGN.CENTER)
-    phases = [
+    phases = ModelTable([
+        ["Phase", "Timeline", "Key Activities"],
         ["Phase 1:\nRequirements & Design", "Apr-May 2025", "• Detailed business requirement analysis.\n• System design and architecture finalization.\n• Data migration planning."],
         ["Phase 2:\nDevelopment & Build", "May-Jul 2025", "• Platform setup and core feature development.\n• Implementation of external system integrations.\n• User interface development."],
         ["Phase 3:\nTesting & Migration", "Jul-Aug 2025", "• Unit and integration testing.\n• User acceptance testing (UAT).\n• Data migration and system switchover preparation."],
         ["Phase 4:\nGo-Live & Stabilization", "Sep 2025", "• Phased production rollout.\n• User training sessions.\n• Establishment of operational support."]
-    ]
-    for row_idx, (phase, timeline, activities) in enumerate(phases):
-        set_table_cell_text(schedule_table, row_idx + 1, 0, phase, bold=True)
-        set_table_cell_text(schedule_table, row_idx + 1, 1, timeline, alignment=PP_ALIGN.CENTER)
+    ])
+    layout = solve(SCHEDULE_LAYOUT)
+    schedule_table = create_table(slide, *phases.shape, *layout['schedule_table'])
+    for c, cell in enumerate(phases.rows[0]):
+        set_table_cell_text(schedule_table, 0, c, cell.text, bold=True, alignment=PP_ALIGN.CENTER)
+    for row_idx, (phase, timeline, activities) in enumerate(phases.rows[1:]):
+        set_table_cell_text(schedule_table, row_idx + 1, 0, phase.text, bold=True)
+        set_table_cell_text(schedule_table, row_idx + 1, 1, timeline.text, alignment=PP_ALIGN.CENTER)
         cell = schedule_table.cell(row_idx + 1, 2)
         tf_cell = cell.text_frame
         tf_cell.text = ""
-        for i, line in enumerate(activities.split("\n")):
+        for i, line in enumerate(activities.text.split("\n")):
             p = tf_cell.add_paragraph() if i > 0 else tf_cell.paragraphs[0]
             p.text = line
             p.space_after = Pt(3)
@@ -430,10 +538,10 @@ def create_schedule(prs, current_slide, total_slides):
             run.font.name = BODY_FONT
             run.font.size = TABLE_BODY_SIZE
             run.font.color.rgb = ColorPalette.TEXT
-    schedule_table.columns[0].width = Inches(2.5)
-    schedule_table.columns[1].width = Inches(2)
-    schedule_table.columns[2].width = Inches(6.5)
-    add_footer(slide, prs, "Your Company Name | Project Proposal", current_slide, total_slides)
+    # 列幅は 2.5 : 2 : 6.5 の比で表の幅に合わせる
+    for col, share in zip(schedule_table.columns, (2.5, 2, 6.5)):
+        col.width = int(layout['schedule_table'].width * share / 11)
+    add_footer(slide, prs, f"{PROPOSAL_FIELDS['company']} | Project Proposal", current_slide, total_slides)
 
 def create_team_structure(prs, current_slide, total_slides):
     slide_layout = prs.slide_layouts[5]
@@ -450,64 +558,78 @@ def create_team_structure(prs, current_slide, total_slides):
     header_run.font.size = HEADING_SIZE
     header_run.font.bold = True
     header_run.font.color.rgb = ColorPalette.HEADING_TEXT
-    sponsor_box = add_shape(slide, MSO_SHAPE.ROUNDED_RECTANGLE, Inches(5.15), Inches(1.7), Inches(3), Inches(1), fill_color=ColorPalette.HEADING_BG, line_color=ColorPalette.ACCENT, line_width=Pt(2))
-    sponsor_text = slide.shapes.add_textbox(Inches(5.25), Inches(1.9), Inches(2.8), Inches(0.7))
+    roles = {
+        'sponsor': "Project Sponsor:\nHead of Corporate Planning",
+        'pm': "Project Manager:\nIT Department Manager",
+        'tech': "Technical Lead:\nLead Systems Developer",
+        'biz': "Business Process Owners:\nRepresentatives from each dept.",
+        'comm': "Communication Plan: Weekly meetings (online), Monthly steering committee (in-person), Daily stand-ups for development team",
+    }
+    layout = solve(TEAM_STRUCTURE_LAYOUT, {name: [text] for name, text in roles.items()})
+    sponsor_box = add_shape(slide, MSO_SHAPE.ROUNDED_RECTANGLE, *layout['sponsor_box'], fill_color=ColorPalette.HEADING_BG, line_color=ColorPalette.ACCENT, line_width=Pt(2))
+    sponsor_text = slide.shapes.add_textbox(*layout['sponsor'])
     sponsor_tf = sponsor_text.text_frame
+    sponsor_tf.word_wrap = True
     sponsor_p = sponsor_tf.paragraphs[0]
-    sponsor_p.text = "Project Sponsor:\nHead of Corporate Planning"
+    sponsor_p.text = roles['sponsor']
     sponsor_p.alignment = PP_ALIGN.CENTER
-    sponsor_run = sponsor_p.runs[0]
-    sponsor_run.font.name = BODY_FONT
-    sponsor_run.font.size = BODY_SIZE
-    sponsor_run.font.bold = True
-    sponsor_run.font.color.rgb = ColorPalette.HEADING_TEXT
-    pm_box = add_shape(slide, MSO_SHAPE.ROUNDED_RECTANGLE, Inches(5.15), Inches(3.1), Inches(3), Inches(1), fill_color=ColorPalette.ACCENT, line_color=None)
-    pm_text = slide.shapes.add_textbox(Inches(5.25), Inches(3.3), Inches(2.8), Inches(0.7))
+    # 改行の後ろのランにも同じ書式を付ける
+    for sponsor_run in sponsor_p.runs:
+        sponsor_run.font.name = BODY_FONT
+        sponsor_run.font.size = BODY_SIZE
+        sponsor_run.font.bold = True
+        sponsor_run.font.color.rgb = ColorPalette.HEADING_TEXT
+    pm_box = add_shape(slide, MSO_SHAPE.ROUNDED_RECTANGLE, *layout['pm_box'], fill_color=ColorPalette.ACCENT, line_color=None)
+    pm_text = slide.shapes.add_textbox(*layout['pm'])
     pm_tf = pm_text.text_frame
+    pm_tf.word_wrap = True
     pm_p = pm_tf.paragraphs[0]
-    pm_p.text = "Project Manager:\nIT Department Manager"
+    pm_p.text = roles['pm']
     pm_p.alignment = PP_ALIGN.CENTER
-    pm_run = pm_p.runs[0]
-    pm_run.font.name = BODY_FONT
-    pm_run.font.size = BODY_SIZE
-    pm_run.font.bold = True
-    pm_run.font.color.rgb = ColorPalette.HEADING_TEXT
-    arrow1 = add_shape(slide, MSO_SHAPE.DOWN_ARROW, Inches(6.4), Inches(2.72), Inches(0.5), Inches(0.35), fill_color=ColorPalette.ACCENT)
-    tech_box = add_shape(slide, MSO_SHAPE.ROUNDED_RECTANGLE, Inches(1.5), Inches(4.5), Inches(3), Inches(1), fill_color=ColorPalette.LIGHT_ACCENT, line_color=ColorPalette.ACCENT, line_width=Pt(1))
-    tech_text = slide.shapes.add_textbox(Inches(1.6), Inches(4.7), Inches(2.8), Inches(0.7))
+    for pm_run in pm_p.runs:
+        pm_run.font.name = BODY_FONT
+        pm_run.font.size = BODY_SIZE
+        pm_run.font.bold = True
+        pm_run.font.color.rgb = ColorPalette.HEADING_TEXT
+    arrow1 = add_shape(slide, MSO_SHAPE.DOWN_ARROW, *centered(layout['sponsor_arrow'], Inches(0.5)), fill_color=ColorPalette.ACCENT)
+    tech_box = add_shape(slide, MSO_SHAPE.ROUNDED_RECTANGLE, *layout['tech_box'], fill_color=ColorPalette.LIGHT_ACCENT, line_color=ColorPalette.ACCENT, line_width=Pt(1))
+    tech_text = slide.shapes.add_textbox(*layout['tech'])
     tech_tf = tech_text.text_frame
+    tech_tf.word_wrap = True
     tech_p = tech_tf.paragraphs[0]
-    tech_p.text = "Technical Lead:\nLead Systems Developer"
+    tech_p.text = roles['tech']
     tech_p.alignment = PP_ALIGN.CENTER
-    tech_run = tech_p.runs[0]
-    tech_run.font.name = BODY_FONT
-    tech_run.font.size = BODY_SIZE
-    tech_run.font.bold = True
-    tech_run.font.color.rgb = ColorPalette.TEXT
-    biz_box = add_shape(slide, MSO_SHAPE.ROUNDED_RECTANGLE, Inches(8.8), Inches(4.5), Inches(3), Inches(1), fill_color=ColorPalette.LIGHT_ACCENT, line_color=ColorPalette.ACCENT, line_width=Pt(1))
-    biz_text = slide.shapes.add_textbox(Inches(8.9), Inches(4.7), Inches(2.8), Inches(0.7))
+    for tech_run in tech_p.runs:
+        tech_run.font.name = BODY_FONT
+        tech_run.font.size = BODY_SIZE
+        tech_run.font.bold = True
+        tech_run.font.color.rgb = ColorPalette.TEXT
+    biz_box = add_shape(slide, MSO_SHAPE.ROUNDED_RECTANGLE, *layout['biz_box'], fill_color=ColorPalette.LIGHT_ACCENT, line_color=ColorPalette.ACCENT, line_width=Pt(1))
+    biz_text = slide.shapes.add_textbox(*layout['biz'])
     biz_tf = biz_text.text_frame
+    biz_tf.word_wrap = True
     biz_p = biz_tf.paragraphs[0]
-    biz_p.text = "Business Process Owners:\nRepresentatives from each dept."
+    biz_p.text = roles['biz']
     biz_p.alignment = PP_ALIGN.CENTER
-    biz_run = biz_p.runs[0]
-    biz_run.font.name = BODY_FONT
-    biz_run.font.size = BODY_SIZE
-    biz_run.font.bold = True
-    biz_run.font.color.rgb = ColorPalette.TEXT
-    arrow2 = add_shape(slide, MSO_SHAPE.LEFT_UP_ARROW, Inches(5.15), Inches(4), Inches(1), Inches(0.7), fill_color=ColorPalette.ACCENT)
-    arrow3 = add_shape(slide, MSO_SHAPE.RIGHT_ARROW, Inches(7.15), Inches(4), Inches(1), Inches(0.7), fill_color=ColorPalette.ACCENT)
-    comm_box = add_shape(slide, MSO_SHAPE.ROUNDED_RECTANGLE, Inches(3.65), Inches(5.8), Inches(6), Inches(1), fill_color=ColorPalette.LIGHT_ACCENT, line_color=ColorPalette.ACCENT, line_width=Pt(1))
-    comm_text = slide.shapes.add_textbox(Inches(3.75), Inches(5.9), Inches(5.8), Inches(0.9))
+    for biz_run in biz_p.runs:
+        biz_run.font.name = BODY_FONT
+        biz_run.font.size = BODY_SIZE
+        biz_run.font.bold = True
+        biz_run.font.color.rgb = ColorPalette.TEXT
+    arrow2 = add_shape(slide, MSO_SHAPE.LEFT_UP_ARROW, *centered(layout['tech_arrow'], Inches(1)), fill_color=ColorPalette.ACCENT)
+    arrow3 = add_shape(slide, MSO_SHAPE.RIGHT_ARROW, *centered(layout['biz_arrow'], Inches(1)), fill_color=ColorPalette.ACCENT)
+    comm_box = add_shape(slide, MSO_SHAPE.ROUNDED_RECTANGLE, *layout['comm_box'], fill_color=ColorPalette.LIGHT_ACCENT, line_color=ColorPalette.ACCENT, line_width=Pt(1))
+    comm_text = slide.shapes.add_textbox(*layout['comm'])
     comm_tf = comm_text.text_frame
+    comm_tf.word_wrap = True
     comm_p = comm_tf.paragraphs[0]
-    comm_p.text = "Communication Plan: Weekly meetings (online), Monthly steering committee (in-person), Daily stand-ups for development team"
+    comm_p.text = roles['comm']
     comm_p.alignment = PP_ALIGN.CENTER
     comm_run = comm_p.runs[0]
     comm_run.font.name = BODY_FONT
     comm_run.font.size = BODY_SIZE
     comm_run.font.color.rgb = ColorPalette.TEXT
-    add_footer(slide, prs, "Your Company Name | Project Proposal", current_slide, total_slides)
+    add_footer(slide, prs, f"{PROPOSAL_FIELDS['company']} | Project Proposal", current_slide, total_slides)
 
 def create_risk_management(prs, current_slide, total_slides):
     slide_layout = prs.slide_layouts[5]
@@ -524,7 +646,8 @@ def create_risk_management(prs, current_slide, total_slides):
     header_run.font.size = HEADING_SIZE
     header_run.font.bold = True
     header_run.font.color.rgb = ColorPalette.HEADING_TEXT
-    subtitle_box = slide.shapes.add_textbox(Inches(1.15), Inches(1.3), Inches(11), Inches(0.5))
+    layout = solve(RISK_MANAGEMENT_LAYOUT, {'risk_title': ["Key Risks & Mitigation Strategies"]})
+    subtitle_box = slide.shapes.add_textbox(*layout['risk_title'])
     subtitle_tf = subtitle_box.text_frame
     subtitle_p = subtitle_tf.paragraphs[0]
     subtitle_p.text = "Key Risks & Mitigation Strategies"
@@ -533,24 +656,25 @@ def create_risk_management(prs, current_slide, total_slides):
     subtitle_run.font.size = SUBHEADING_SIZE
     subtitle_run.font.bold = True
     subtitle_run.font.color.rgb = ColorPalette.TEXT
-    table_width = Inches(11)
-    table_height = Inches(4.5)
-    risk_table = create_table(slide, rows=6, cols=2, left=Inches(1.15), top=Inches(1.9), width=table_width, height=table_height)
-    set_table_cell_text(risk_table, 0, 0, "Risk", bold=True, alignment=PP_ALIGN.CENTER)
-    set_table_cell_text(risk_table, 0, 1, "Mitigation Strategy", bold=True, alignment=PP_ALIGN.CENTER)
-    risks = [
+    risks = ModelTable([
+        ["Risk", "Mitigation Strategy"],
         ["Scope Creep / Changes Leading to Delays", "Agile methodology, regular requirement reviews, strict change control."],
         ["Data Loss / Inconsistency During Migration", "Pre-migration data cleansing, phased approach, dual validation."],
         ["Low User Adoption", "Early user involvement, comprehensive training, continuous feedback loop."],
         ["Integration Issues with Existing Systems", "Detailed interface design, phased integration testing, fallback mechanisms."],
         ["Security Incidents", "Security design reviews, vulnerability assessments, incident response plan."]
-    ]
-    for row_idx, (risk, mitigation) in enumerate(risks):
-        set_table_cell_text(risk_table, row_idx + 1, 0, risk, bold=True)
-        set_table_cell_text(risk_table, row_idx + 1, 1, mitigation)
-    risk_table.columns[0].width = Inches(4)
-    risk_table.columns[1].width = Inches(7)
-    add_footer(slide, prs, "Your Company Name | Project Proposal", current_slide, total_slides)
+    ])
+    risk_table = create_table(slide, *risks.shape, *layout['risk_table'])
+    for r, row in enumerate(risks.rows):
+        for c, cell in enumerate(row):
+            if r == 0:
+                set_table_cell_text(risk_table, r, c, cell.text, bold=True, alignment=PP_ALIGN.CENTER)
+            else:
+                set_table_cell_text(risk_table, r, c, cell.text, bold=(c == 0))
+    # 列幅は 4 : 7 の比で表の幅に合わせる
+    for col, share in zip(risk_table.columns, (4, 7)):
+        col.width = int(layout['risk_table'].width * share / 11)
+    add_footer(slide, prs, f"{PROPOSAL_FIELDS['company']} | Project Proposal", current_slide, total_slides)
 
 def create_budget(prs, current_slide, total_slides):
     slide_layout = prs.slide_layouts[5]
@@ -567,7 +691,29 @@ def create_budget(prs, current_slide, total_slides):
     header_run.font.size = HEADING_SIZE
     header_run.font.bold = True
     header_run.font.color.rgb = ColorPalette.HEADING_TEXT
-    subtitle1 = slide.shapes.add_textbox(Inches(1.15), Inches(1.3), Inches(5.3), Inches(0.4))
+    roi_text = TextBlock([
+        heading("Cost Savings"),
+        bullet("Labor cost reduction (efficiency): ¥12M/year"),
+        bullet("System consolidation savings: ¥8M/year"),
+        bullet(f"Total annual savings: {PROPOSAL_FIELDS['annual_savings']}/year"),
+        blank(),
+        heading("Qualitative Benefits"),
+        bullet("Faster decision-making"),
+        bullet("Improved customer satisfaction"),
+        bullet("Strategic advantage through data utilization"),
+        blank(),
+        heading("Payback Period"),
+        bullet(f"Initial investment: {PROPOSAL_FIELDS['initial_cost']}"),
+        bullet(f"Annual savings: {PROPOSAL_FIELDS['annual_savings']}"),
+        bullet(f"Payback period: ~{PROPOSAL_FIELDS['payback_period']}"),
+    ])
+    layout = solve(BUDGET_LAYOUT, {
+        'initial_title': ["Initial Investment"],
+        'running_title': ["Annual Running Costs"],
+        'roi_title': ["Return on Investment (ROI)"],
+        'roi': roi_text.to_text_list(),
+    })
+    subtitle1 = slide.shapes.add_textbox(*layout['initial_title'])
     subtitle1_tf = subtitle1.text_frame
     subtitle1_p = subtitle1_tf.paragraphs[0]
     subtitle1_p.text = "Initial Investment"
@@ -576,19 +722,20 @@ def create_budget(prs, current_slide, total_slides):
     subtitle1_run.font.size = SUBHEADING_SIZE
     subtitle1_run.font.bold = True
     subtitle1_run.font.color.rgb = ColorPalette.TEXT
-    initial_table = create_table(slide, rows=6, cols=2, left=Inches(1.15), top=Inches(1.8), width=Inches(5.3), height=Inches(2.5))
-    initial_items = [
+    initial_items = ModelTable([
         ["Item", "Cost"],
         ["Design & Development", "¥20M"],
         ["Hardware & Cloud Setup", "¥5M"],
         ["Data Migration & Testing", "¥6M"],
         ["Training & Support", "¥4M"],
-        ["Total Initial Cost", "¥35M"]
-    ]
-    for row_idx, (item, cost) in enumerate(initial_items):
-        set_table_cell_text(initial_table, row_idx, 0, item, bold=(row_idx==0 or row_idx==5))
-        set_table_cell_text(initial_table, row_idx, 1, cost, bold=(row_idx==0 or row_idx==5), alignment=PP_ALIGN.RIGHT)
-    subtitle2 = slide.shapes.add_textbox(Inches(1.15), Inches(4.4), Inches(5.3), Inches(0.4))
+        ["Total Initial Cost", PROPOSAL_FIELDS['initial_cost']]
+    ])
+    initial_table = create_table(slide, *initial_items.shape, *layout['initial_table'])
+    last_row = len(initial_items.rows) - 1
+    for row_idx, (item, cost) in enumerate(initial_items.rows):
+        set_table_cell_text(initial_table, row_idx, 0, item.text, bold=(row_idx==0 or row_idx==last_row))
+        set_table_cell_text(initial_table, row_idx, 1, cost.text, bold=(row_idx==0 or row_idx==last_row), alignment=PP_ALIGN.RIGHT)
+    subtitle2 = slide.shapes.add_textbox(*layout['running_title'])
     subtitle2_tf = subtitle2.text_frame
     subtitle2_p = subtitle2_tf.paragraphs[0]
     subtitle2_p.text = "Annual Running Costs"
@@ -597,19 +744,20 @@ def create_budget(prs, current_slide, total_slides):
     subtitle2_run.font.size = SUBHEADING_SIZE
     subtitle2_run.font.bold = True
     subtitle2_run.font.color.rgb = ColorPalette.TEXT
-    running_table = create_table(slide, rows=5, cols=2, left=Inches(1.15), top=Inches(4.9), width=Inches(5.3), height=Inches(1.9))
-    running_items = [
+    running_items = ModelTable([
         ["Item", "Cost"],
         ["Cloud Infrastructure", "¥3M"],
         ["Licensing Fees", "¥2M"],
         ["Maintenance & Support", "¥3M"],
-        ["Total Annual Cost", "¥8M"]
-    ]
-    for row_idx, (item, cost) in enumerate(running_items):
-        set_table_cell_text(running_table, row_idx, 0, item, bold=(row_idx==0 or row_idx==4))
-        set_table_cell_text(running_table, row_idx, 1, cost, bold=(row_idx==0 or row_idx==4), alignment=PP_ALIGN.RIGHT)
-    roi_box = add_shape(slide, MSO_SHAPE.ROUNDED_RECTANGLE, Inches(6.95), Inches(1.8), Inches(5.3), Inches(5), fill_color=ColorPalette.LIGHT_ACCENT, line_color=ColorPalette.ACCENT, line_width=Pt(1))
-    roi_title = slide.shapes.add_textbox(Inches(7.15), Inches(1.9), Inches(5), Inches(0.4))
+        ["Total Annual Cost", PROPOSAL_FIELDS['annual_cost']]
+    ])
+    running_table = create_table(slide, *running_items.shape, *layout['running_table'])
+    last_row = len(running_items.rows) - 1
+    for row_idx, (item, cost) in enumerate(running_items.rows):
+        set_table_cell_text(running_table, row_idx, 0, item.text, bold=(row_idx==0 or row_idx==last_row))
+        set_table_cell_text(running_table, row_idx, 1, cost.text, bold=(row_idx==0 or row_idx==last_row), alignment=PP_ALIGN.RIGHT)
+    roi_box = add_shape(slide, MSO_SHAPE.ROUNDED_RECTANGLE, *layout['roi_panel'], fill_color=ColorPalette.LIGHT_ACCENT, line_color=ColorPalette.ACCENT, line_width=Pt(1))
+    roi_title = slide.shapes.add_textbox(*layout['roi_title'])
     roi_tf = roi_title.text_frame
     roi_p = roi_tf.paragraphs[0]
     roi_p.text = "Return on Investment (ROI)"
@@ -619,25 +767,9 @@ def create_budget(prs, current_slide, total_slides):
     roi_run.font.size = SUBHEADING_SIZE
     roi_run.font.bold = True
     roi_run.font.color.rgb = ColorPalette.TEXT
-    roi_content = slide.shapes.add_textbox(Inches(7.15), Inches(2.5), Inches(5), Inches(4))
-    roi_text = [
-        "【Cost Savings】",
-        "• Labor cost reduction (efficiency): ¥12M/year",
-        "• System consolidation savings: ¥8M/year",
-        "• Total annual savings: ¥20M/year",
-        "",
-        "【Qualitative Benefits】",
-        "• Faster decision-making",
-        "• Improved customer satisfaction",
-        "• Strategic advantage through data utilization",
-        "",
-        "【Payback Period】",
-        "• Initial investment: ¥35M",
-        "• Annual savings: ¥20M",
-        "• Payback period: ~18 months"
-    ]
-    apply_body_style(roi_content, roi_text, para_spacing=Pt(8))
-    add_footer(slide, prs, "Your Company Name | Project Proposal", current_slide, total_slides)
+    roi_content = slide.shapes.add_textbox(*layout['roi'])
+    apply_body_style(roi_content, roi_text, para_spacing=Pt(4))
+    add_footer(slide, prs, f"{PROPOSAL_FIELDS['company']} | Project Proposal", current_slide, total_slides)
 
 def create_success_criteria(prs, current_slide, total_slides):
     slide_layout = prs.slide_layouts[5]
@@ -654,7 +786,18 @@ def create_success_criteria(prs, current_slide, total_slides):
     header_run.font.size = HEADING_SIZE
     header_run.font.bold = True
     header_run.font.color.rgb = ColorPalette.HEADING_TEXT
-    subtitle1 = slide.shapes.add_textbox(Inches(1.15), Inches(1.3), Inches(11), Inches(0.4))
+    criteria_points = TextBlock([
+        bullet("Quarterly performance measurement reports."),
+        bullet("Monthly user satisfaction surveys."),
+        bullet("Regular tracking of business efficiency metrics."),
+        bullet("Continuous monitoring via real-time dashboards."),
+    ])
+    layout = solve(SUCCESS_CRITERIA_LAYOUT, {
+        'kpi_title': ["Key Performance Indicators (KPIs)"],
+        'evaluation_title': ["Evaluation Method"],
+        'evaluation': criteria_points.to_text_list(),
+    })
+    subtitle1 = slide.shapes.add_textbox(*layout['kpi_title'])
     subtitle1_tf = subtitle1.text_frame
     subtitle1_p = subtitle1_tf.paragraphs[0]
     subtitle1_p.text = "Key Performance Indicators (KPIs)"
@@ -663,33 +806,27 @@ def create_success_criteria(prs, current_slide, total_slides):
     subtitle1_run.font.size = SUBHEADING_SIZE
     subtitle1_run.font.bold = True
     subtitle1_run.font.color.rgb = ColorPalette.TEXT
-    kpi_table = create_table(slide, rows=5, cols=4, left=Inches(1.15), top=Inches(1.8), width=Inches(11), height=Inches(2.5))
-    set_table_cell_text(kpi_table, 0, 0, "System Performance Metric", bold=True, alignment=PP_ALIGN.CENTER)
-    set_table_cell_text(kpi_table, 0, 1, "Target", bold=True, alignment=PP_ALIGN.CENTER)
-    set_table_cell_text(kpi_table, 0, 2, "Business Impact Metric", bold=True, alignment=PP_ALIGN.CENTER)
-    set_table_cell_text(kpi_table, 0, 3, "Target", bold=True, alignment=PP_ALIGN.CENTER)
-    system_metrics = [
-        ["Response Time", "< 2 seconds (peak)"],
-        ["Availability", "> 99.9%"],
-        ["Concurrent Users", "Up to 300"],
-        ["Backup Recovery Time", "< 4 hours"]
-    ]
-    business_metrics = [
-        ["Process Time Reduction", "30%"],
-        ["Customer Response Time", "50% improvement"],
-        ["Data Entry Error Reduction", "90%"],
-        ["User Satisfaction", "> 80%"]
-    ]
-    for row_idx in range(4):
-        set_table_cell_text(kpi_table, row_idx + 1, 0, system_metrics[row_idx][0])
-        set_table_cell_text(kpi_table, row_idx + 1, 1, system_metrics[row_idx][1], alignment=PP_ALIGN.CENTER)
-        set_table_cell_text(kpi_table, row_idx + 1, 2, business_metrics[row_idx][0])
-        set_table_cell_text(kpi_table, row_idx + 1, 3, business_metrics[row_idx][1], alignment=PP_ALIGN.CENTER)
-    kpi_table.columns[0].width = Inches(3.5)
-    kpi_table.columns[1].width = Inches(2)
-    kpi_table.columns[2].width = Inches(3.5)
-    kpi_table.columns[3].width = Inches(2)
-    subtitle2 = slide.shapes.add_textbox(Inches(1.15), Inches(4.5), Inches(11), Inches(0.4))
+    kpis = ModelTable([
+        ["System Performance Metric", "Target", "Business Impact Metric", "Target"],
+        ["Response Time", "< 2 seconds (peak)", "Process Time Reduction", "30%"],
+        ["Availability", "> 99.9%", "Customer Response Time", "50% improvement"],
+        ["Concurrent Users", "Up to 300", "Data Entry Error Reduction", "90%"],
+        ["Backup Recovery Time", "< 4 hours", "User Satisfaction", "> 80%"]
+    ])
+    kpi_table = create_table(slide, *kpis.shape, *layout['kpi_table'])
+    for r, row in enumerate(kpis.rows):
+        for c, cell in enumerate(row):
+            if r == 0:
+                set_table_cell_text(kpi_table, r, c, cell.text, bold=True, alignment=PP_ALIGN.CENTER)
+            elif c % 2:
+                # 目標値の列は中央揃え
+                set_table_cell_text(kpi_table, r, c, cell.text, alignment=PP_ALIGN.CENTER)
+            else:
+                set_table_cell_text(kpi_table, r, c, cell.text)
+    # 列幅は 3.5 : 2 : 3.5 : 2 の比で表の幅に合わせる
+    for col, share in zip(kpi_table.columns, (3.5, 2, 3.5, 2)):
+        col.width = int(layout['kpi_table'].width * share / 11)
+    subtitle2 = slide.shapes.add_textbox(*layout['evaluation_title'])
     subtitle2_tf = subtitle2.text_frame
     subtitle2_p = subtitle2_tf.paragraphs[0]
     subtitle2_p.text = "Evaluation Method"
@@ -698,21 +835,32 @@ def create_success_criteria(prs, current_slide, total_slides):
     subtitle2_run.font.size = SUBHEADING_SIZE
     subtitle2_run.font.bold = True
     subtitle2_run.font.color.rgb = ColorPalette.TEXT
-    criteria_box = slide.shapes.add_textbox(Inches(1), Inches(5), Inches(11), Inches(2))
-    criteria_points = [
-        "• Quarterly performance measurement reports.",
-        "• Monthly user satisfaction surveys.",
-        "• Regular tracking of business efficiency metrics.",
-        "• Continuous monitoring via real-time dashboards."
-    ]
+    criteria_box = slide.shapes.add_textbox(*layout['evaluation'])
     apply_body_style(criteria_box, criteria_points, para_spacing=Pt(8))
-    add_footer(slide, prs, "Your Company Name | Project Proposal", current_slide, total_slides)
+    add_footer(slide, prs, f"{PROPOSAL_FIELDS['company']} | Project Proposal", current_slide, total_slides)
 
 def create_conclusion(prs, current_slide, total_slides):
     slide_layout = prs.slide_layouts[5]
     slide = prs.slides.add_slide(slide_layout)
     add_background(slide, prs, color=ColorPalette.HEADING_BG)
-    title_box = slide.shapes.add_textbox(Inches(1), Inches(1.5), Inches(11), Inches(1))
+    summary_text = TextBlock([
+        bullet("Implement cloud-based system for 30% efficiency gain."),
+        bullet("Phased 6-month rollout minimizes business disruption."),
+        bullet(f"Investment: {PROPOSAL_FIELDS['initial_cost']} initial, {PROPOSAL_FIELDS['annual_cost']} annual. ROI within {PROPOSAL_FIELDS['payback_period']}."),
+    ])
+    next_text = TextBlock([
+        bullet("Final review and approval of proposal (within 1 week)."),
+        bullet("Project kick-off meeting (within 2 weeks of approval)."),
+        bullet("Commence detailed requirements definition (First week of April)."),
+    ])
+    contact = f"Contact: {PROPOSAL_FIELDS['contact_name']} | {PROPOSAL_FIELDS['contact_email']} | {PROPOSAL_FIELDS['contact_phone']}"
+    layout = solve(CONCLUSION_LAYOUT, {
+        'title': ["Conclusion & Next Steps"],
+        'summary': summary_text.to_text_list(),
+        'next_steps': next_text.to_text_list(),
+        'contact': [contact],
+    })
+    title_box = slide.shapes.add_textbox(*layout['title'])
     title_tf = title_box.text_frame
     title_p = title_tf.paragraphs[0]
     title_p.text = "Conclusion & Next Steps"
@@ -722,30 +870,82 @@ def create_conclusion(prs, current_slide, total_slides):
     title_run.font.size = HEADING_SIZE
     title_run.font.bold = True
     title_run.font.color.rgb = ColorPalette.HEADING_TEXT
-    summary_box = slide.shapes.add_textbox(Inches(1), Inches(2.8), Inches(11), Inches(1.5))
-    summary_text = [
-        "• Implement cloud-based system for 30% efficiency gain.",
-        "• Phased 6-month rollout minimizes business disruption.",
-        "• Investment: ¥35M initial, ¥8M annual. ROI within 18 months."
-    ]
+    summary_box = slide.shapes.add_textbox(*layout['summary'])
     apply_body_style(summary_box, summary_text, color=ColorPalette.HEADING_TEXT, para_spacing=Pt(8))
-    next_steps_box = slide.shapes.add_textbox(Inches(1), Inches(4.5), Inches(11), Inches(1.5))
-    next_text = [
-        "• Final review and approval of proposal (within 1 week).",
-        "• Project kick-off meeting (within 2 weeks of approval).",
-        "• Commence detailed requirements definition (First week of April)."
-    ]
+    next_steps_box = slide.shapes.add_textbox(*layout['next_steps'])
     apply_body_style(next_steps_box, next_text, color=ColorPalette.HEADING_TEXT, para_spacing=Pt(8))
-    contact_box = slide.shapes.add_textbox(Inches(1), Inches(6.5), Inches(11), Inches(0.5))
+    contact_box = slide.shapes.add_textbox(*layout['contact'])
     contact_tf = contact_box.text_frame
     contact_p = contact_tf.paragraphs[0]
-    contact_p.text = "Contact: Taro Yamada | yamada.taro@example.com | 03-1234-5678"
+    contact_p.text = contact
     contact_p.alignment = PP_ALIGN.LEFT
     contact_run = contact_p.runs[0]
     contact_run.font.name = BODY_FONT
     contact_run.font.size = BODY_SIZE
     contact_run.font.color.rgb = ColorPalette.FOOTER_BG
-    add_footer(slide, prs, "Your Company Name | Project Proposal", current_slide, total_slides)
+    add_footer(slide, prs, f"{PROPOSAL_FIELDS['company']} | Project Proposal", current_slide, total_slides)
+
+# model.Slide（deck_reader で読み戻した内容など）を ppt.py のスタイルで描画する
+def create_model_slide(prs, model_slide, current_slide, total_slides):
+    slide_layout = prs.slide_layouts[5]
+    slide = prs.slides.add_slide(slide_layout)
+    add_background(slide, prs)
+    header = add_shape(slide, MSO_SHAPE.RECTANGLE, Inches(0), Inches(0), prs.slide_width, Inches(1), fill_color=ColorPalette.HEADING_BG)
+    header_title = slide.shapes.add_textbox(Inches(0.5), Inches(0.2), Inches(12), Inches(0.6))
+    header_p = header_title.text_frame.paragraphs[0]
+    header_p.text = model_slide.title or ""
+    header_p.alignment = PP_ALIGN.LEFT
+    if header_p.runs:
+        header_run = header_p.runs[0]
+        header_run.font.name = TITLE_FONT
+        header_run.font.size = HEADING_SIZE
+        header_run.font.bold = True
+        header_run.font.color.rgb = ColorPalette.HEADING_TEXT
+    for block in model_slide.blocks:
+        top = max(block.y, Inches(1.2))
+        if block.kind == 'table':
+            n_rows, n_cols = block.shape
+            table = create_table(slide, rows=n_rows, cols=n_cols, left=block.x, top=top, width=block.w, height=block.h)
+            for r, row in enumerate(block.rows):
+                for c, cell in enumerate(row):
+                    set_table_cell_text(table, r, c, cell.text, bold=(r == 0), alignment=PP_ALIGN.CENTER if r == 0 else PP_ALIGN.LEFT)
+            continue
+        box = slide.shapes.add_textbox(block.x, top, block.w, block.h)
+        if block.kind == 'bullets':
+            apply_body_style(box, block)
+            continue
+        box.text_frame.word_wrap = True
+        p = box.text_frame.paragraphs[0]
+        p.text = block.paragraphs[0].text if block.paragraphs else ""
+        if p.runs:
+            run = p.runs[0]
+            run.font.name = TITLE_FONT
+            run.font.size = SUBHEADING_SIZE
+            run.font.bold = True
+            run.font.color.rgb = ColorPalette.TEXT
+    add_footer(slide, prs, model_slide.footer or f"{PROPOSAL_FIELDS['company']} | Project Proposal", current_slide, total_slides)
+
+def build_from_model(deck, prs=None):
+    if prs is None:
+        prs = new_presentation()
+    total_slides = len(deck.slides)
+    for current_slide, model_slide in enumerate(deck.slides, 1):
+        create_model_slide(prs, model_slide, current_slide, total_slides)
+    return prs
+
+# スライド構成（この順序で生成される）
+SLIDE_BUILDERS = [
+    create_title_slide,
+    create_executive_summary,
+    create_current_analysis,
+    create_proposal,
+    create_schedule,
+    create_team_structure,
+    create_risk_management,
+    create_budget,
+    create_success_criteria,
+    create_conclusion,
+]
 
 if __name__ == "__main__":
     create_presentation()
\ No newline at end of file
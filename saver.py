@@ -0,0 +1,275 @@
+"""プレゼンテーションの保存処理
+
+prs.save() は ZIP エントリに保存時刻を書き込むため、同じ内容でも毎回バイト列が変わる。
+save_presentation() は決定的モード (既定) では ZIP のタイムスタンプを固定し、
+パートの並び順・コアプロパティ・図形 ID を正規化するので、同じ入力からは
+常にバイト単位で同一のファイルが得られる。ダイジェストは書き出したバイト列から
+その場で計算するため、ファイルを読み直す必要はない。
+
+ファイルに書き出さずにバイト列が欲しい場合 (ソケットやオブジェクトストレージに送る場合) は
+presentation_bytes() を、用意済みのバッファに書き込む場合は save_into() を使う。
+
+compression を指定するとパートの種類 (XML / メディア) ごとに圧縮レベルを選べる。
+プレビュー用には XML を無圧縮で格納する 'preview'、保管用には最大圧縮の 'archive' を使う。
+圧縮設定ごとの保存時間とファイルサイズは次で比較できる:
+    python saver.py bench great1.pptx sample1.pptx project_proposal.pptx
+"""
+import datetime
+import hashlib
+import io
+import os
+import re
+import sys
+import time
+import zipfile
+
+from pptx.opc.oxml import serialize_part_xml
+from pptx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI
+from pptx.opc.serialized import _ContentTypesItem
+
+import metrics
+from parallel_build import renumber_shape_ids
+
+# ZIP 形式で表現できる最も古い日時
+ZIP_TIMESTAMP = (1980, 1, 1, 0, 0, 0)
+# 正規化後のコアプロパティの日時
+FIXED_DATETIME = datetime.datetime(2000, 1, 1, 0, 0, 0)
+
+# パートの種類ごとの圧縮レベル (0 は無圧縮で格納、1-9 は deflate のレベル)
+COMPRESSION_PRESETS = {
+    'preview': {'xml': 0, 'media': 0},
+    'fast': {'xml': 1, 'media': 0},
+    'default': {'xml': 6, 'media': 6},
+    'archive': {'xml': 9, 'media': 9},
+}
+# XML 以外 (画像・フォントなど) は既に圧縮済みのことが多いのでメディアとして扱う
+_XML_EXTENSIONS = ('.xml', '.rels', '.vml')
+
+
+def _natural_key(membername):
+    # slide2.xml が slide10.xml より前に来るよう、数字部分は数値として比較する
+    return [int(part) if part.isdigit() else part for part in re.split(r'(\d+)', membername)]
+
+
+def normalize_core_properties(prs, author=None, title=None):
+    """コアプロパティの日時・更新者・リビジョンを固定値にする"""
+    core = prs.core_properties
+    core.created = FIXED_DATETIME
+    core.modified = FIXED_DATETIME
+    core.last_printed = FIXED_DATETIME
+    core.last_modified_by = author or ''
+    core.revision = 1
+    if author is not None:
+        core.author = author
+    if title is not None:
+        core.title = title
+
+
+def normalize_shape_ids(prs):
+    """全スライドの図形 ID を出現順に振り直す"""
+    for slide in prs.slides:
+        renumber_shape_ids(slide._element)
+
+
+def iter_package_items(prs):
+    """パッケージの (メンバー名, バイト列) を決定的な順序で返す
+
+    [Content_Types].xml と _rels/.rels を先頭に置き、以降はパート名の自然順で
+    各パートの直後にそのリレーションを並べる。
+    """
+    package = prs.part.package
+    parts = sorted(package.iter_parts(), key=lambda part: _natural_key(part.partname))
+    yield CONTENT_TYPES_URI.membername, serialize_part_xml(_ContentTypesItem.xml_for(parts))
+    yield PACKAGE_URI.rels_uri.membername, package._rels.xml
+    for part in parts:
+        yield part.partname.membername, part.blob
+        if part._rels:
+            yield part.partname.rels_uri.membername, part.rels.xml
+
+
+def resolve_compression(compression):
+    """プリセット名または {'xml': レベル, 'media': レベル} を辞書に解決する"""
+    if compression is None:
+        return COMPRESSION_PRESETS['default']
+    if isinstance(compression, str):
+        try:
+            return COMPRESSION_PRESETS[compression]
+        except KeyError:
+            raise ValueError("未知の圧縮プリセットです: %s" % compression)
+    levels = dict(COMPRESSION_PRESETS['default'])
+    levels.update(compression)
+    for kind, level in levels.items():
+        if not 0 <= level <= 9:
+            raise ValueError("圧縮レベルは 0-9 で指定してください: %s=%r" % (kind, level))
+    return levels
+
+
+def _zip_info(membername, level, date_time=ZIP_TIMESTAMP):
+    info = zipfile.ZipInfo(membername, date_time=date_time)
+    # 作成 OS や権限ビットもプラットフォームに依らない値にそろえる
+    info.create_system = 0
+    info.external_attr = 0
+    info.compress_type = zipfile.ZIP_DEFLATED if level else zipfile.ZIP_STORED
+    return info
+
+
+def write_package(prs, stream, compression=None, date_time=ZIP_TIMESTAMP):
+    """プレゼンテーションを ZIP として stream に書き出す
+
+    compression はプリセット名か、パートの種類 ('xml' / 'media') ごとの圧縮レベルの辞書。
+    """
+    levels = resolve_compression(compression)
+    with zipfile.ZipFile(stream, 'w') as zf:
+        for membername, blob in iter_package_items(prs):
+            kind = 'xml' if membername.endswith(_XML_EXTENSIONS) else 'media'
+            level = levels[kind]
+            zf.writestr(_zip_info(membername, level, date_time), blob, compresslevel=level or None)
+
+
+def check_contrast(prs):
+    """文字色と背景色のコントラストが WCAG AA を満たさなければ ValueError を送出する"""
+    from contrast_audit import audit_presentation, format_issue
+    issues = audit_presentation(prs)
+    if issues:
+        details = '\n'.join(format_issue(issue) for issue in issues[:10])
+        raise ValueError("コントラスト不足のテキストが %d 件あります:\n%s" % (len(issues), details))
+
+
+def _serialize(prs, stream, deterministic, compression):
+    if deterministic:
+        normalize_core_properties(prs)
+        normalize_shape_ids(prs)
+        date_time = ZIP_TIMESTAMP
+    else:
+        date_time = time.localtime()[:6]
+    write_package(prs, stream, compression, date_time)
+
+
+def save_presentation(prs, file, deterministic=True, compression=None, digest='sha256', contrast_gate=False):
+    """prs を file (パスまたは書き込み可能なファイルオブジェクト) に保存する
+
+    保存したバイト列のダイジェスト (16進文字列) を返す。決定的モードでなく
+    compression も指定しない場合は prs.save() と同じ動作で None を返す。
+    contrast_gate を真にすると保存前にコントラストを検査し、不合格なら何も書き出さない。
+    """
+    if contrast_gate:
+        check_contrast(prs)
+    start = time.perf_counter()
+    if not deterministic and compression is None:
+        prs.save(file)
+        size = os.path.getsize(file) if isinstance(file, str) else None
+        metrics.record_save(prs, time.perf_counter() - start, size)
+        return None
+    buffer = io.BytesIO()
+    _serialize(prs, buffer, deterministic, compression)
+    data = buffer.getbuffer()
+    hexdigest = hashlib.new(digest, data).hexdigest()
+    if isinstance(file, str):
+        with open(file, 'wb') as f:
+            f.write(data)
+    else:
+        file.write(data)
+    metrics.record_save(prs, time.perf_counter() - start, len(data))
+    return hexdigest
+
+
+def presentation_bytes(prs, deterministic=True, compression=None, contrast_gate=False):
+    """prs を .pptx のバイト列にして返す (ファイルには書き出さない)
+
+    ZIP は BytesIO に直接書き出し、getvalue() は内部のバイト列をそのまま返すので、
+    戻り値を socket.sendall() やオブジェクトストレージのクライアントに渡すまでに
+    余分なコピーは発生しない。
+    """
+    if contrast_gate:
+        check_contrast(prs)
+    start = time.perf_counter()
+    buffer = io.BytesIO()
+    _serialize(prs, buffer, deterministic, compression)
+    data = buffer.getvalue()
+    metrics.record_save(prs, time.perf_counter() - start, len(data))
+    return data
+
+
+class BufferWriter:
+    """書き込み可能なバッファ (bytearray・mmap・memoryview など) をシーク可能なストリームとして扱う
+
+    zipfile はローカルヘッダーを書き直すためにシークするので、write / seek / tell を持つ。
+    バッファの末尾を超えて書き込もうとすると ValueError を送出する。
+    """
+
+    def __init__(self, buffer):
+        self._view = memoryview(buffer).cast('B')
+        if self._view.readonly:
+            raise ValueError("書き込みできないバッファです")
+        self._pos = 0
+        self.size = 0
+
+    def write(self, data):
+        end = self._pos + len(data)
+        if end > len(self._view):
+            raise ValueError("バッファの容量が足りません: %d バイト必要 (容量 %d バイト)"
+                             % (end, len(self._view)))
+        self._view[self._pos:end] = data
+        self._pos = end
+        self.size = max(self.size, end)
+        return len(data)
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=0):
+        base = (0, self._pos, self.size)[whence]
+        self._pos = base + offset
+        return self._pos
+
+    def seekable(self):
+        return True
+
+    def flush(self):
+        pass
+
+
+def save_into(prs, buffer, deterministic=True, compression=None, contrast_gate=False):
+    """呼び出し側が用意したバッファに .pptx を直接書き込み、書き込んだバイト数を返す
+
+    中間のバイト列を作らないので、バッファを使い回せば保存ごとのメモリ確保も発生しない。
+    容量が足りなければ ValueError を送出する (バッファの内容は途中まで書き込まれている)。
+    """
+    if contrast_gate:
+        check_contrast(prs)
+    start = time.perf_counter()
+    writer = BufferWriter(buffer)
+    _serialize(prs, writer, deterministic, compression)
+    metrics.record_save(prs, time.perf_counter() - start, writer.size)
+    return writer.size
+
+
+def benchmark(paths, presets=('preview', 'fast', 'default', 'archive'), repeat=5):
+    """各デッキ・各プリセットの (保存時間の中央値[秒], ファイルサイズ[バイト]) を返す"""
+    from pptx import Presentation
+    results = []
+    for path in paths:
+        prs = Presentation(path)
+        for preset in presets:
+            timings = []
+            for _ in range(repeat):
+                buffer = io.BytesIO()
+                start = time.perf_counter()
+                write_package(prs, buffer, preset)
+                timings.append(time.perf_counter() - start)
+            timings.sort()
+            results.append((path, preset, timings[len(timings) // 2], buffer.tell()))
+    return results
+
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] != 'bench':
+        print("使用方法: python saver.py bench <pptx>...")
+        return
+    print("%-24s %-8s %10s %10s" % ('deck', 'preset', 'save[ms]', 'size[KB]'))
+    for path, preset, seconds, size in benchmark(sys.argv[2:]):
+        print("%-24s %-8s %10.2f %10.1f" % (path, preset, seconds * 1000, size / 1024))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,491 @@
+"""スライドXMLから図形の配置・塗り・テキストを軽量なレコード(dict)として取り出す
+
+python-pptx のオブジェクトを経由せず lxml の要素を直接たどるため高速で、
+結果はそのまま JSON にできる。サムネイル描画などはこのレコードを入力にする。
+
+位置を持たないプレースホルダー (slide.shapes.title など) はレイアウト・マスターの同じ
+idx / 種類のプレースホルダーから位置を継承する。その対応は placeholder_boxes() で作り、
+slide_records() / slide_boxes() の placeholders に渡す (python-pptx のスライドなら
+pptx_placeholders()、ZIP から読むなら slide_placeholders())。渡さない場合や、継承した
+プレースホルダーにテキストが無い場合 (スライドショーでは何も表示されない) はレコードにしない。
+"""
+import posixpath
+
+from lxml import etree
+
+NS = {
+    'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
+    'p': 'http://schemas.openxmlformats.org/presentationml/2006/main',
+    'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
+}
+_A = '{%s}' % NS['a']
+_P = '{%s}' % NS['p']
+_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+EMU_PER_INCH = 914400
+EMU_PER_PT = 12700
+
+# 既定テンプレート(python-pptx 同梱の Office テーマ)の配色
+THEME_COLORS = {
+    'dk1': (0, 0, 0), 'lt1': (255, 255, 255),
+    'dk2': (31, 73, 125), 'lt2': (238, 236, 225),
+    'tx1': (0, 0, 0), 'bg1': (255, 255, 255),
+    'tx2': (31, 73, 125), 'bg2': (238, 236, 225),
+    'accent1': (79, 129, 189), 'accent2': (192, 80, 77),
+    'accent3': (155, 187, 89), 'accent4': (128, 100, 162),
+    'accent5': (75, 172, 198), 'accent6': (247, 150, 70),
+    'hlink': (0, 0, 255), 'folHlink': (128, 0, 128),
+}
+
+# 既定のテーブルスタイル(Medium Style 2 - Accent 1)の近似色
+TABLE_HEADER_FILL = (79, 129, 189)
+TABLE_BAND_FILLS = ((208, 216, 232), (233, 237, 244))
+
+DEFAULT_FONT_SIZE = 18.0  # pt (rPr に sz が無い場合)
+
+# bodyPr の既定インセット (EMU)
+_DEFAULT_INSETS = (91440, 45720, 91440, 45720)
+
+# スライド・レイアウトのプレースホルダーの種類 → マスターで位置を探す種類 (type の既定は obj)
+_PH_TYPE_ALIASES = {'ctrTitle': 'title', 'subTitle': 'body', 'obj': 'body'}
+_PH_PATH = '%snvSpPr/%snvPr/%sph' % (_P, _P, _P)
+
+
+def _color_of(parent):
+    """solidFill などの子要素から (r, g, b) と不透明度を取り出す"""
+    if parent is None:
+        return None, 1.0
+    clr = None
+    alpha = 1.0
+    for child in parent:
+        tag = child.tag
+        if tag == _A + 'srgbClr':
+            val = child.get('val')
+            clr = (int(val[0:2], 16), int(val[2:4], 16), int(val[4:6], 16))
+        elif tag == _A + 'schemeClr':
+            clr = THEME_COLORS.get(child.get('val'), (0, 0, 0))
+        elif tag == _A + 'sysClr':
+            val = child.get('lastClr', '000000')
+            clr = (int(val[0:2], 16), int(val[2:4], 16), int(val[4:6], 16))
+        else:
+            continue
+        for mod in child:
+            if mod.tag == _A + 'alpha':
+                alpha = int(mod.get('val')) / 100000.0
+            elif mod.tag == _A + 'shade':
+                f = int(mod.get('val')) / 100000.0
+                clr = tuple(int(c * f) for c in clr)
+        break
+    return clr, alpha
+
+
+def _fill_of(spPr, style):
+    """spPr (および p:style) から塗りつぶし情報を返す"""
+    fill = {'fill': None, 'alpha': 1.0, 'gradient': None}
+    if spPr is not None:
+        for child in spPr:
+            tag = child.tag
+            if tag == _A + 'noFill':
+                return fill
+            if tag == _A + 'solidFill':
+                fill['fill'], fill['alpha'] = _color_of(child)
+                return fill
+            if tag == _A + 'gradFill':
+                stops = []
+                for gs in child.iter(_A + 'gs'):
+                    clr, _ = _color_of(gs)
+                    stops.append([int(gs.get('pos', '0')) / 100000.0, list(clr or (0, 0, 0))])
+                lin = child.find(_A + 'lin')
+                angle = int(lin.get('ang', '0')) / 60000.0 if lin is not None else 90.0
+                fill['gradient'] = {'stops': stops, 'angle': angle}
+                fill['fill'] = stops[0][1] if stops else None
+                return fill
+    # 明示的な指定が無いオートシェイプはスタイルの fillRef に従う
+    if style is not None:
+        clr, _ = _color_of(style.find(_A + 'fillRef'))
+        fill['fill'] = clr
+    return fill
+
+
+def _line_of(spPr, style):
+    ln = spPr.find(_A + 'ln') if spPr is not None else None
+    if ln is not None:
+        if ln.find(_A + 'noFill') is not None:
+            return None
+        clr, _ = _color_of(ln.find(_A + 'solidFill'))
+        if clr is None and style is None:
+            return None
+        if clr is None:
+            clr, _ = _color_of(style.find(_A + 'lnRef'))
+        return {'color': list(clr), 'width': int(ln.get('w', '9525'))}
+    if style is not None:
+        clr, _ = _color_of(style.find(_A + 'lnRef'))
+        if clr is not None:
+            return {'color': list(clr), 'width': 9525}
+    return None
+
+
+def _paragraphs_of(txBody, default_color):
+    """txBody の段落をレコードのリストにする"""
+    paragraphs = []
+    if txBody is None:
+        return paragraphs
+    for p in txBody.iterfind(_A + 'p'):
+        pPr = p.find(_A + 'pPr')
+        para = {'level': 0, 'align': 'l', 'space_before': 0.0, 'space_after': 0.0, 'runs': []}
+        if pPr is not None:
+            para['level'] = int(pPr.get('lvl', '0'))
+            para['align'] = pPr.get('algn', 'l')
+            for key, tag in (('space_before', 'spcBef'), ('space_after', 'spcAft')):
+                pts = pPr.find('%s%s/%sspcPts' % (_A, tag, _A))
+                if pts is not None:
+                    para[key] = int(pts.get('val')) / 100.0
+        size = DEFAULT_FONT_SIZE
+        end = p.find(_A + 'endParaRPr')
+        if end is not None and end.get('sz'):
+            size = int(end.get('sz')) / 100.0
+        for r in p:
+            if r.tag not in (_A + 'r', _A + 'br'):
+                continue
+            if r.tag == _A + 'br':
+                para['runs'].append({'text': '\n', 'size': size, 'bold': False,
+                                     'color': list(default_color), 'font': None})
+                continue
+            rPr = r.find(_A + 'rPr')
+            run = {'text': r.findtext(_A + 't') or '', 'size': size, 'bold': False,
+                   'color': list(default_color), 'font': None}
+            if rPr is not None:
+                if rPr.get('sz'):
+                    run['size'] = int(rPr.get('sz')) / 100.0
+                run['bold'] = rPr.get('b') in ('1', 'true')
+                clr, _ = _color_of(rPr.find(_A + 'solidFill'))
+                if clr is not None:
+                    run['color'] = list(clr)
+                latin = rPr.find(_A + 'latin')
+                if latin is not None:
+                    run['font'] = latin.get('typeface')
+                link = rPr.find(_A + 'hlinkClick')
+                if link is not None:
+                    run['link'] = link.get('{%s}id' % NS['r'])
+            para['runs'].append(run)
+        paragraphs.append(para)
+    return paragraphs
+
+
+def _body_props(txBody):
+    bodyPr = txBody.find(_A + 'bodyPr') if txBody is not None else None
+    if bodyPr is None:
+        return {'wrap': True, 'anchor': 't', 'insets': list(_DEFAULT_INSETS)}
+    insets = [int(bodyPr.get(k, d)) for k, d in zip(('lIns', 'tIns', 'rIns', 'bIns'), _DEFAULT_INSETS)]
+    return {
+        'wrap': bodyPr.get('wrap', 'square') != 'none',
+        'anchor': bodyPr.get('anchor', 't'),
+        'insets': insets,
+    }
+
+
+def _xfrm_of(el, tag):
+    xfrm = el.find(tag)
+    if xfrm is None:
+        return None
+    off, ext = xfrm.find(_A + 'off'), xfrm.find(_A + 'ext')
+    if off is None or ext is None:
+        return None
+    return (int(off.get('x')), int(off.get('y')), int(ext.get('cx')), int(ext.get('cy')))
+
+
+def placeholder_boxes(layout, master=None):
+    """レイアウトとマスター (p:sldLayout / p:sldMaster の要素かバイト列) から、プレースホルダーの
+    位置の対応 {('idx', idx) または ('type', 種類): (x, y, w, h)} を返す"""
+    boxes = {}
+    for root in (master, layout):
+        if root is None:
+            continue
+        if isinstance(root, (bytes, str)):
+            root = etree.fromstring(root)
+        for sp in root.iterfind('%scSld/%sspTree/%ssp' % (_P, _P, _P)):
+            ph = sp.find(_PH_PATH)
+            if ph is None:
+                continue
+            ph_type = ph.get('type', 'obj')
+            box = _xfrm_of(sp, '%sspPr/%sxfrm' % (_P, _A))
+            if box is None:
+                # レイアウトで位置を省略したプレースホルダーはマスターの同じ種類の位置になる
+                box = boxes.get(('type', _PH_TYPE_ALIASES.get(ph_type, ph_type)))
+            if box is None:
+                continue
+            boxes[('type', ph_type)] = box
+            if root is layout:
+                boxes[('idx', int(ph.get('idx', '0')))] = box
+    return boxes
+
+
+def _inherited_box(el, placeholders):
+    """位置を持たないプレースホルダーの、レイアウトから継承した位置 (無ければ None)"""
+    ph = el.find(_PH_PATH)
+    if ph is None or not placeholders:
+        return None
+    ph_type = ph.get('type', 'obj')
+    box = placeholders.get(('idx', int(ph.get('idx', '0'))))
+    if box is None:
+        box = placeholders.get(('type', ph_type)) or placeholders.get(('type', _PH_TYPE_ALIASES.get(ph_type)))
+    return box
+
+
+def _has_text(el):
+    return any((t.text or '').strip() for t in el.iterfind('%stxBody/%sp/%sr/%st' % (_P, _A, _A, _A)))
+
+
+def _table_of(frame):
+    tbl = frame.find('.//' + _A + 'tbl')
+    tblPr = tbl.find(_A + 'tblPr')
+    first_row = tblPr is not None and tblPr.get('firstRow') in ('1', 'true')
+    band_row = tblPr is not None and tblPr.get('bandRow') in ('1', 'true')
+    cols = [int(c.get('w')) for c in tbl.iterfind('%stblGrid/%sgridCol' % (_A, _A))]
+    rows, cells = [], []
+    for ri, tr in enumerate(tbl.iterfind(_A + 'tr')):
+        rows.append(int(tr.get('h')))
+        is_header = first_row and ri == 0
+        if is_header:
+            default_fill, text_color = TABLE_HEADER_FILL, THEME_COLORS['lt1']
+        else:
+            band = (ri - (1 if first_row else 0)) % 2 if band_row else 1
+            default_fill, text_color = TABLE_BAND_FILLS[band], THEME_COLORS['dk1']
+        row = []
+        for tc in tr.iterfind(_A + 'tc'):
+            tcPr = tc.find(_A + 'tcPr')
+            cell_fill = default_fill
+            if tcPr is not None:
+                if tcPr.find(_A + 'noFill') is not None:
+                    cell_fill = None
+                else:
+                    clr, _ = _color_of(tcPr.find(_A + 'solidFill'))
+                    cell_fill = clr or cell_fill
+            paragraphs = _paragraphs_of(tc.find(_A + 'txBody'), text_color)
+            if is_header:
+                for para in paragraphs:
+                    for run in para['runs']:
+                        run['bold'] = True
+            row.append({'fill': list(cell_fill) if cell_fill else None, 'paragraphs': paragraphs})
+        cells.append(row)
+    return {'cols': cols, 'rows': rows, 'cells': cells}
+
+
+def _walk(tree, records, transform, placeholders=None):
+    """spTree / grpSp の子要素を z 順にたどってレコードを追加する"""
+    for el in tree:
+        tag = el.tag
+        if tag == _P + 'sp':
+            spPr = el.find(_P + 'spPr')
+            box = _xfrm_of(spPr, _A + 'xfrm') if spPr is not None else None
+            if box is None:
+                # 位置はレイアウトから継承する。テキストの無いプレースホルダーは表示されない
+                box = _inherited_box(el, placeholders)
+                if box is None or not _has_text(el):
+                    continue
+            cNvPr = el.find('%snvSpPr/%scNvPr' % (_P, _P))
+            cNvSpPr = el.find('%snvSpPr/%scNvSpPr' % (_P, _P))
+            is_textbox = cNvSpPr is not None and cNvSpPr.get('txBox') == '1'
+            style = el.find(_P + 'style')
+            geom = spPr.find(_A + 'prstGeom') if spPr is not None else None
+            txBody = el.find(_P + 'txBody')
+            text_color = THEME_COLORS['dk1']
+            if style is not None:
+                clr, _ = _color_of(style.find(_A + 'fontRef'))
+                text_color = clr or text_color
+            x, y, w, h = transform(box)
+            record = {
+                'kind': 'textbox' if is_textbox else 'shape',
+                'id': int(cNvPr.get('id')), 'name': cNvPr.get('name'),
+                'geom': geom.get('prst') if geom is not None else 'rect',
+                'x': x, 'y': y, 'w': w, 'h': h,
+                'line': _line_of(spPr, style),
+                'paragraphs': _paragraphs_of(txBody, text_color),
+            }
+            record.update(_fill_of(spPr, style))
+            record.update(_body_props(txBody))
+            if is_textbox and txBody is not None:
+                bodyPr = txBody.find(_A + 'bodyPr')
+                # テキストボックスの既定は上揃え
+                record['anchor'] = bodyPr.get('anchor', 't') if bodyPr is not None else 't'
+            records.append(record)
+        elif tag == _P + 'graphicFrame':
+            box = _xfrm_of(el, _P + 'xfrm')
+            if box is None or el.find('.//' + _A + 'tbl') is None:
+                continue
+            cNvPr = el.find('%snvGraphicFramePr/%scNvPr' % (_P, _P))
+            x, y, w, h = transform(box)
+            records.append({
+                'kind': 'table', 'id': int(cNvPr.get('id')), 'name': cNvPr.get('name'),
+                'x': x, 'y': y, 'w': w, 'h': h,
+                'table': _table_of(el),
+            })
+        elif tag == _P + 'grpSp':
+            _walk(el, records, _group_transform(el, transform), placeholders)
+
+
+def _group_transform(grpSp, transform):
+    """グループ内の子座標をスライド座標に変換する関数を返す"""
+    grpSpPr = grpSp.find(_P + 'grpSpPr')
+    xfrm = grpSpPr.find(_A + 'xfrm') if grpSpPr is not None else None
+    if xfrm is None:
+        return transform
+    off, ext = xfrm.find(_A + 'off'), xfrm.find(_A + 'ext')
+    ch_off, ch_ext = xfrm.find(_A + 'chOff'), xfrm.find(_A + 'chExt')
+    if None in (off, ext, ch_off, ch_ext):
+        return transform
+    ox, oy = int(off.get('x')), int(off.get('y'))
+    cx, cy = int(ch_off.get('x')), int(ch_off.get('y'))
+    sx = int(ext.get('cx')) / max(int(ch_ext.get('cx')), 1)
+    sy = int(ext.get('cy')) / max(int(ch_ext.get('cy')), 1)
+
+    def child_transform(box):
+        bx, by, bw, bh = box
+        return transform((int(ox + (bx - cx) * sx), int(oy + (by - cy) * sy),
+                          int(bw * sx), int(bh * sy)))
+    return child_transform
+
+
+def _walk_boxes(tree, boxes, transform, placeholders=None):
+    for el in tree:
+        tag = el.tag
+        if tag == _P + 'sp':
+            box = _xfrm_of(el, '%sspPr/%sxfrm' % (_P, _A))
+            has_text = _has_text(el)
+            if box is None:
+                box = _inherited_box(el, placeholders)
+                if box is None or not has_text:
+                    continue
+            cNvPr = el.find('%snvSpPr/%scNvPr' % (_P, _P))
+            kind = 'shape'
+        elif tag == _P + 'graphicFrame':
+            box = _xfrm_of(el, _P + 'xfrm')
+            if box is None or el.find('.//' + _A + 'tbl') is None:
+                continue
+            cNvPr = el.find('%snvGraphicFramePr/%scNvPr' % (_P, _P))
+            has_text, kind = True, 'table'
+        elif tag == _P + 'grpSp':
+            _walk_boxes(el, boxes, _group_transform(el, transform), placeholders)
+            continue
+        else:
+            continue
+        x, y, w, h = transform(box)
+        boxes.append({'kind': kind, 'id': int(cNvPr.get('id')), 'name': cNvPr.get('name'),
+                      'x': x, 'y': y, 'w': w, 'h': h, 'has_text': has_text})
+
+
+def slide_records(sld, placeholders=None):
+    """p:sld 要素 (またはそのシリアライズ済みバイト列) から図形レコードのリストを返す
+
+    placeholders は placeholder_boxes() の戻り値 (位置を継承するプレースホルダー用)。
+    """
+    if isinstance(sld, (bytes, str)):
+        sld = etree.fromstring(sld)
+    tree = sld.find('%scSld/%sspTree' % (_P, _P))
+    records = []
+    if tree is not None:
+        _walk(tree, records, lambda box: box, placeholders)
+    return records
+
+
+def slide_boxes(sld, placeholders=None):
+    """図形の位置とテキストの有無だけを取り出す軽量版の slide_records
+
+    各レコードは {'kind': 'shape' / 'table', 'id', 'name', 'x', 'y', 'w', 'h', 'has_text'}。
+    """
+    if isinstance(sld, (bytes, str)):
+        sld = etree.fromstring(sld)
+    tree = sld.find('%scSld/%sspTree' % (_P, _P))
+    boxes = []
+    if tree is not None:
+        _walk_boxes(tree, boxes, lambda box: box, placeholders)
+    return boxes
+
+
+def record_boxes(records):
+    """slide_records 形式のレコード (dryrun.py の出力など) を slide_boxes と同じ形式にする"""
+    boxes = []
+    for record in records:
+        if record['kind'] == 'table':
+            has_text, kind = True, 'table'
+        else:
+            has_text = any(run['text'].strip() for para in record['paragraphs'] for run in para['runs'])
+            kind = 'shape'
+        boxes.append({'kind': kind, 'id': record['id'], 'name': record['name'],
+                      'x': record['x'], 'y': record['y'], 'w': record['w'], 'h': record['h'],
+                      'has_text': has_text})
+    return boxes
+
+
+def pptx_placeholders(slide, cache=None):
+    """python-pptx の Slide のレイアウトとマスターから placeholder_boxes() を作る (cache はレイアウトごと)"""
+    layout = slide.slide_layout
+    key = layout.part.partname
+    if cache is not None and key in cache:
+        return cache[key]
+    boxes = placeholder_boxes(layout._element, layout.slide_master._element)
+    if cache is not None:
+        cache[key] = boxes
+    return boxes
+
+
+def _related_member(zf, member, reltype):
+    """ZIP のパート member からリレーションの種類が reltype (末尾) のパートのメンバー名"""
+    directory, name = posixpath.split(member)
+    try:
+        rels = etree.fromstring(zf.read(posixpath.join(directory, '_rels', name + '.rels')))
+    except KeyError:
+        return None
+    for rel in rels.iter('{%s}Relationship' % _REL_NS):
+        if rel.get('Type', '').endswith(reltype) and rel.get('TargetMode') != 'External':
+            target = rel.get('Target')
+            return target.lstrip('/') if target.startswith('/') else posixpath.normpath(
+                posixpath.join(directory, target))
+    return None
+
+
+def slide_placeholders(zf, member, cache=None):
+    """.pptx の ZipFile のスライド member のレイアウトとマスターから placeholder_boxes() を作る
+
+    cache (dict) を渡すとレイアウトごとに1回だけ読む。
+    """
+    layout = _related_member(zf, member, '/slideLayout')
+    if layout is None:
+        return {}
+    if cache is not None and layout in cache:
+        return cache[layout]
+    master = _related_member(zf, layout, '/slideMaster')
+    boxes = placeholder_boxes(zf.read(layout), zf.read(master) if master else None)
+    if cache is not None:
+        cache[layout] = boxes
+    return boxes
+
+
+def presentation_records(prs):
+    """Presentation の全スライドのレコードを (スライド幅, 高さ, [スライドごとのレコード]) で返す"""
+    cache = {}
+    return prs.slide_width, prs.slide_height, [slide_records(slide._element, pptx_placeholders(slide, cache))
+                                               for slide in prs.slides]
+
+
+def slide_members(zf):
+    """.pptx の ZipFile から、表示順に並べたスライドのメンバー名を返す"""
+    rels = etree.fromstring(zf.read('ppt/_rels/presentation.xml.rels'))
+    targets = {rel.get('Id'): rel.get('Target') for rel in rels.iter('{%s}Relationship' % _REL_NS)}
+    presentation = etree.fromstring(zf.read('ppt/presentation.xml'))
+    members = []
+    for sldId in presentation.iter('%ssldId' % _P):
+        target = targets[sldId.get('{%s}id' % NS['r'])]
+        members.append(target.lstrip('/') if target.startswith('/') else 'ppt/' + target)
+    return members
+
+
+def slide_size(zf):
+    """.pptx の ZipFile からスライドの (幅, 高さ) を EMU で返す"""
+    sldSz = etree.fromstring(zf.read('ppt/presentation.xml')).find('%ssldSz' % _P)
+    return int(sldSz.get('cx')), int(sldSz.get('cy'))
+
+
+def plain_text(paragraphs):
+    """段落レコードから改行区切りのプレーンテキストを作る"""
+    return '\n'.join(''.join(run['text'] for run in para['runs']) for para in paragraphs)
@@ -6,6 +6,8 @@ from pptx.dml.color import RGBColor
 from pptx.enum.shapes import MSO_SHAPE
 from pptx.enum.dml import MSO_THEME_COLOR
 
+from saver import presentation_bytes, save_presentation
+
 # 洗練されたモダンなカラーパレットの定義
 class ColorPalette:
     PRIMARY = RGBColor(45, 52, 54)         # ダークグレー（ほぼブラック）
@@ -28,12 +30,13 @@ HEADING_SIZE = Pt(32)
 SUBHEADING_SIZE = Pt(22)
 BODY_SIZE = Pt(18)
 
-def create_presentation():
-    prs = Presentation()
-    
-    # スライドサイズを16:9に設定
-    prs.slide_width = Inches(13.33)
-    prs.slide_height = Inches(7.5)
+def build_presentation(prs=None):
+    if prs is None:
+        prs = Presentation()
+        
+        # スライドサイズを16:9に設定
+        prs.slide_width = Inches(13.33)
+        prs.slide_height = Inches(7.5)
     
     # スライドを作成
     create_title_slide(prs)
@@ -46,11 +49,19 @@ def create_presentation():
     create_budget(prs)
     create_success_criteria(prs)
     create_conclusion(prs)
+    return prs
+
+def create_presentation():
+    prs = build_presentation()
     
     # プレゼンテーションを保存
-    prs.save('IT_Project_Proposal.pptx')
+    save_presentation(prs, 'IT_Project_Proposal.pptx')
     print("プレゼンテーションが作成されました: IT_Project_Proposal.pptx")
 
+def build_presentation_bytes(**options):
+    # ファイルに書き出さずに .pptx のバイト列を返す（options は saver.presentation_bytes() に渡す）
+    return presentation_bytes(build_presentation(), **options)
+
 def apply_title_style(title_shape, text, font_size=TITLE_SIZE, color=ColorPalette.DARK):
     """タイトルのスタイルを適用する"""
     title_shape.text = text
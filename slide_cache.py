@@ -0,0 +1,286 @@
+"""生成済みスライドのディスクキャッシュ (内容ハッシュをキーにした LRU)
+
+チーム構成・リスク管理・成功基準のような定型スライドは多くのデッキで同じ内容になるのに、
+毎回 create_* 関数で一から作り直している。このキャッシュはビルダーが作ったスライドの
+XML 断片 (parallel_build.build_fragment の戻り値: レイアウト番号・スライド XML・
+リレーションと画像) を SQLite に保存し、次のデッキでは splice_fragment で差し込むだけにする。
+
+キーは次の4つの組:
+- ビルダー: モジュール名とビルダー名
+- テーマ: 実行時の ColorPalette と *_FONT / *_SIZE の値 (実行中に差し替えても区別する)
+- 内容: ビルダーが参照する PROPOSAL_FIELDS の値と、スライドの位置・総数 (ページ番号)
+- コードのバージョン: ビルダーと共通部分のソースの AST (watcher.source_fingerprints)、
+  モジュールが import している同じディレクトリのモジュールのソース (watcher.local_imports) と
+  python-pptx のバージョン
+
+合計サイズが上限を超えたら、最後に使われたのが古いものから削除する。ヒット・ミス・削除の
+件数はデータベースに累積して記録する。
+
+使い方:
+    python slide_cache.py build --cache .slide_cache.db --fields fields.json -o project_proposal.pptx
+    python slide_cache.py stats --cache .slide_cache.db
+    python slide_cache.py bench --decks 20
+"""
+import importlib
+import json
+import pickle
+import sqlite3
+import time
+import zlib
+
+import pptx
+
+from parallel_build import build_fragment, new_presentation, splice_fragment
+from watcher import digest, local_imports, source_fingerprints, sources_fingerprint
+
+DEFAULT_CACHE = '.slide_cache.db'
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS slides (
+    key TEXT PRIMARY KEY,
+    builder TEXT NOT NULL,
+    fragment BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS slides_lru ON slides (last_used);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def theme_fingerprint(module):
+    """モジュールの配色・フォント・サイズ定数の実行時の値から作る指紋"""
+    values = []
+    palette = getattr(module, 'ColorPalette', None)
+    if palette is not None:
+        values.extend('%s=%s' % (name, value) for name, value in sorted(vars(palette).items())
+                      if not name.startswith('_'))
+    values.extend('%s=%s' % (name, getattr(module, name)) for name in sorted(vars(module))
+                  if name.endswith(('_FONT', '_SIZE')))
+    return digest(*values)
+
+
+class SlideCache:
+    """XML 断片を保存する SQLite データベースへの接続
+
+    max_bytes は保存する断片 (圧縮後) の合計サイズの上限。
+    """
+
+    def __init__(self, path=DEFAULT_CACHE, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.executescript(_SCHEMA)
+        # この接続でのヒット・ミス数 (累積値はデータベースの counters に記録する)
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def _count(self, name, amount=1):
+        self.db.execute('INSERT INTO counters (name, value) VALUES (?, ?) '
+                        'ON CONFLICT (name) DO UPDATE SET value = value + excluded.value', (name, amount))
+
+    def get(self, key):
+        """キーの断片 (layout_index, xml, rels) を返す。無ければ None"""
+        row = self.db.execute('SELECT fragment FROM slides WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            self._count('misses')
+            return None
+        self.db.execute('UPDATE slides SET last_used = ?, hits = hits + 1 WHERE key = ?', (time.time(), key))
+        self.hits += 1
+        self._count('hits')
+        return pickle.loads(zlib.decompress(row[0]))
+
+    def put(self, key, builder, fragment):
+        """断片を保存し、上限を超えた分を古いものから削除する"""
+        blob = zlib.compress(pickle.dumps(fragment, protocol=pickle.HIGHEST_PROTOCOL))
+        now = time.time()
+        self.db.execute('BEGIN IMMEDIATE')
+        try:
+            self.db.execute('INSERT OR REPLACE INTO slides (key, builder, fragment, size, created_at, last_used) '
+                            'VALUES (?, ?, ?, ?, ?, ?)', (key, builder, blob, len(blob), now, now))
+            self._evict()
+            self.db.execute('COMMIT')
+        except BaseException:
+            self.db.execute('ROLLBACK')
+            raise
+
+    def _evict(self):
+        total = self.db.execute('SELECT COALESCE(SUM(size), 0) FROM slides').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for key, size in self.db.execute('SELECT key, size FROM slides ORDER BY last_used').fetchall():
+            if total <= self.max_bytes:
+                break
+            self.db.execute('DELETE FROM slides WHERE key = ?', (key,))
+            total -= size
+            evicted += 1
+        self._count('evictions', evicted)
+
+    def clear(self):
+        self.db.execute('DELETE FROM slides')
+        self.db.execute('DELETE FROM counters')
+
+    def stats(self):
+        """件数・合計サイズと、累積のヒット・ミス・削除数、ヒット率"""
+        entries, size = self.db.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM slides').fetchone()
+        counters = dict(self.db.execute('SELECT name, value FROM counters').fetchall())
+        hits, misses = counters.get('hits', 0), counters.get('misses', 0)
+        return {
+            'entries': entries,
+            'bytes': size,
+            'hits': hits,
+            'misses': misses,
+            'evictions': counters.get('evictions', 0),
+            'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+        }
+
+    def builder_stats(self):
+        """ビルダーごとの (件数, ヒット数) の辞書"""
+        rows = self.db.execute('SELECT builder, COUNT(*), SUM(hits) FROM slides GROUP BY builder ORDER BY builder')
+        return {builder: (count, hits) for builder, count, hits in rows}
+
+
+class CachedDeckBuilder:
+    """SLIDE_BUILDERS を持つモジュールのデッキを、キャッシュを使って組み立てる"""
+
+    def __init__(self, module_name='ppt', cache=None):
+        self.module_name = module_name
+        self.module = importlib.import_module(module_name)
+        self.cache = cache if cache is not None else SlideCache()
+        with open(self.module.__file__, encoding='utf-8') as f:
+            source = f.read()
+        names = {builder.__name__ for builder in self.module.SLIDE_BUILDERS}
+        shared, self._builders, self._fields = source_fingerprints(source, names)
+        # ビルダーが使う共通部品 (grid・markup・linebreak・saver など) の変更でもキーを変える
+        self._shared = digest(shared, sources_fingerprint(local_imports(self.module.__file__)))
+
+    def slide_key(self, builder_name, current_slide, total_slides, theme=None):
+        """(ビルダー, テーマ, 内容, コードのバージョン) から作るキャッシュのキー"""
+        values = self.module.PROPOSAL_FIELDS
+        used = sorted(set(self._fields.get(builder_name, ())) | set(self._fields[None]))
+        content = digest(*('%s=%s' % (name, values.get(name)) for name in used),
+                         str(current_slide), str(total_slides))
+        code = digest(self._shared, self._builders.get(builder_name, builder_name), pptx.__version__)
+        theme = theme or theme_fingerprint(self.module)
+        return digest('%s.%s' % (self.module_name, builder_name), theme, content, code)
+
+    def build(self, prs=None):
+        """デッキを組み立てて (プレゼンテーション, ヒットしたスライド番号のリスト) を返す"""
+        if prs is None:
+            prs = new_presentation(self.module)
+        names = [builder.__name__ for builder in self.module.SLIDE_BUILDERS]
+        total = len(names)
+        theme = theme_fingerprint(self.module)
+        hits = []
+        for i, name in enumerate(names, 1):
+            key = self.slide_key(name, i, total, theme)
+            fragment = self.cache.get(key)
+            if fragment is None:
+                fragment = build_fragment(self.module_name, name, i, total)
+                self.cache.put(key, '%s.%s' % (self.module_name, name), fragment)
+            else:
+                hits.append(i)
+            splice_fragment(prs, *fragment)
+        return prs, hits
+
+
+def _bench(decks=20, module_name='ppt', cache_path=':memory:'):
+    """金額だけが違うデッキを decks 個、キャッシュなしとありで作り、(なしの秒数, ありの秒数, 統計) を返す"""
+    module = importlib.import_module(module_name)
+    saved = dict(module.PROPOSAL_FIELDS)
+    variants = [{'initial_cost': '¥%dM' % (30 + i % 5), 'annual_cost': '¥%dM' % (5 + i % 3)} for i in range(decks)]
+    try:
+        start = time.perf_counter()
+        for fields in variants:
+            module.PROPOSAL_FIELDS.update(fields)
+            module.build_presentation()
+        plain = time.perf_counter() - start
+        with SlideCache(cache_path) as cache:
+            builder = CachedDeckBuilder(module_name, cache)
+            start = time.perf_counter()
+            for fields in variants:
+                module.PROPOSAL_FIELDS.update(fields)
+                builder.build()
+            cached = time.perf_counter() - start
+            stats = cache.stats()
+    finally:
+        module.PROPOSAL_FIELDS.clear()
+        module.PROPOSAL_FIELDS.update(saved)
+    return plain, cached, stats
+
+
+def _format_stats(stats):
+    return ("%d 件 %.1f KB / ヒット %d・ミス %d (ヒット率 %.1f%%) / 削除 %d"
+            % (stats['entries'], stats['bytes'] / 1024, stats['hits'], stats['misses'],
+               stats['hit_rate'] * 100, stats['evictions']))
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='生成済みスライドのディスクキャッシュ')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('build', help='キャッシュを使ってデッキを生成する')
+    p.add_argument('--cache', default=DEFAULT_CACHE)
+    p.add_argument('--max-mb', type=float, default=DEFAULT_MAX_BYTES / 1024 / 1024)
+    p.add_argument('--module', default='ppt')
+    p.add_argument('--fields', default=None, help='PROPOSAL_FIELDS を上書きする JSON ファイル')
+    p.add_argument('-o', '--output', default='project_proposal.pptx')
+    p = sub.add_parser('stats', help='件数とヒット率を表示する')
+    p.add_argument('--cache', default=DEFAULT_CACHE)
+    p = sub.add_parser('clear', help='キャッシュを空にする')
+    p.add_argument('--cache', default=DEFAULT_CACHE)
+    p = sub.add_parser('bench', help='キャッシュなしとありで生成時間を比べる')
+    p.add_argument('--decks', type=int, default=20)
+    p.add_argument('--module', default='ppt')
+    args = parser.parse_args()
+
+    if args.command == 'bench':
+        plain, cached, stats = _bench(args.decks, args.module)
+        print("キャッシュなし: %.2f 秒 / キャッシュあり: %.2f 秒 (%d デッキ)" % (plain, cached, args.decks))
+        print(_format_stats(stats))
+        return
+    if args.command == 'build':
+        from saver import save_presentation
+        with SlideCache(args.cache, int(args.max_mb * 1024 * 1024)) as cache:
+            builder = CachedDeckBuilder(args.module, cache)
+            if args.fields:
+                with open(args.fields, encoding='utf-8') as f:
+                    builder.module.PROPOSAL_FIELDS.update(json.load(f))
+            start = time.perf_counter()
+            prs, hits = builder.build()
+            save_presentation(prs, args.output)
+            print("作成しました: %s (%.2f 秒, キャッシュから %d / %d 枚)"
+                  % (args.output, time.perf_counter() - start, len(hits), len(prs.slides)))
+        return
+    with SlideCache(args.cache) as cache:
+        if args.command == 'clear':
+            cache.clear()
+            print("キャッシュを空にしました: %s" % args.cache)
+            return
+        print(_format_stats(cache.stats()))
+        for builder, (count, hits) in cache.builder_stats().items():
+            print("  %-36s %3d 件 %5d ヒット" % (builder, count, hits))
+
+
+if __name__ == '__main__':
+    main()
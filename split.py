@@ -0,0 +1,220 @@
+"""デッキをスライド1枚ずつの .pptx に分割する
+
+レビューではスライドを1枚ずつチケットに添付したい。python-pptx で読み込んで
+スライドを削除しながら保存し直すと、全パートを毎回パース・シリアライズすることになる。
+ここでは ZIP のパートをそのままコピーし、書き換えるのはプレゼンテーション本体
+(sldIdLst を1枚にする)・そのリレーション・[Content_Types].xml だけにする。
+
+各出力に入れるのは、パッケージのリレーションからたどれるパートのうち、他のスライドと
+そこからしか参照されていないパート (ノート・画像) を除いたもの。他のスライドへの
+リレーション (スライド間のリンクなど) は取り除き、それを参照する要素も削除する。
+パート名と rId は元のデッキのまま。ディレクトリを指定するとデッキごとにプロセス
+プールで並列に分割し、出力はディレクトリの中での相対パスを出力先の下に再現して置く
+(別々のデッキの出力が同じ名前になる場合は上書きせずにエラーにする)。
+
+使い方:
+    python split.py project_proposal.pptx -o slides/
+    python split.py archive/ -o slides/ --workers 4
+"""
+import io
+import os
+import sys
+import time
+import zipfile
+from functools import partial
+from multiprocessing import Pool
+
+from lxml import etree
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+
+from merge import (_P, _R_ATTRS, _R_ID, _XML_DECLARATION, content_types_xml, presentation_member,
+                   read_content_types, read_rels, rels_member, rels_xml, resolve)
+from saver import ZIP_TIMESTAMP, _XML_EXTENSIONS, _zip_info, resolve_compression
+
+OUTPUT_PATTERN = '{stem}_slide{index:02d}.pptx'
+
+
+def _write(zf, levels, member, data):
+    kind = 'xml' if member.endswith(_XML_EXTENSIONS) else 'media'
+    level = levels[kind]
+    zf.writestr(_zip_info(member, level, ZIP_TIMESTAMP), data, compresslevel=level or None)
+
+
+def _prune(data, dropped):
+    """XML から rId が dropped に含まれる参照を持つ要素を取り除く"""
+    root = etree.fromstring(data)
+    for el in list(root.iter()):
+        if any(el.get(attr) in dropped for attr in _R_ATTRS) and el.getparent() is not None:
+            el.getparent().remove(el)
+    return _XML_DECLARATION + etree.tostring(root)
+
+
+class _Package:
+    """分割するデッキ。リレーションとパートのバイト列は1回だけ読む"""
+
+    def __init__(self, zf):
+        self.zf = zf
+        self.defaults, self.overrides = read_content_types(zf)
+        self.presentation = presentation_member(zf)
+        self._rels = {}
+        self._data = {}
+
+    def rels(self, member):
+        rels = self._rels.get(member)
+        if rels is None:
+            rels = self._rels[member] = read_rels(self.zf, member)
+        return rels
+
+    def read(self, member):
+        data = self._data.get(member)
+        if data is None:
+            data = self._data[member] = self.zf.read(member)
+        return data
+
+    def closure(self, roots, exclude):
+        """roots からリレーションでたどれるパート (exclude とスライドは除く) を順に返す"""
+        seen = set(exclude)
+        order = []
+        queue = [member for member in roots if member not in seen]
+        seen.update(queue)
+        for member in queue:
+            order.append(member)
+            for _, reltype, target, external in self.rels(member):
+                if external or reltype == RT.SLIDE:
+                    continue
+                target = resolve(member, target)
+                if target not in seen:
+                    seen.add(target)
+                    queue.append(target)
+        return order
+
+
+def split_package(zf, compression=None):
+    """ZipFile のデッキを分割し、スライドごとの .pptx のバイト列を表示順に返す"""
+    levels = resolve_compression(compression)
+    package = _Package(zf)
+    member = package.presentation
+    presentation = package.read(member)
+    slide_ids = list(etree.fromstring(presentation).iter(_P + 'sldId'))
+    pres_rels = package.rels(member)
+    slide_rids = {rId for rId, reltype, _, _ in pres_rels if reltype == RT.SLIDE}
+    package_rels = read_rels(zf, None)
+
+    # すべての出力に共通のパート (マスター・レイアウト・テーマ・プロパティなど)
+    roots = [resolve('', target) for _, _, target, external in package_rels if not external]
+    roots.remove(member)
+    roots += [resolve(member, target) for _, reltype, target, external in pres_rels
+              if not external and reltype != RT.SLIDE]
+    shared = package.closure(roots, ())
+
+    outputs = []
+    for slide_id in slide_ids:
+        keep = slide_id.get(_R_ID)
+        dropped = slide_rids - {keep}
+        slide = resolve(member, next(target for rId, _, target, _ in pres_rels if rId == keep))
+        own = package.closure([slide], shared + [member])
+
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as out:
+            write = partial(_write, out, levels)
+            overrides = {}
+            write('_rels/.rels', zf.read('_rels/.rels'))
+            write(member, _prune(presentation, dropped))
+            write(rels_member(member), rels_xml([rel for rel in pres_rels if rel[0] not in dropped]))
+            overrides[member] = package.overrides[member]
+            for part in shared + own:
+                rels = package.rels(part)
+                # 他のスライドへのリレーションは取り除く (ノートから自分のスライドへの参照は残す)
+                pruned = {rId for rId, reltype, target, external in rels
+                          if reltype == RT.SLIDE and not external and resolve(part, target) != slide}
+                data = package.read(part)
+                write(part, _prune(data, pruned) if pruned else data)
+                if rels:
+                    if pruned:
+                        write(rels_member(part), rels_xml([rel for rel in rels if rel[0] not in pruned]))
+                    else:
+                        write(rels_member(part), zf.read(rels_member(part)))
+                if part in package.overrides:
+                    overrides[part] = package.overrides[part]
+            write('[Content_Types].xml', content_types_xml(package.defaults, overrides))
+        outputs.append(buffer.getvalue())
+    return outputs
+
+
+def split_deck(path, out_dir, pattern=OUTPUT_PATTERN, compression=None):
+    """path のデッキをスライドごとに out_dir に書き出し、(元のパス, 出力パスのリスト) を返す"""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    with zipfile.ZipFile(path) as zf:
+        outputs = split_package(zf, compression)
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for index, data in enumerate(outputs, 1):
+        output = os.path.join(out_dir, pattern.format(stem=stem, index=index))
+        with open(output, 'wb') as f:
+            f.write(data)
+        paths.append(output)
+    return path, paths
+
+
+def _split_task(task, pattern, compression):
+    path, out_dir = task
+    return split_deck(path, out_dir, pattern, compression)
+
+
+def output_dirs(paths, out_dir, pattern=OUTPUT_PATTERN):
+    """paths のデッキと出力ディレクトリの組を順に返す
+
+    ディレクトリを指定した場合は、その中での相対パスを out_dir の下に再現する
+    (archive/a/deck.pptx → out_dir/a/)。別々のデッキの出力が同じファイル名になる場合は
+    上書きせずに ValueError にする。
+    """
+    from deck_index import iter_deck_paths
+    tasks = []
+    owners = {}
+    for root in paths:
+        for path in iter_deck_paths([root]):
+            target = out_dir
+            if os.path.isdir(root):
+                target = os.path.normpath(os.path.join(out_dir, os.path.relpath(os.path.dirname(path), root)))
+            stem = os.path.splitext(os.path.basename(path))[0]
+            first = os.path.join(target, pattern.format(stem=stem, index=1))
+            if first in owners:
+                raise ValueError("出力ファイル名が重複します: %s と %s (%s)" % (owners[first], path, first))
+            owners[first] = path
+            tasks.append((path, target))
+    return tasks
+
+
+def split_files(paths, out_dir, workers=None, pattern=OUTPUT_PATTERN, compression=None):
+    """複数のデッキをプロセス並列で分割し、(元のパス, 出力パスのリスト) を順に返す"""
+    tasks = output_dirs(paths, out_dir, pattern)
+    task = partial(_split_task, pattern=pattern, compression=compression)
+    with Pool(workers) as pool:
+        yield from pool.imap(task, tasks, chunksize=4)
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='デッキをスライド1枚ずつの .pptx に分割する')
+    parser.add_argument('paths', nargs='+', help='.pptx ファイルまたはディレクトリ')
+    parser.add_argument('-o', '--output', default='slides', help='出力ディレクトリ')
+    parser.add_argument('--pattern', default=OUTPUT_PATTERN, help='出力ファイル名 ({stem} と {index} を置き換える)')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--compression', default=None, help='preview / fast / default / archive')
+    args = parser.parse_args()
+    start = time.perf_counter()
+    decks = slides = 0
+    try:
+        for path, outputs in split_files(args.paths, args.output, args.workers, args.pattern, args.compression):
+            decks += 1
+            slides += len(outputs)
+            print("%s -> %d ファイル" % (path, len(outputs)))
+    except ValueError as e:
+        parser.error(str(e))
+    elapsed = time.perf_counter() - start
+    print("%d デッキ / %d スライドを分割しました: %s (%.2f 秒, 1枚あたり %.2f ms)"
+          % (decks, slides, args.output, elapsed, elapsed * 1000 / max(slides, 1)), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,567 @@
+"""マスターテンプレート (.pptx) のレイアウトにプレースホルダーを埋めてデッキを作るテンプレートモード
+
+描画モード (ppt.py の各ビルダー) はスライドごとに背景・ヘッダー帯・フッター帯の図形を描き、
+ランごとにフォント・サイズ・色を設定する。テンプレートモードではそれらをマスターの
+名前付きレイアウト側に持たせ、スライドはレイアウトを複製して名前付きプレースホルダー
+(title / subtitle / body / table / table2 / footer) に内容を入れるだけで作る。
+見た目 (フォント・箇条書き記号・色・表のスタイル) はレイアウトとテーマから継承される。
+
+マスターは1回だけ読み込み、レイアウト名とプレースホルダー名 → idx の対応をキャッシュする。
+デザイナーが作ったマスターを使う場合は、レイアウトとプレースホルダーに上の名前を付けておく。
+マスターを指定しない場合は ppt.py のデザインを写したマスターを build_master() で生成する。
+既存のデッキをマスターに指定した場合、そのスライドは取り除く。
+
+本文はレイアウト上の大きさに収まるかを linebreak で見積もり、収まらなければ文字サイズを
+MIN_FONT_SCALE まで縮め、それでも収まらなければ同じタイトルの続きのスライドに分ける。
+build は保存したデッキのはみ出しを layout_lint で検査し、問題があれば終了コード 1 で終わる。
+
+使い方:
+    python templates.py master proposal_master.pptx       # 既定のマスターを書き出す
+    python templates.py build project_proposal.pptx -o templated.pptx [--template master.pptx]
+    python templates.py bench project_proposal.pptx       # 描画モードとの生成時間の比較
+"""
+import copy
+import functools
+import io
+import sys
+import time
+
+from lxml import etree
+from pptx import Presentation
+from pptx.enum.shapes import PP_PLACEHOLDER
+from pptx.enum.text import MSO_AUTO_SIZE
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml.ns import qn
+from pptx.util import Emu, Inches, Pt
+
+from model import Paragraph
+
+_NSDECL = ('xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+           'xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main"')
+
+SLIDE_WIDTH = Inches(13.33)
+SLIDE_HEIGHT = Inches(7.5)
+
+# テーマの配色とフォント (ppt.py の ColorPalette / TITLE_FONT / BODY_FONT に合わせる)
+THEME_COLORS = {'dk1': '000000', 'lt1': 'FFFFFF', 'dk2': '323232', 'lt2': 'F0F0F0', 'accent1': '282828'}
+THEME_FONT = 'Lato'
+
+# 文字スタイル: (サイズ[pt], 太字, 色)
+_STYLES = {
+    'cover': (42, True, '000000'),
+    'heading': (30, True, 'FFFFFF'),
+    'subtitle': (14, False, '646464'),
+    'body': (14, False, '000000'),
+    'footer': (12, False, '646464'),
+}
+
+_FOOTER_BAR = ('rect', 0, 7.2, 13.33, 0.3, 'F0F0F0')
+_FOOTER = ('footer', 'body', 0.5, 7.15, 11.83, 0.3, 'footer')
+_HEADER_BAR = ('rect', 0, 0, 13.33, 1.0, '000000')
+_TITLE = ('title', 'title', 0.5, 0.2, 12.0, 0.6, 'heading')
+
+# レイアウト名 → 背景色と、下から順に重ねる図形 (装飾の矩形とプレースホルダー)
+# 矩形は ('rect', x, y, w, h, 色)、プレースホルダーは (名前, 種類, x, y, w, h, 文字スタイル)。位置はインチ
+LAYOUTS = {
+    'Title': ('FFFFFF', [
+        ('rect', 1.0, 2.0, 6.0, 0.05, '323232'),
+        ('title', 'title', 1.0, 2.3, 10.0, 2.0, 'cover'),
+        ('subtitle', 'body', 1.0, 5.0, 11.0, 0.5, 'subtitle'),
+        _FOOTER_BAR, _FOOTER,
+    ]),
+    'Content': ('FFFFFF', [
+        _HEADER_BAR, _TITLE,
+        ('body', 'body', 0.75, 1.3, 11.8, 5.6, 'body'),
+        _FOOTER_BAR, _FOOTER,
+    ]),
+    'Table': ('FFFFFF', [
+        _HEADER_BAR, _TITLE,
+        ('table', 'tbl', 0.75, 1.3, 11.8, 5.6, 'body'),
+        _FOOTER_BAR, _FOOTER,
+    ]),
+    'Content and Table': ('FFFFFF', [
+        _HEADER_BAR, _TITLE,
+        ('body', 'body', 0.75, 1.2, 11.8, 2.7, 'body'),
+        ('table', 'tbl', 0.75, 4.0, 5.8, 2.9, 'body'),
+        ('table2', 'tbl', 6.75, 4.0, 5.8, 2.9, 'body'),
+        _FOOTER_BAR, _FOOTER,
+    ]),
+}
+
+# 箇条書きのレベルごとの記号と左余白 (インチ)。レベル 0 は記号なし
+_BULLETS = [(None, 0.0), ('•', 0.3), ('-', 0.6)]
+
+# 本文がプレースホルダーに収まらないときに文字を縮める下限の倍率と刻み。
+# 下限まで縮めても収まらない本文は同じタイトルの続きのスライドに分ける
+MIN_FONT_SCALE = 0.7
+FONT_SCALE_STEP = 0.05
+# 高さの見積もりの誤差として許す超過 (1行に満たない差で縮めたり分けたりしない)
+FIT_TOLERANCE = Inches(0.1)
+# レイアウトに文字サイズの指定が無い場合 (マスターの既定)
+_DEFAULT_SIZE = Pt(18)
+# bodyPr の既定の余白 (左, 上, 右, 下)
+_DEFAULT_INSETS = (91440, 45720, 91440, 45720)
+
+
+def _level_xml(level, style):
+    size, bold, color = _STYLES[style]
+    char, margin = _BULLETS[level] if style == 'body' else (None, 0.0)
+    if char is None:
+        bullet = '<a:buNone/>'
+        indent = 'marL="%d" indent="0"' % Inches(margin)
+    else:
+        bullet = '<a:buFontTx/><a:buChar char="%s"/>' % char
+        indent = 'marL="%d" indent="%d"' % (Inches(margin + 0.25), -Inches(0.25))
+    return ('<a:lvl%dpPr %s><a:spcBef><a:spcPts val="0"/></a:spcBef><a:spcAft><a:spcPts val="800"/></a:spcAft>'
+            '%s<a:defRPr sz="%d" b="%d"><a:solidFill><a:srgbClr val="%s"/></a:solidFill>'
+            '<a:latin typeface="%s"/></a:defRPr></a:lvl%dpPr>'
+            % (level + 1, indent, bullet, size * 100, int(bold), color, THEME_FONT, level + 1))
+
+
+def _xfrm(x, y, w, h):
+    return ('<a:xfrm><a:off x="%d" y="%d"/><a:ext cx="%d" cy="%d"/></a:xfrm>'
+            % (Inches(x), Inches(y), Inches(w), Inches(h)))
+
+
+def _rect_xml(shape_id, x, y, w, h, color):
+    return ('<p:sp %s><p:nvSpPr><p:cNvPr id="%d" name="Decoration %d"/><p:cNvSpPr/><p:nvPr userDrawn="1"/></p:nvSpPr>'
+            '<p:spPr>%s<a:prstGeom prst="rect"><a:avLst/></a:prstGeom>'
+            '<a:solidFill><a:srgbClr val="%s"/></a:solidFill><a:ln><a:noFill/></a:ln></p:spPr></p:sp>'
+            % (_NSDECL, shape_id, shape_id, _xfrm(x, y, w, h), color))
+
+
+def _placeholder_xml(shape_id, idx, name, ph_type, x, y, w, h, style):
+    ph = '<p:ph type="title"/>' if ph_type == 'title' else '<p:ph type="%s" idx="%d"/>' % (ph_type, idx)
+    anchor = ' anchor="ctr"' if style in ('heading', 'footer') else ''
+    levels = ''.join(_level_xml(level, style) for level in range(len(_BULLETS) if style == 'body' else 1))
+    return ('<p:sp %s><p:nvSpPr><p:cNvPr id="%d" name="%s"/><p:cNvSpPr><a:spLocks noGrp="1"/></p:cNvSpPr>'
+            '<p:nvPr>%s</p:nvPr></p:nvSpPr><p:spPr>%s</p:spPr>'
+            '<p:txBody><a:bodyPr wrap="square" lIns="0" rIns="0"%s/><a:lstStyle>%s</a:lstStyle>'
+            '<a:p><a:r><a:rPr lang="en-US"/><a:t>%s</a:t></a:r></a:p></p:txBody></p:sp>'
+            % (_NSDECL, shape_id, name, ph, _xfrm(x, y, w, h), anchor, levels, name))
+
+
+def _background_xml(color):
+    return ('<p:bg %s><p:bgPr><a:solidFill><a:srgbClr val="%s"/></a:solidFill><a:effectLst/></p:bgPr></p:bg>'
+            % (_NSDECL, color))
+
+
+def _set_layout(layout, name, background, shapes):
+    """既定のレイアウトの中身を LAYOUTS の定義で置き換える"""
+    cSld = layout._element.cSld
+    cSld.set('name', name)
+    for bg in cSld.findall(qn('p:bg')):
+        cSld.remove(bg)
+    cSld.insert(0, etree.fromstring(_background_xml(background)))
+    spTree = cSld.spTree
+    for sp in list(spTree)[2:]:  # nvGrpSpPr と grpSpPr 以外を取り除く
+        spTree.remove(sp)
+    idx = 1
+    for shape_id, spec in enumerate(shapes, 2):
+        if spec[0] == 'rect':
+            spTree.append(etree.fromstring(_rect_xml(shape_id, *spec[1:])))
+            continue
+        ph_name, ph_type = spec[0], spec[1]
+        if ph_type != 'title':
+            idx += 1
+        spTree.append(etree.fromstring(_placeholder_xml(shape_id, idx, ph_name, *spec[1:])))
+
+
+def _set_theme(master):
+    theme_part = master.part.part_related_by(RT.THEME)
+    theme = etree.fromstring(theme_part.blob)
+    scheme = theme.find('.//' + qn('a:clrScheme'))
+    for name, value in THEME_COLORS.items():
+        slot = scheme.find(qn('a:' + name))
+        for child in list(slot):
+            slot.remove(child)
+        etree.SubElement(slot, qn('a:srgbClr')).set('val', value)
+    for font in theme.findall('.//%s/%s' % (qn('a:fontScheme'), '*') + '/' + qn('a:latin')):
+        font.set('typeface', THEME_FONT)
+    theme_part._blob = etree.tostring(theme, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+
+def build_master():
+    """ppt.py のデザインを写したマスター (.pptx のバイト列) を生成する"""
+    prs = Presentation()
+    prs.slide_width = SLIDE_WIDTH
+    prs.slide_height = SLIDE_HEIGHT
+    _set_theme(prs.slide_masters[0])
+    layouts = list(prs.slide_layouts)
+    for layout, (name, (background, shapes)) in zip(layouts, LAYOUTS.items()):
+        _set_layout(layout, name, background, shapes)
+    for layout in layouts[len(LAYOUTS):]:
+        prs.slide_layouts.remove(layout)
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    return buffer.getvalue()
+
+
+def _text_box(sp):
+    """レイアウトのプレースホルダーから本文の (幅, 高さ, 文字サイズ, 段落後の間隔, 余白) を EMU で返す
+
+    位置を持たないプレースホルダー (マスターから継承するもの) は None。
+    """
+    ext = sp.find('%s/%s/%s' % (qn('p:spPr'), qn('a:xfrm'), qn('a:ext')))
+    if ext is None:
+        return None
+    body_pr = sp.find('%s/%s' % (qn('p:txBody'), qn('a:bodyPr')))
+    insets = [int(body_pr.get(name, default)) if body_pr is not None else default
+              for name, default in zip(('lIns', 'tIns', 'rIns', 'bIns'), _DEFAULT_INSETS)]
+    level = sp.find('%s/%s/%s' % (qn('p:txBody'), qn('a:lstStyle'), qn('a:lvl1pPr')))
+    size, space_after = _DEFAULT_SIZE, 0
+    if level is not None:
+        def_rpr = level.find(qn('a:defRPr'))
+        if def_rpr is not None and def_rpr.get('sz'):
+            size = Pt(int(def_rpr.get('sz')) / 100)
+        spc = level.find('%s/%s' % (qn('a:spcAft'), qn('a:spcPts')))
+        if spc is not None:
+            space_after = Pt(int(spc.get('val')) / 100)
+    return (int(ext.get('cx')) - insets[0] - insets[2], int(ext.get('cy')) - insets[1] - insets[3],
+            size, space_after, tuple(insets))
+
+
+def _remove_slides(prs):
+    """プレゼンテーションからすべてのスライドとそのリレーションを取り除く"""
+    sld_id_lst = prs.slides._sldIdLst
+    for sld_id in list(sld_id_lst):
+        prs.part.drop_rel(sld_id.rId)
+        sld_id_lst.remove(sld_id)
+
+
+class Template:
+    """マスター .pptx を1回だけ読み込み、レイアウト名とプレースホルダー名の対応をキャッシュする
+
+    path を省略すると build_master() で生成したマスターを使う。
+    """
+
+    def __init__(self, path=None):
+        if path is None:
+            self._blob = build_master()
+            prs = Presentation(io.BytesIO(self._blob))
+        else:
+            prs = Presentation(path)
+            if len(prs.slides):
+                # 既存のデッキをテンプレートにした場合はスライドを取り除き、マスターだけにする
+                _remove_slides(prs)
+                buffer = io.BytesIO()
+                prs.save(buffer)
+                self._blob = buffer.getvalue()
+            else:
+                with open(path, 'rb') as f:
+                    self._blob = f.read()
+        self.slide_width = prs.slide_width
+        self.slide_height = prs.slide_height
+        # レイアウト名 → (レイアウトの番号, {プレースホルダー名: idx})
+        self.layouts = {}
+        # レイアウト名 → {idx: レイアウト上の位置 (a:xfrm)}
+        self._xfrms = {}
+        # レイアウト名 → {idx: 本文の (幅, 高さ, 文字サイズ, 段落後の間隔, 余白)}
+        self._boxes = {}
+        for index, layout in enumerate(prs.slide_layouts):
+            placeholders = {ph.name: ph.placeholder_format.idx for ph in layout.placeholders}
+            self.layouts[layout.name] = (index, placeholders)
+            self._xfrms[layout.name] = {ph.placeholder_format.idx: ph._element.spPr.find(qn('a:xfrm'))
+                                        for ph in layout.placeholders}
+            self._boxes[layout.name] = {ph.placeholder_format.idx: _text_box(ph._element)
+                                        for ph in layout.placeholders}
+
+    def text_box(self, layout_name, name):
+        """レイアウトのプレースホルダー name の本文の (幅, 高さ, 文字サイズ, 段落後の間隔, 余白)
+
+        レイアウトやプレースホルダーが無い場合と、位置をマスターから継承する場合は None。
+        """
+        index, placeholders = self.layouts.get(layout_name, (None, {}))
+        if name not in placeholders:
+            return None
+        return self._boxes[layout_name][placeholders[name]]
+
+    def new_presentation(self):
+        """マスターだけを持つ新しいプレゼンテーションを返す"""
+        return Presentation(io.BytesIO(self._blob))
+
+    def add_slide(self, prs, layout_name, **content):
+        """レイアウトを複製したスライドを追加し、content のプレースホルダーを埋める
+
+        値は文字列・段落 (model.Paragraph か文字列) のリスト・表 (model.Table か文字列の行のリスト)。
+        埋めなかったプレースホルダーは削除する。テキストのプレースホルダーにはレイアウト上の
+        位置を書き込むので、継承を解決しないツール (shape_records など) でも位置が分かる。
+        """
+        try:
+            index, placeholders = self.layouts[layout_name]
+        except KeyError:
+            raise ValueError("テンプレートに無いレイアウトです: %s" % layout_name)
+        for name in content:
+            if name not in placeholders:
+                raise ValueError("レイアウト %s にプレースホルダー %s がありません" % (layout_name, name))
+        xfrms = self._xfrms[layout_name]
+        boxes = self._boxes[layout_name]
+        slide = prs.slides.add_slide(prs.slide_layouts[index])
+        for name, idx in placeholders.items():
+            placeholder = slide.placeholders[idx]
+            if name not in content:
+                placeholder._element.getparent().remove(placeholder._element)
+            elif placeholder.placeholder_format.type == PP_PLACEHOLDER.TABLE:
+                fill_table(placeholder, content[name])
+            else:
+                if xfrms[idx] is not None:
+                    placeholder._element.spPr.insert(0, copy.deepcopy(xfrms[idx]))
+                fill_text(placeholder, content[name], boxes[idx])
+        return slide
+
+
+@functools.lru_cache(maxsize=None)
+def load_template(path=None):
+    """パスごとに1回だけ読み込んだ Template を返す"""
+    return Template(path)
+
+
+def fill_text(placeholder, value, box=None):
+    """プレースホルダーに文字列または段落のリストを入れる (書式はレイアウトから継承する)
+
+    box (Template.text_box の戻り値) を渡すと、本文の高さを linebreak で見積もり、収まらなければ
+    文字サイズと段落後の間隔を収まる倍率まで縮めて明示する (自動調整も有効にする)。
+    MIN_FONT_SCALE まで縮めても収まらない本文は、呼び出し側で paginate_paragraphs() で分けておく。
+    """
+    tf = placeholder.text_frame
+    if isinstance(value, str):
+        tf.text = value
+        value = [Paragraph.of(line) for line in value.split('\n')]
+    else:
+        value = [Paragraph.of(item) if isinstance(item, str) else item for item in value]
+        for i, item in enumerate(value):
+            p = tf.paragraphs[0] if i == 0 else tf.add_paragraph()
+            p.text = item.text
+            if item.level:
+                p.level = item.level
+            if item.heading and p.runs:
+                p.runs[0].font.bold = True
+    if box is not None:
+        scale = fit_scale(value, box) or MIN_FONT_SCALE
+        if scale < 1:
+            _shrink(tf, box, scale)
+
+
+def _text_height(paragraphs, width, size, space_after):
+    """段落の高さの合計 (最後の段落の後の間隔は含まない)"""
+    from linebreak import paragraph_height
+    return (sum(paragraph_height(item.text, width, size, item.heading, item.level) for item in paragraphs)
+            + space_after * max(len(paragraphs) - 1, 0))
+
+
+def fit_scale(paragraphs, box):
+    """段落 (model.Paragraph) が box に収まる文字の倍率 (1 なら縮めなくてよい)
+
+    MIN_FONT_SCALE まで縮めても収まらない場合は None を返す。
+    """
+    width, height, size, space_after, _ = box
+    scale = 1.0
+    while scale >= MIN_FONT_SCALE:
+        if _text_height(paragraphs, width, int(size * scale), int(space_after * scale)) <= height + FIT_TOLERANCE:
+            return scale
+        scale = round(scale - FONT_SCALE_STEP, 2)
+    return None
+
+
+def paginate_paragraphs(paragraphs, box):
+    """段落 (model.Paragraph) を box に等倍で収まるページ (段落のリスト) に分ける
+
+    分け方は linebreak.paginate() と同じ (段落の途中では分けず、見出しはページの最後に残さない)。
+    """
+    from linebreak import paginate
+    width, height, size, space_after, _ = box
+    texts = [item.to_text() for item in paragraphs]
+    pages, start = [], 0
+    for page in paginate(texts, width, height + FIT_TOLERANCE, size, space_after, 0, 0):
+        pages.append(paragraphs[start:start + len(page)])
+        start += len(page)
+    return pages
+
+
+def _shrink(tf, box, scale):
+    """全段落の文字サイズと段落後の間隔を scale 倍で明示する
+
+    レイアウトの余白も明示し、継承を解決しないツール (layout_lint など) の見積もりと合わせる。
+    """
+    _, _, size, space_after, insets = box
+    tf.auto_size = MSO_AUTO_SIZE.TEXT_TO_FIT_SHAPE
+    tf.margin_left, tf.margin_top, tf.margin_right, tf.margin_bottom = (Emu(inset) for inset in insets)
+    paragraphs = tf.paragraphs
+    for i, p in enumerate(paragraphs):
+        # 最後の段落の後の間隔は高さに含めていないので 0 にする
+        p.space_after = Emu(int(space_after * scale) if i < len(paragraphs) - 1 else 0)
+        for run in p.runs:
+            run.font.size = Pt(int(size * scale / 12700 * 2) / 2)
+
+
+def fill_table(placeholder, table):
+    """表のプレースホルダーに表を挿入する (スタイルはテーマの表スタイルに任せる)"""
+    rows = [[cell.text for cell in row] for row in table.rows] if hasattr(table, 'rows') else table
+    n_cols = max(len(row) for row in rows)
+    graphic_table = placeholder.insert_table(len(rows), n_cols).table
+    for r, row in enumerate(rows):
+        for c, text in enumerate(row):
+            graphic_table.cell(r, c).text = text
+
+
+def _body(blocks):
+    paragraphs = []
+    for block in blocks:
+        if block.kind == 'text':
+            paragraphs.extend(Paragraph.of(p.text, heading=True) for p in block.paragraphs)
+        else:
+            paragraphs.extend(block.paragraphs)
+    return paragraphs
+
+
+def _footer(model_slide, current_slide, total_slides):
+    return "%s | %d/%d" % (model_slide.footer or "Your Company Name | Project Proposal", current_slide, total_slides)
+
+
+def _content_pages(template, title, body):
+    """本文を 'Content' レイアウトの (レイアウト名, content) のページに分ける"""
+    box = template.text_box('Content', 'body')
+    if box is None or fit_scale(body, box) is not None:
+        return [('Content', {'title': title, 'body': body})]
+    return [('Content', {'title': title, 'body': page}) for page in paginate_paragraphs(body, box)]
+
+
+def plan_model_slide(template, model_slide, first=False):
+    """model.Slide の内容に合うレイアウトを選び、(レイアウト名, content, 追加の表) のリストを返す
+
+    本文が MIN_FONT_SCALE まで縮めても収まらない場合は、同じタイトルの 'Content' スライドに
+    分け、表はその後ろのスライドに置く。表が2つを超える場合、3つ目以降は最後のスライドの
+    元の位置に通常の表として描く。
+    """
+    tables = [block for block in model_slide.blocks if block.kind == 'table']
+    texts = [block for block in model_slide.blocks if block.kind != 'table']
+    title = model_slide.title or ''
+    if first and not tables:
+        subtitle = ' '.join(p.text for block in texts for p in block.paragraphs)
+        return [('Title', {'title': title, 'subtitle': subtitle}, [])]
+    if not tables:
+        return [(layout, content, []) for layout, content in _content_pages(template, title, _body(texts))]
+    if not texts and len(tables) == 1:
+        return [('Table', {'title': title, 'table': tables[0]}, [])]
+    pages = []
+    content = {'title': title, 'table': tables[0]}
+    if texts:
+        body = _body(texts)
+        box = template.text_box('Content and Table', 'body')
+        if box is None or fit_scale(body, box) is not None:
+            content['body'] = body
+        else:
+            pages = [(layout, page, []) for layout, page in _content_pages(template, title, body)]
+    if len(tables) > 1:
+        content['table2'] = tables[1]
+        pages.append(('Content and Table', content, tables[2:]))
+    else:
+        pages.append(('Content and Table' if 'body' in content else 'Table', content, []))
+    return pages
+
+
+def _add_page(template, prs, page, footer):
+    layout, content, extra_tables = page
+    slide = template.add_slide(prs, layout, footer=footer, **content)
+    for table in extra_tables:
+        graphic = slide.shapes.add_table(*table.shape, table.x, table.y, table.w, table.h).table
+        for r, row in enumerate(table.rows):
+            for c, cell in enumerate(row):
+                graphic.cell(r, c).text = cell.text
+    return slide
+
+
+def add_model_slide(template, prs, model_slide, current_slide, total_slides):
+    """model.Slide を plan_model_slide() のページに分けてスライドを追加し、追加したスライドのリストを返す
+
+    フッターのページ番号は current_slide から順に付ける (total_slides は分けた後の総数)。
+    """
+    pages = plan_model_slide(template, model_slide, current_slide == 1)
+    return [_add_page(template, prs, page, _footer(model_slide, current_slide + offset, total_slides))
+            for offset, page in enumerate(pages)]
+
+
+def build_from_model(deck, template=None):
+    """model.Deck からテンプレートモードでデッキを組み立てる
+
+    本文を続きのスライドに分けた場合も、フッターのページ番号は分けた後の枚数で付ける。
+    """
+    template = template or load_template()
+    prs = template.new_presentation()
+    plans = [plan_model_slide(template, model_slide, i == 0) for i, model_slide in enumerate(deck.slides)]
+    total_slides = sum(len(pages) for pages in plans)
+    current_slide = 1
+    for model_slide, pages in zip(deck.slides, plans):
+        for page in pages:
+            _add_page(template, prs, page, _footer(model_slide, current_slide, total_slides))
+            current_slide += 1
+    return prs
+
+
+def _shape_count(prs):
+    return sum(len(slide.shapes) for slide in prs.slides) / max(len(prs.slides), 1)
+
+
+def benchmark(path, repeat=5, template_path=None):
+    """描画モード (ppt.build_from_model) とテンプレートモードの生成時間の中央値 [秒] と
+    スライドあたりの図形数を {モード: (秒, 図形数)} で返す"""
+    import ppt
+    from deck_reader import read_deck
+    deck = read_deck(path)
+    start = time.perf_counter()
+    template = load_template(template_path)
+    load_seconds = time.perf_counter() - start
+    modes = {'draw': ppt.build_from_model, 'template': lambda d: build_from_model(d, template)}
+    results = {}
+    for name, build in modes.items():
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            prs = build(deck)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        results[name] = (timings[len(timings) // 2], _shape_count(prs))
+    results['template (load)'] = (load_seconds, None)
+    return results
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='マスターテンプレートのプレースホルダーを埋めてデッキを作る')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('master', help='既定のマスター (.pptx) を書き出す')
+    p.add_argument('output')
+    p = sub.add_parser('build', help='既存デッキの内容をテンプレートモードで作り直す')
+    p.add_argument('deck')
+    p.add_argument('-o', '--output', required=True)
+    p.add_argument('--template', default=None)
+    p = sub.add_parser('bench', help='描画モードとテンプレートモードを比較する')
+    p.add_argument('deck')
+    p.add_argument('--template', default=None)
+    p.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.command == 'master':
+        with open(args.output, 'wb') as f:
+            f.write(build_master())
+        print("マスターを書き出しました: %s" % args.output)
+    elif args.command == 'build':
+        from deck_reader import read_deck
+        from layout_lint import format_issue, lint_presentation
+        from saver import save_presentation
+        prs = build_from_model(read_deck(args.deck), load_template(args.template))
+        save_presentation(prs, args.output)
+        print("テンプレートモードで作成しました: %s (%d スライド)" % (args.output, len(prs.slides)))
+        issues = lint_presentation(prs, overflow=True)
+        for issue in issues:
+            print("%s %s" % (args.output, format_issue(issue)), file=sys.stderr)
+        if issues:
+            sys.exit(1)
+    else:
+        print("%-16s %10s %12s" % ('mode', 'build[ms]', 'shapes/slide'))
+        for name, (seconds, shapes) in benchmark(args.deck, args.repeat, args.template).items():
+            print("%-16s %10.2f %12s" % (name, seconds * 1000, '-' if shapes is None else '%.1f' % shapes))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,310 @@
+"""Pillow だけでスライドのサムネイル(PNG)を描画する軽量ラスタライザ
+
+Office スイートを使わずに、このプロジェクトが生成する図形
+(矩形・角丸矩形・楕円・矢印、単色/グラデーション塗り、折り返し付きテキスト、テーブル)
+を描画する。入力は shape_records のレコードなので、.pptx 以外の配置データからも描ける。
+
+使い方:
+    python thumbnail.py project_proposal.pptx thumbnails/ --width 480 --workers 4
+"""
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageDraw, ImageFont
+from pptx import Presentation
+
+from shape_records import EMU_PER_PT, presentation_records
+
+THUMBNAIL_WIDTH = 320
+BACKGROUND = (255, 255, 255)
+LINE_SPACING = 1.2
+LEVEL_INDENT = 457200  # 段落レベルごとの字下げ (EMU)
+
+# 日本語グリフを含むフォントを優先して探す (環境変数で上書き可能)
+FONT_CANDIDATES = [
+    os.environ.get('PPT_THUMBNAIL_FONT', ''),
+    '/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc',
+    '/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc',
+    '/usr/share/fonts/truetype/fonts-japanese-gothic.ttf',
+    '/System/Library/Fonts/ヒラギノ角ゴシック W3.ttc',
+    '/System/Library/Fonts/Hiragino Sans GB.ttc',
+    'C:/Windows/Fonts/meiryo.ttc',
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+]
+BOLD_FONT_CANDIDATES = [
+    os.environ.get('PPT_THUMBNAIL_BOLD_FONT', ''),
+    '/usr/share/fonts/opentype/noto/NotoSansCJK-Bold.ttc',
+    '/usr/share/fonts/noto-cjk/NotoSansCJK-Bold.ttc',
+    '/System/Library/Fonts/ヒラギノ角ゴシック W6.ttc',
+    'C:/Windows/Fonts/meiryob.ttc',
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',
+]
+
+# 英単語・空白はまとめて、それ以外 (CJK など) は1文字ずつ折り返し単位にする
+_TOKEN_RE = re.compile(r'[A-Za-z0-9\u00C0-\u024F.,:;!?%¥$()\'"/&+\-]+|\s+|.', re.S)
+
+_font_path_cache = {}
+_local = threading.local()
+
+
+def _find_font_path(bold):
+    if bold not in _font_path_cache:
+        candidates = BOLD_FONT_CANDIDATES + FONT_CANDIDATES if bold else FONT_CANDIDATES
+        _font_path_cache[bold] = next((p for p in candidates if p and os.path.exists(p)), None)
+    return _font_path_cache[bold]
+
+
+def get_font(size_px, bold=False):
+    """ピクセルサイズのフォントを返す (FreeType オブジェクトはスレッドごとにキャッシュ)"""
+    cache = getattr(_local, 'fonts', None)
+    if cache is None:
+        cache = _local.fonts = {}
+    key = (max(int(round(size_px)), 1), bold)
+    font = cache.get(key)
+    if font is None:
+        path = _find_font_path(bold)
+        if path:
+            font = ImageFont.truetype(path, key[0])
+        else:
+            font = ImageFont.load_default(key[0])
+        cache[key] = font
+    return font
+
+
+def _rgb(color):
+    return tuple(color) if color is not None else None
+
+
+def _shape_mask(geom, size):
+    """図形の形状マスク ('L' 画像) を作る"""
+    w, h = size
+    mask = Image.new('L', size, 0)
+    draw = ImageDraw.Draw(mask)
+    draw_geometry(draw, geom, (0, 0, w - 1, h - 1), fill=255)
+    return mask
+
+
+def _arrow_points(geom, x0, y0, x1, y1):
+    w, h = x1 - x0, y1 - y0
+    if geom in ('rightArrow', 'leftArrow'):
+        head = min(w, h / 2)
+        t, b = y0 + h / 4, y1 - h / 4
+        if geom == 'rightArrow':
+            return [(x0, t), (x1 - head, t), (x1 - head, y0), (x1, y0 + h / 2),
+                    (x1 - head, y1), (x1 - head, b), (x0, b)]
+        return [(x1, t), (x0 + head, t), (x0 + head, y0), (x0, y0 + h / 2),
+                (x0 + head, y1), (x0 + head, b), (x1, b)]
+    head = min(h, w / 2)
+    l, r = x0 + w / 4, x1 - w / 4
+    if geom == 'downArrow':
+        return [(l, y0), (r, y0), (r, y1 - head), (x1, y1 - head), (x0 + w / 2, y1),
+                (x0, y1 - head), (l, y1 - head)]
+    return [(l, y1), (r, y1), (r, y0 + head), (x1, y0 + head), (x0 + w / 2, y0),
+            (x0, y0 + head), (l, y0 + head)]
+
+
+def draw_geometry(draw, geom, box, fill=None, outline=None, width=1):
+    """プリセット形状を描く。未対応の形状は外接矩形で代用する"""
+    x0, y0, x1, y1 = box
+    if geom == 'roundRect':
+        radius = int(min(x1 - x0, y1 - y0) * 0.16667)
+        draw.rounded_rectangle(box, radius=radius, fill=fill, outline=outline, width=width)
+    elif geom == 'ellipse':
+        draw.ellipse(box, fill=fill, outline=outline, width=width)
+    elif geom in ('rightArrow', 'leftArrow', 'downArrow', 'upArrow'):
+        points = _arrow_points(geom, x0, y0, x1, y1)
+        draw.polygon(points, fill=fill, outline=outline, width=width)
+    else:
+        draw.rectangle(box, fill=fill, outline=outline, width=width)
+
+
+def _gradient_layer(gradient, size):
+    """線形グラデーション (両端の色の補間) を size の画像として作る"""
+    stops = sorted(gradient['stops'])
+    start, end = _rgb(stops[0][1]), _rgb(stops[-1][1])
+    # OOXML の角度は x 軸から時計回り。linear_gradient は上→下 (90度) なので差分だけ回し、
+    # 回転で欠けた四隅を避けるため中央の正方形を切り出す
+    ramp = Image.linear_gradient('L').rotate(90 - gradient['angle'], resample=Image.BILINEAR, expand=True)
+    side = int(256 / 2 ** 0.5)
+    cx, cy = ramp.width // 2, ramp.height // 2
+    ramp = ramp.crop((cx - side // 2, cy - side // 2, cx + side // 2, cy + side // 2)).resize(size, Image.BILINEAR)
+    return Image.composite(Image.new('RGB', size, end), Image.new('RGB', size, start), ramp)
+
+
+def _paint_shape(image, draw, record, scale):
+    x0 = int(record['x'] * scale)
+    y0 = int(record['y'] * scale)
+    x1 = int((record['x'] + record['w']) * scale)
+    y1 = int((record['y'] + record['h']) * scale)
+    if x1 <= x0 or y1 <= y0:
+        return
+    geom = record.get('geom', 'rect')
+    fill = _rgb(record.get('fill'))
+    alpha = record.get('alpha', 1.0)
+    gradient = record.get('gradient')
+    if gradient or (fill is not None and alpha < 1.0):
+        size = (x1 - x0 + 1, y1 - y0 + 1)
+        layer = _gradient_layer(gradient, size) if gradient else Image.new('RGB', size, fill)
+        mask = _shape_mask(geom, size)
+        if alpha < 1.0:
+            mask = mask.point(lambda v: int(v * alpha))
+        image.paste(layer, (x0, y0), mask)
+    elif fill is not None:
+        draw_geometry(draw, geom, (x0, y0, x1, y1), fill=fill)
+    line = record.get('line')
+    if line:
+        width = max(1, int(round(line['width'] * scale)))
+        draw_geometry(draw, geom, (x0, y0, x1, y1), outline=_rgb(line['color']), width=width)
+
+
+def _layout_paragraph(para, max_width, scale, wrap):
+    """段落を行に分割する。各行は [(テキスト, フォント, 色), ...] と行幅・行高のタプル"""
+    lines = []
+    line, line_width, line_height = [], 0.0, 0.0
+    for run in para['runs']:
+        size_px = run['size'] * EMU_PER_PT * scale
+        font = get_font(size_px, run.get('bold', False))
+        color = _rgb(run['color'])
+        for token in _TOKEN_RE.findall(run['text']):
+            if token == '\n':
+                lines.append((line, line_width, line_height or size_px * LINE_SPACING))
+                line, line_width, line_height = [], 0.0, 0.0
+                continue
+            token_width = font.getlength(token)
+            if wrap and line and line_width + token_width > max_width and not token.isspace():
+                lines.append((line, line_width, line_height))
+                line, line_width, line_height = [], 0.0, 0.0
+            if not line and token.isspace():
+                continue
+            line.append((token, font, color))
+            line_width += token_width
+            line_height = max(line_height, size_px * LINE_SPACING)
+    if line or not lines:
+        fallback = para['runs'][0]['size'] if para['runs'] else 18.0
+        lines.append((line, line_width, line_height or fallback * EMU_PER_PT * scale * LINE_SPACING))
+    return lines
+
+
+def draw_text(draw, paragraphs, box, scale, insets=(91440, 45720, 91440, 45720), anchor='t', wrap=True):
+    """段落レコードを box (ピクセル) 内に描画する"""
+    x0, y0, x1, y1 = box
+    left = x0 + insets[0] * scale
+    top = y0 + insets[1] * scale
+    right = x1 - insets[2] * scale
+    bottom = y1 - insets[3] * scale
+    blocks = []
+    total_height = 0.0
+    for i, para in enumerate(paragraphs):
+        indent = para.get('level', 0) * LEVEL_INDENT * scale
+        lines = _layout_paragraph(para, max(right - left - indent, 1), scale, wrap)
+        before = para.get('space_before', 0.0) * EMU_PER_PT * scale if i > 0 else 0.0
+        after = para.get('space_after', 0.0) * EMU_PER_PT * scale
+        blocks.append((para, indent, before, lines))
+        total_height += before + sum(h for _, _, h in lines) + after
+    if anchor == 'ctr':
+        y = top + (bottom - top - total_height) / 2
+    elif anchor == 'b':
+        y = bottom - total_height
+    else:
+        y = top
+    for para, indent, before, lines in blocks:
+        y += before
+        for tokens, line_width, line_height in lines:
+            align = para.get('align', 'l')
+            if align == 'ctr':
+                x = left + indent + (right - left - indent - line_width) / 2
+            elif align == 'r':
+                x = right - line_width
+            else:
+                x = left + indent
+            for text, font, color in tokens:
+                draw.text((x, y + line_height * 0.1), text, font=font, fill=color)
+                x += font.getlength(text)
+            y += line_height
+        y += para.get('space_after', 0.0) * EMU_PER_PT * scale
+
+
+def _paint_table(draw, record, scale):
+    table = record['table']
+    col_x = [record['x']]
+    for w in table['cols']:
+        col_x.append(col_x[-1] + w)
+    y = record['y']
+    for row_height, row in zip(table['rows'], table['cells']):
+        for ci, cell in enumerate(row[:len(table['cols'])]):
+            box = (int(col_x[ci] * scale), int(y * scale),
+                   int(col_x[ci + 1] * scale), int((y + row_height) * scale))
+            if cell['fill']:
+                draw.rectangle(box, fill=_rgb(cell['fill']), outline=BACKGROUND)
+            draw_text(draw, cell['paragraphs'], box, scale)
+        y += row_height
+
+
+def render_records(records, slide_width, slide_height, width=THUMBNAIL_WIDTH):
+    """1スライド分のレコードを描画して PIL.Image を返す"""
+    scale = width / slide_width
+    height = max(int(round(slide_height * scale)), 1)
+    image = Image.new('RGB', (width, height), BACKGROUND)
+    draw = ImageDraw.Draw(image)
+    for record in records:
+        if record['kind'] == 'table':
+            _paint_table(draw, record, scale)
+            continue
+        _paint_shape(image, draw, record, scale)
+        if record.get('paragraphs'):
+            box = (record['x'] * scale, record['y'] * scale,
+                   (record['x'] + record['w']) * scale, (record['y'] + record['h']) * scale)
+            draw_text(draw, record['paragraphs'], box, scale, record.get('insets', (91440, 45720, 91440, 45720)),
+                      record.get('anchor', 't'), record.get('wrap', True))
+    return image
+
+
+def render_presentation(prs, width=THUMBNAIL_WIDTH, workers=None):
+    """Presentation (またはファイルパス) の全スライドを描画し、画像のリストを返す
+
+    workers を指定するとスライドをスレッドプールで並列に描画する。
+    """
+    if isinstance(prs, str):
+        prs = Presentation(prs)
+    slide_width, slide_height, slides = presentation_records(prs)
+
+    def render(records):
+        return render_records(records, slide_width, slide_height, width)
+
+    if workers and workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(render, slides))
+    return [render(records) for records in slides]
+
+
+def save_thumbnails(path, out_dir, width=THUMBNAIL_WIDTH, workers=None):
+    """デッキの各スライドを out_dir/slideN.png として保存し、パスのリストを返す"""
+    os.makedirs(out_dir, exist_ok=True)
+    images = render_presentation(path, width, workers)
+    paths = []
+    for i, image in enumerate(images, 1):
+        out_path = os.path.join(out_dir, 'slide%d.png' % i)
+        image.save(out_path, optimize=False, compress_level=1)
+        paths.append(out_path)
+    return paths
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='スライドのサムネイル PNG を生成する')
+    parser.add_argument('pptx')
+    parser.add_argument('out_dir', nargs='?', default='thumbnails')
+    parser.add_argument('--width', type=int, default=THUMBNAIL_WIDTH)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+    start = time.perf_counter()
+    paths = save_thumbnails(args.pptx, args.out_dir, args.width, args.workers)
+    elapsed = time.perf_counter() - start
+    print("サムネイルを作成しました: %d 枚 (%.3f 秒) -> %s" % (len(paths), elapsed, args.out_dir))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,275 @@
+"""ビルダーのソースと差し込み値を監視し、変わったスライドだけを作り直す
+
+起動時に一度だけデッキ全体を生成し、スライドごとの XML 断片 (parallel_build.build_fragment)
+を入力の指紋と一緒に保持しておく。指紋は次の組み合わせ:
+
+- そのビルダー関数のソース (AST で比較するので空白やコメントだけの変更は無視)
+- ビルダー以外のモジュール全体 (apply_body_style などの共通部品やスタイル定数)
+- モジュールがトップレベルで import している同じディレクトリのモジュール (grid・markup・
+  linebreak・saver など) のソース。これらも監視し、変わったら import している側ごと再読み込みする
+- ビルダーが参照している PROPOSAL_FIELDS の値
+- スライドの位置と総数 (ページ番号)
+
+ファイルの変更はポーリングで検出し、連続した保存は debounce 秒静かになるまでまとめる。
+出力は同じディレクトリの一時ファイルに書いてから os.replace で置き換えるので、
+開いているビューアーが書きかけのファイルを読むことはない。
+
+使い方:
+    python doer.py watch --module ppt --fields fields.json -o project_proposal.pptx
+"""
+import ast
+import hashlib
+import importlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+from parallel_build import build_fragment, new_presentation, splice_fragment
+from saver import save_presentation
+
+
+def digest(*parts):
+    """文字列の並びの SHA-1 (16進)"""
+    h = hashlib.sha1()
+    for part in parts:
+        h.update(part.encode('utf-8'))
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+def _field_names(node):
+    """node 内で PROPOSAL_FIELDS['...'] として参照している項目名の集合"""
+    names = set()
+    for child in ast.walk(node):
+        if (isinstance(child, ast.Subscript) and isinstance(child.value, ast.Name)
+                and child.value.id == 'PROPOSAL_FIELDS' and isinstance(child.slice, ast.Constant)):
+            names.add(child.slice.value)
+    return names
+
+
+def _is_fields_assignment(node):
+    return isinstance(node, ast.Assign) and any(
+        isinstance(target, ast.Name) and target.id == 'PROPOSAL_FIELDS' for target in node.targets)
+
+
+def local_imports(path):
+    """モジュールがトップレベルで import している同じディレクトリのモジュールを推移的にたどり、
+    {パス: 直接 import しているパスのリスト} を依存先が先になる順で返す (path 自身は含まない)"""
+    directory = os.path.dirname(os.path.abspath(path))
+    graph = {}
+    visiting = set()
+
+    def visit(current):
+        visiting.add(current)
+        with open(current, encoding='utf-8') as f:
+            tree = ast.parse(f.read())
+        imports = []
+        for node in tree.body:
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and not node.level and node.module:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                dependency = os.path.join(directory, name.split('.')[0] + '.py')
+                if os.path.exists(dependency) and dependency not in imports:
+                    imports.append(dependency)
+                    if dependency not in graph and dependency not in visiting:
+                        visit(dependency)
+        graph[current] = imports
+
+    root = os.path.abspath(path)
+    visit(root)
+    del graph[root]
+    return graph
+
+
+def sources_fingerprint(paths):
+    """ソースファイルの AST から作る指紋 (空白やコメントだけの変更は無視)"""
+    parts = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            parts.append(ast.dump(ast.parse(f.read())))
+    return digest(*parts)
+
+
+def source_fingerprints(source, builder_names):
+    """モジュールのソースから (共通部分の指紋, {ビルダー名: 指紋}, {ビルダー名: 参照する差し込み項目}) を返す"""
+    tree = ast.parse(source)
+    builders, fields, shared = {}, {}, []
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name in builder_names:
+            builders[node.name] = digest(ast.dump(node))
+            fields[node.name] = sorted(_field_names(node))
+        elif _is_fields_assignment(node):
+            # 差し込み値はビルダーごとに参照している項目だけを指紋に含める
+            continue
+        else:
+            shared.append(ast.dump(node))
+            fields.setdefault(None, set()).update(_field_names(node))
+    fields[None] = sorted(fields.get(None, ()))
+    return digest(*shared), builders, fields
+
+
+class IncrementalBuilder:
+    """ビルダーの入力が変わったスライドだけを作り直して保存する"""
+
+    def __init__(self, module_name='ppt', fields_path=None, output='project_proposal.pptx'):
+        self.module_name = module_name
+        self.fields_path = fields_path
+        self.output = output
+        self.module = importlib.import_module(module_name)
+        self._fragments = {}  # 指紋 -> XML 断片
+        self._dependencies = local_imports(self.module.__file__)
+        self._source_mtimes = None
+        self._source_info = None
+        self._defaults = None
+
+    @property
+    def source_paths(self):
+        """指紋に含めるソース (モジュールと、それが import している同じディレクトリのモジュール)"""
+        return [os.path.abspath(self.module.__file__)] + list(self._dependencies)
+
+    @property
+    def watched_paths(self):
+        paths = self.source_paths
+        if self.fields_path:
+            paths.append(self.fields_path)
+        return paths
+
+    def _reload(self, changed):
+        """変わったモジュールと、それを (推移的に) import しているモジュールを依存先から順に再読み込みする"""
+        dirty = set(changed)
+        for path, imports in self._dependencies.items():
+            if path in dirty or dirty.intersection(imports):
+                dirty.add(path)
+                module = sys.modules.get(os.path.splitext(os.path.basename(path))[0])
+                if module is not None:
+                    importlib.reload(module)
+        self.module = importlib.reload(self.module)
+        self._dependencies = local_imports(self.module.__file__)
+
+    def _load(self):
+        """ソースが変わっていればモジュールを再読み込みし、差し込み値を反映する"""
+        paths = self.source_paths
+        mtimes = dict(zip(paths, _mtimes(paths)))
+        if mtimes != self._source_mtimes:
+            if self._source_mtimes is not None:
+                self._reload([path for path in paths if mtimes[path] != self._source_mtimes.get(path)])
+                paths = self.source_paths
+                mtimes = dict(zip(paths, _mtimes(paths)))
+            with open(paths[0], encoding='utf-8') as f:
+                source = f.read()
+            names = {builder.__name__ for builder in self.module.SLIDE_BUILDERS}
+            shared, builders, fields = source_fingerprints(source, names)
+            self._source_info = digest(shared, sources_fingerprint(paths[1:])), builders, fields
+            self._source_mtimes = mtimes
+            self._defaults = dict(self.module.PROPOSAL_FIELDS)
+        fields = self.module.PROPOSAL_FIELDS
+        fields.clear()
+        fields.update(self._defaults)
+        if self.fields_path and os.path.exists(self.fields_path):
+            with open(self.fields_path, encoding='utf-8') as f:
+                fields.update(json.load(f))
+
+    def _slide_fingerprints(self):
+        shared, builders, fields = self._source_info
+        values = self.module.PROPOSAL_FIELDS
+        shared_values = [str(values.get(name)) for name in fields[None]]
+        names = [builder.__name__ for builder in self.module.SLIDE_BUILDERS]
+        total = len(names)
+        fingerprints = []
+        for i, name in enumerate(names, 1):
+            used = ['%s=%s' % (field, values.get(field)) for field in fields.get(name, ())]
+            fingerprints.append((name, digest(shared, *shared_values, builders.get(name, name),
+                                              *used, str(i), str(total))))
+        return fingerprints
+
+    def refresh(self):
+        """入力が変わったスライドを作り直してデッキを書き出し、作り直したスライド番号を返す"""
+        self._load()
+        slides = self._slide_fingerprints()
+        total = len(slides)
+        rebuilt = []
+        fragments = {}
+        for i, (name, fingerprint) in enumerate(slides, 1):
+            fragment = self._fragments.get(fingerprint)
+            if fragment is None:
+                fragment = build_fragment(self.module_name, name, i, total)
+                rebuilt.append(i)
+            fragments[fingerprint] = fragment
+        if rebuilt or not os.path.exists(self.output):
+            prs = new_presentation(self.module)
+            for _, fingerprint in slides:
+                splice_fragment(prs, *fragments[fingerprint])
+            write_atomic(prs, self.output)
+        self._fragments = fragments
+        return rebuilt
+
+
+def write_atomic(prs, path, **options):
+    """同じディレクトリの一時ファイルに保存してから置き換え、ダイジェストを返す
+
+    options は save_presentation() にそのまま渡す。
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(suffix='.pptx', prefix='.tmp-', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            digest = save_presentation(prs, f, **options)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return digest
+
+
+def _mtimes(paths):
+    mtimes = []
+    for path in paths:
+        try:
+            mtimes.append(os.stat(path).st_mtime_ns)
+        except FileNotFoundError:
+            mtimes.append(None)
+    return mtimes
+
+
+def watch(module_name='ppt', fields_path=None, output='project_proposal.pptx', interval=0.2, debounce=0.3):
+    """Ctrl+C で止めるまで入力を監視し、変更があれば差分だけ作り直す"""
+    builder = IncrementalBuilder(module_name, fields_path, output)
+    start = time.perf_counter()
+    rebuilt = builder.refresh()
+    print("初回生成: %d 枚 (%.2f 秒) -> %s" % (len(rebuilt), time.perf_counter() - start, output))
+    print("監視中: %s (Ctrl+C で終了)" % ', '.join(builder.watched_paths))
+    last = _mtimes(builder.watched_paths)
+    try:
+        while True:
+            time.sleep(interval)
+            current = _mtimes(builder.watched_paths)
+            if current == last:
+                continue
+            # 保存が続いている間は待ち、debounce 秒変化が無くなってから作り直す
+            settled_at = time.monotonic()
+            while time.monotonic() - settled_at < debounce:
+                time.sleep(interval)
+                latest = _mtimes(builder.watched_paths)
+                if latest != current:
+                    current, settled_at = latest, time.monotonic()
+            last = current
+            start = time.perf_counter()
+            try:
+                rebuilt = builder.refresh()
+            except Exception as e:  # 編集途中の構文エラーなどでは監視を続ける
+                print("再生成に失敗しました: %s: %s" % (type(e).__name__, e), file=sys.stderr)
+                continue
+            if rebuilt:
+                print("再生成: スライド %s (%.2f 秒)" % (', '.join(map(str, rebuilt)), time.perf_counter() - start))
+            else:
+                print("変更なし (スライドの入力は同じです)")
+    except KeyboardInterrupt:
+        print("監視を終了しました")